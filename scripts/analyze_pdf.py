@@ -1,88 +1,915 @@
-import pdfplumber
+#!/usr/bin/env python3
+"""
+PDF 스타일 분석 → source_style.json
+
+페이지 분석은 단계(stage)별 함수로 나뉘고, 단계 결과는 페이지마다
+(PDF SHA-256, 페이지 번호, 단계 이름, 단계 버전) 키로 .cache/pdf_analysis/ 에 저장됩니다.
+같은 PDF를 다시 분석하면 캐시된 단계는 페이지를 파싱하지 않고 그대로 사용하며,
+분석 코드를 고친 뒤에는 해당 단계의 STAGE_VERSIONS 만 올리면 그 단계만 다시 계산합니다.
+
+- 문자(page.chars)는 페이지당 한 번만 읽고, 텍스트와 단어는 같은 WordExtractor 결과에서 만듭니다
+  (page.extract_text() + page.extract_words() 는 문자 스트림을 두 번 처리)
+- typography: 문자를 NumPy 배열(크기, 폰트, 색, 좌표)로 읽어 페이지별 (크기, 폰트, 색) 히스토그램과 줄 묶음을
+  벡터 연산으로 계산하고, 문서 전체에서 크기 군집(제목/본문/캡션)과 폰트 빈도를 모아 designTokens.typography 를 만듭니다
+  (크기는 슬라이드 너비 SLIDE_WIDTH_PX 기준 px)
+- layout: 단어 상자를 격자 공간 인덱스로 블록으로 묶고, 블록/이미지 배치(열 수, 이미지 위치, 텍스트 밀도, 정렬)로
+  generate_html 템플릿(hero-cover, content-split, section-divider, table-of-contents ...)을 고릅니다
+- images: 페이지 이미지 스트림을 원본(JPEG) 또는 PNG로 꺼내 내용 SHA-256 으로 중복을 없애고 (pdf_images.py),
+  출력 폴더의 image_resources/ 에 한 번씩 저장 - source_style.json 에는 imageResources 목록과 슬라이드별 참조
+- colors: 페이지를 낮은 DPI로 렌더링해 Lab k-means 팔레트를 만들고 (extract_palette.py), 페이지별 배경색도 채웁니다
+- --stream: 페이지가 끝날 때마다 결과를 <output>.pages.jsonl 체크포인트에 한 줄씩 추가하고,
+  중단된 뒤 다시 실행하면 마지막으로 완료된 페이지 다음부터 이어서 분석합니다.
+  source_style.json 은 마지막에 체크포인트를 읽어 조립하므로 페이지 수와 상관없이 메모리가 일정합니다
+- --workers N: 페이지 묶음을 N개 프로세스에서 분석 (각 워커가 PDF를 직접 엽니다)
+
+Usage:
+    python scripts/analyze_pdf.py <pdf_path> <output_path> [--workers 4] [--no-cache] [--stream]
+"""
+
+import argparse
 import json
-import sys
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def analyze_pdf(pdf_path, output_path):
+import numpy as np
+import pdfplumber
+from pdfplumber.utils.text import WordExtractor
+
+from extract_palette import HAS_PDFIUM, PALETTE_VERSION, extract_palette
+from image_cache import cache_key, cache_path, file_sha256, write_atomic
+from pdf_images import RESOURCE_DIR, export_images, resource_name, store_stream_image
+from reproducible import build_timestamp
+
+
+# 단계별 분석 결과 형식이 바뀌면 올려서 해당 단계 캐시만 무효화
+STAGE_VERSIONS = {
+    'text': 1,
+    'typography': 1,
+    'layout': 1,
+    'images': 1,
+}
+CACHE_NAMESPACE = 'pdf_analysis'
+# --workers: 작업 하나에 묶는 최대 페이지 수
+MAX_CHUNK_PAGES = 16
+# --stream: 체크포인트 파일 = 출력 경로의 확장자를 바꾼 것 (source_style.json → source_style.pages.jsonl)
+CHECKPOINT_SUFFIX = '.pages.jsonl'
+
+# 글자 크기를 px로 바꿀 기준 슬라이드 너비 (presentation.json metadata.slideWidth)
+SLIDE_WIDTH_PX = 1920
+# 크기 군집: 이웃한 크기의 비율이 이 값보다 크면 다른 군집 / 페이지 제목으로 볼 최소 배율 (본문 대비)
+SIZE_CLUSTER_RATIO = 1.15
+TITLE_SIZE_RATIO = 1.2
+
+# 단어 상자를 블록으로 묶을 때 상자를 넓히는 양 (단어 높이 배수: 가로 = 단어 간격, 세로 = 줄 간격)
+BLOCK_GAP_X = 1.0
+BLOCK_GAP_Y = 1.0
+# 레이아웃 분류 기준 (면적/너비는 페이지 대비 비율)
+IMAGE_MIN_AREA = 0.04          # 이보다 작은 이미지(로고, 아이콘)는 무시
+BACKGROUND_IMAGE_AREA = 0.6    # 배경 이미지
+SIDE_IMAGE_AREA = 0.12         # content-split 이미지
+WIDE_BLOCK_WIDTH = 0.6         # 열 수를 셀 때 제외하는 넓은 블록 (여러 열에 걸친 제목 등)
+CENTER_TOLERANCE = 0.06        # 블록 중심이 페이지 중앙에서 이 안쪽이면 가운데 정렬
+SPARSE_TEXT_CHARS = 60         # section-divider
+STATEMENT_TEXT_CHARS = 300     # center-statement / hero-cover
+TOC_KEYWORDS = ('목차', 'contents', 'agenda', 'index')
+_LIST_NUMBER_RE = re.compile(r'^(?:0?\d|\d{2})[.)]?$')
+
+# 폰트 이름의 굵기 표기 → font-weight (긴 이름부터 검사)
+FONT_WEIGHTS = (
+    ('extralight', 200), ('ultralight', 200), ('semibold', 600), ('demibold', 600), ('extrabold', 800),
+    ('ultrabold', 800), ('thin', 100), ('light', 300), ('medium', 500), ('bold', 700), ('heavy', 800),
+    ('black', 900),
+)
+
+
+class PageData:
+    """페이지 원본 데이터 - 단계 함수들이 공유하며 처음 사용할 때 한 번만 계산"""
+
+    def __init__(self, page):
+        self.page = page
+        self._chars = None
+        self._wordmap = None
+        self._char_arrays = None
+
+    @property
+    def chars(self):
+        if self._chars is None:
+            self._chars = self.page.chars
+        return self._chars
+
+    @property
+    def wordmap(self):
+        """WordExtractor 결과 (단어, 단어의 문자 목록) - extract_words / extract_text 공용"""
+        if self._wordmap is None:
+            self._wordmap = WordExtractor().extract_wordmap(self.chars)
+        return self._wordmap
+
+    @property
+    def words(self):
+        return [word for word, _ in self.wordmap.tuples]
+
+    @property
+    def text(self):
+        """page.extract_text() 와 같은 결과"""
+        page = self.page
+        return self.wordmap.to_textmap(layout_bbox=page.bbox, layout_width=page.width,
+                                       layout_height=page.height).as_string
+
+    @property
+    def scale(self):
+        """PDF 좌표(pt) → 슬라이드 px (SLIDE_WIDTH_PX 기준)"""
+        return SLIDE_WIDTH_PX / float(self.page.width or SLIDE_WIDTH_PX)
+
+    @property
+    def char_arrays(self):
+        if self._char_arrays is None:
+            self._char_arrays = CharArrays(self.chars, self.scale)
+        return self._char_arrays
+
+
+def color_to_hex(color):
+    """pdfplumber 색 (gray / RGB / CMYK 0~1 튜플) → #RRGGBB (패턴 등 알 수 없는 값은 검은색)"""
+    if isinstance(color, (int, float)):
+        color = (color,)
+    if not isinstance(color, (tuple, list)) or not all(isinstance(c, (int, float)) for c in color):
+        return '#000000'
+    if len(color) == 1:
+        rgb = (color[0],) * 3
+    elif len(color) == 3:
+        rgb = color
+    elif len(color) == 4:
+        c, m, y, k = color
+        rgb = ((1 - c) * (1 - k), (1 - m) * (1 - k), (1 - y) * (1 - k))
+    else:
+        return '#000000'
+    return '#' + ''.join(f"{round(min(max(v, 0.0), 1.0) * 255):02X}" for v in rgb)
+
+
+def font_family(fontname):
+    """PDF 폰트 이름 → 패밀리 ('ABCDEF+Pretendard-Bold' → 'Pretendard')"""
+    name = fontname.split('+', 1)[1] if len(fontname) > 7 and fontname[6] == '+' else fontname
+    return name.split('-')[0].split(',')[0] or name
+
+
+def font_weight(fontname):
+    """PDF 폰트 이름의 굵기 표기 → font-weight (없으면 400)"""
+    style = fontname.lower().rsplit('-', 1)[-1] if '-' in fontname else fontname.lower()
+    for keyword, weight in FONT_WEIGHTS:
+        if keyword in style:
+            return weight
+    return 400
+
+
+class CharArrays:
+    """page.chars → NumPy 배열 (폰트/색은 코드표 인덱스, 크기/좌표는 SLIDE_WIDTH_PX 기준 px)"""
+
+    def __init__(self, chars, scale):
+        n = len(chars)
+        fonts = {}
+        colors = {}
+        self.size = np.round(np.fromiter((c['size'] for c in chars), float, n) * scale * 2) / 2
+        self.x0 = np.fromiter((c['x0'] for c in chars), float, n) * scale
+        self.x1 = np.fromiter((c['x1'] for c in chars), float, n) * scale
+        self.bottom = np.fromiter((c['bottom'] for c in chars), float, n) * scale
+        self.font = np.fromiter((fonts.setdefault(c['fontname'], len(fonts)) for c in chars), np.int64, n)
+        self.color = np.fromiter((colors.setdefault(_color_key(c.get('non_stroking_color')), len(colors))
+                                  for c in chars), np.int64, n)
+        self.text = np.array([c['text'] for c in chars], dtype=object)
+        self.fonts = list(fonts)
+        self.colors = [color_to_hex(key) for key in colors]
+
+    def __len__(self):
+        return len(self.size)
+
+
+def _color_key(color):
+    return tuple(color) if isinstance(color, list) else color
+
+
+# ========================================
+# Page stages
+# ========================================
+
+def analyze_text(data):
+    text = data.text
+    return {'text': text, 'textLength': len(text), 'wordCount': len(data.words)}
+
+
+def group_lines(arrays):
+    """문자를 줄로 묶기 → (줄 순서대로 정렬한 문자 인덱스, 줄 시작 위치)
+
+    아래쪽 좌표(bottom) 순으로 정렬한 뒤 간격이 작은 글자 크기의 절반보다 크면 새 줄로 보고,
+    줄 안에서는 x0 순으로 정렬합니다.
+    """
+    order = np.argsort(arrays.bottom, kind='stable')
+    bottom = arrays.bottom[order]
+    size = arrays.size[order]
+    breaks = np.diff(bottom) > 0.5 * np.minimum(size[1:], size[:-1])
+    line_id = np.concatenate(([0], np.cumsum(breaks)))
+    order = order[np.lexsort((arrays.x0[order], line_id))]
+    starts = np.flatnonzero(np.concatenate(([True], np.diff(line_id) > 0)))
+    return order, starts
+
+
+def analyze_typography(data):
+    """페이지 글자 통계 (벡터 연산)
+
+    - runs: [크기 px, 폰트 이름, 색, 글자 수] - 문서 전체 히스토그램/군집의 재료
+    - title: 가장 큰 글자의 줄 (본문 크기의 TITLE_SIZE_RATIO 배 이상일 때)
+    - body: 글자 수가 가장 많은 크기/폰트/색
+    - lineGaps: [크기 px, 다음 줄까지 거리 px, 횟수] - 같은 크기의 연속된 줄 (line-height 계산용)
+    """
+    arrays = data.char_arrays
+    result = {'charCount': len(arrays), 'lineCount': 0, 'runs': [], 'title': None, 'body': None, 'lineGaps': []}
+    if not len(arrays):
+        return result
+
+    # (크기, 폰트, 색) 조합별 글자 수
+    n_fonts = len(arrays.fonts)
+    n_colors = len(arrays.colors)
+    size_code = (arrays.size * 2).astype(np.int64)
+    keys, counts = np.unique((size_code * n_fonts + arrays.font) * n_colors + arrays.color, return_counts=True)
+    run_color = keys % n_colors
+    run_font = keys // n_colors % n_fonts
+    run_size = keys // (n_colors * n_fonts) / 2
+    result['runs'] = [[float(size), arrays.fonts[font], arrays.colors[color], int(count)]
+                      for size, font, color, count in zip(run_size, run_font, run_color, counts)]
+    top = int(np.argmax(counts))
+    body_size = float(run_size[top])
+    result['body'] = {'size': body_size, 'font': arrays.fonts[run_font[top]], 'color': arrays.colors[run_color[top]]}
+
+    # 줄 묶음 - 줄마다 최대 크기, 위치
+    order, starts = group_lines(arrays)
+    result['lineCount'] = len(starts)
+    line_size = np.maximum.reduceat(arrays.size[order], starts)
+    line_bottom = np.minimum.reduceat(arrays.bottom[order], starts)
+
+    same_size = line_size[1:] == line_size[:-1]
+    if same_size.any():
+        gaps = np.round(np.diff(line_bottom)[same_size])
+        gap_keys, gap_counts = np.unique(np.stack([line_size[1:][same_size], gaps], axis=1), axis=0,
+                                         return_counts=True)
+        result['lineGaps'] = [[float(size), float(gap), int(count)] for (size, gap), count in zip(gap_keys, gap_counts)]
+
+    title_size = float(line_size.max())
+    if title_size >= body_size * TITLE_SIZE_RATIO:
+        # 가장 큰 크기의 줄들 (여러 줄 제목) - 단어 사이 간격이 있으면 공백
+        chars = order
+        text = arrays.text[chars]
+        gap = arrays.x0[chars][1:] - arrays.x1[chars][:-1] > 0.2 * arrays.size[chars][:-1]
+        text = np.concatenate((np.where(gap, text[:-1] + ' ', text[:-1]), text[-1:]))
+        title_lines = np.flatnonzero(line_size == title_size)
+        ends = np.append(starts[1:], len(order))
+        lines = [''.join(text[starts[i]:ends[i]]).strip() for i in title_lines]
+        first = chars[starts[title_lines[0]]:ends[title_lines[0]]]
+        biggest = first[np.argmax(arrays.size[first])]
+        result['title'] = {'text': '\n'.join(lines), 'size': title_size, 'font': arrays.fonts[arrays.font[biggest]],
+                           'color': arrays.colors[arrays.color[biggest]]}
+    return result
+
+
+def _boxes_overlap(a, b):
+    return (a[:, 0] <= b[:, 2]) & (b[:, 0] <= a[:, 2]) & (a[:, 1] <= b[:, 3]) & (b[:, 1] <= a[:, 3])
+
+
+def cluster_boxes(boxes, gap_x, gap_y):
+    """상자 (N, 4: x0, top, x1, bottom) → 블록 번호 (0부터, 연결 요소)
+
+    상자를 높이 × (gap_x, gap_y) 만큼 넓혀 격자 칸(단어 높이 중앙값의 4배)에 등록하고, 같은 칸에 있는
+    상자 쌍 중 넓힌 상자와 원래 상자가 겹치는 쌍만 이웃으로 봅니다 (모든 쌍 비교 대신 칸 단위 후보).
+    연결 요소는 이웃의 최소 번호를 전파하는 방식(pointer jumping 포함)으로 구합니다.
+    """
+    n = len(boxes)
+    if n < 2:
+        return np.zeros(n, dtype=np.int64)
+    height = boxes[:, 3] - boxes[:, 1]
+    grown = boxes + height[:, None] * np.array([-gap_x, -gap_y, gap_x, gap_y])
+
+    # 격자 칸 등록 - 상자마다 걸치는 칸 (cx, cy) 전부
+    cell = max(float(np.median(height)), 1.0) * 4
+    first = np.floor(grown[:, :2] / cell).astype(np.int64)
+    last = np.floor(grown[:, 2:] / cell).astype(np.int64)
+    first_min = first.min(axis=0)
+    span = last - first + 1
+    per_box = span[:, 0] * span[:, 1]
+    box = np.repeat(np.arange(n), per_box)
+    k = np.arange(len(box)) - np.repeat(np.cumsum(per_box) - per_box, per_box)
+    cx = first[box, 0] - first_min[0] + k % span[box, 0]
+    cy = first[box, 1] - first_min[1] + k // span[box, 0]
+    cell_id = cy * (int(last[:, 0].max() - first_min[0]) + 1) + cx
+
+    # 같은 칸의 상자 쌍
+    order = np.argsort(cell_id, kind='stable')
+    cell_id, box = cell_id[order], box[order]
+    starts = np.flatnonzero(np.concatenate(([True], cell_id[1:] != cell_id[:-1])))
+    sizes = np.diff(np.append(starts, len(box)))
+    member_size = np.repeat(sizes, sizes)
+    left = np.repeat(np.arange(len(box)), member_size)
+    partner = (np.repeat(np.repeat(starts, sizes), member_size)
+               + np.arange(len(left)) - np.repeat(np.cumsum(member_size) - member_size, member_size))
+    a, b = box[left], box[partner]
+    keep = a < b
+    a, b = a[keep], b[keep]
+    near = _boxes_overlap(grown[a], boxes[b]) | _boxes_overlap(grown[b], boxes[a])
+    a, b = a[near], b[near]
+
+    labels = np.arange(n)
+    while True:
+        updated = labels.copy()
+        np.minimum.at(updated, a, labels[b])
+        np.minimum.at(updated, b, labels[a])
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    return np.unique(labels, return_inverse=True)[1]
+
+
+def _interval_groups(start, end):
+    """구간들을 겹치는 것끼리 묶은 그룹 수 (열/행 수)"""
+    if not len(start):
+        return 0
+    order = np.argsort(start)
+    reach = np.maximum.accumulate(end[order])
+    return int(1 + np.count_nonzero(start[order][1:] > reach[:-1]))
+
+
+def analyze_layout(data):
+    """페이지 블록/이미지 배치 (px, SLIDE_WIDTH_PX 기준)
+
+    - height: 페이지 높이 px
+    - blocks: [x0, top, x1, bottom, 단어 수, 글자 수] - 단어 상자를 cluster_boxes 로 묶은 텍스트 블록
+    - images: [x0, top, x1, bottom] - IMAGE_MIN_AREA 이상인 이미지
+    - columns / rows: 넓은 블록을 뺀 블록들의 가로/세로 구간 그룹 수
+    - alignment: 글자 수 가중 다수결 블록 정렬 (left / center / right)
+    - textDensity / imageCoverage: 블록 / 이미지 면적 합 ÷ 페이지 면적
+    - listNumbers: 블록 왼쪽 끝, 같은 x 위치에 늘어선 번호 단어('01', '2.') 최대 개수 (목차 판단용)
+    """
+    page = data.page
+    scale = data.scale
+    width = SLIDE_WIDTH_PX
+    height = float(page.height) * scale
+    area = width * height
+
+    images = []
+    for image in page.images:
+        x0, top = max(image['x0'] * scale, 0), max(image['top'] * scale, 0)
+        x1, bottom = min(image['x1'] * scale, width), min(image['bottom'] * scale, height)
+        if x1 > x0 and bottom > top and (x1 - x0) * (bottom - top) >= IMAGE_MIN_AREA * area:
+            images.append([round(x0), round(top), round(x1), round(bottom)])
+    image_boxes = np.array(images, dtype=float).reshape(-1, 4)
+    result = {
+        'height': round(height), 'blocks': [], 'images': images, 'columns': 0, 'rows': 0, 'alignment': 'left', 'textDensity': 0.0,
+        'imageCoverage': round(min(float(((image_boxes[:, 2] - image_boxes[:, 0])
+                                          * (image_boxes[:, 3] - image_boxes[:, 1])).sum()) / area, 1.0), 3),
+        'listNumbers': 0,
+    }
+
+    words = data.words
+    if not words:
+        return result
+    boxes = np.array([(w['x0'], w['top'], w['x1'], w['bottom']) for w in words], dtype=float) * scale
+    lengths = np.fromiter((len(w['text']) for w in words), np.int64, len(words))
+    labels = cluster_boxes(boxes, BLOCK_GAP_X, BLOCK_GAP_Y)
+
+    order = np.argsort(labels, kind='stable')
+    starts = np.flatnonzero(np.concatenate(([True], np.diff(labels[order]) > 0)))
+    sorted_boxes = boxes[order]
+    blocks = np.stack([
+        np.minimum.reduceat(sorted_boxes[:, 0], starts), np.minimum.reduceat(sorted_boxes[:, 1], starts),
+        np.maximum.reduceat(sorted_boxes[:, 2], starts), np.maximum.reduceat(sorted_boxes[:, 3], starts),
+    ], axis=1)
+    block_words = np.diff(np.append(starts, len(order)))
+    block_chars = np.add.reduceat(lengths[order], starts)
+    result['blocks'] = [[round(x0), round(top), round(x1), round(bottom), int(nw), int(nc)]
+                        for (x0, top, x1, bottom), nw, nc in zip(blocks, block_words, block_chars)]
+
+    block_width = blocks[:, 2] - blocks[:, 0]
+    narrow = block_width <= WIDE_BLOCK_WIDTH * width
+    if not narrow.any():
+        narrow[:] = True
+    result['columns'] = _interval_groups(blocks[narrow, 0], blocks[narrow, 2])
+    result['rows'] = _interval_groups(blocks[narrow, 1], blocks[narrow, 3])
+
+    center = (blocks[:, 0] + blocks[:, 2]) / 2
+    centered = np.abs(center - width / 2) <= CENTER_TOLERANCE * width
+    right = ~centered & (blocks[:, 0] > 0.4 * width) & (blocks[:, 2] > 0.9 * width)
+    votes = {'center': block_chars[centered].sum(), 'right': block_chars[right].sum(),
+             'left': block_chars[~centered & ~right].sum()}
+    result['alignment'] = max(votes, key=lambda name: (votes[name], name == 'left'))
+    result['textDensity'] = round(min(float((block_width * (blocks[:, 3] - blocks[:, 1])).sum()) / area, 1.0), 3)
+
+    # 블록 왼쪽 끝에서 시작하는 번호 단어만 (본문 중간의 숫자 제외)
+    numbered = np.fromiter((bool(_LIST_NUMBER_RE.match(w['text'])) for w in words), bool, len(words))
+    numbered &= boxes[:, 0] - blocks[labels, 0] < 0.5 * (boxes[:, 3] - boxes[:, 1])
+    if numbered.any():
+        _, counts = np.unique(np.round(boxes[numbered, 0] / 10), return_counts=True)
+        result['listNumbers'] = int(counts.max())
+    return result
+
+
+def analyze_images(data):
+    """페이지 이미지 → [{sha256, ext, width, height, bbox}] (bbox 는 px, 파일은 공유 캐시에 내용 해시 이름으로 저장)
+
+    한 페이지에서 같은 XObject 를 여러 번 그리면 한 번만 꺼냅니다. 추출할 수 없는 이미지는 skipped 로 셉니다.
+    """
+    scale = data.scale
+    images = []
+    stored = {}
+    skipped = 0
+    for image in data.page.images:
+        stream = image['stream']
+        key = stream.objid if stream.objid is not None else id(stream)
+        if key not in stored:
+            stored[key] = store_stream_image(stream)
+        if stored[key] is None:
+            skipped += 1
+            continue
+        sha256, ext, width, height = stored[key]
+        images.append({
+            'sha256': sha256, 'ext': ext, 'width': width, 'height': height,
+            'bbox': [round(image['x0'] * scale), round(image['top'] * scale),
+                     round(image['x1'] * scale), round(image['bottom'] * scale)],
+        })
+    return {'images': images, 'skipped': skipped}
+
+
+# 단계 이름 → 함수 (STAGE_VERSIONS 와 같은 이름)
+PAGE_STAGES = {
+    'text': analyze_text,
+    'typography': analyze_typography,
+    'layout': analyze_layout,
+    'images': analyze_images,
+}
+
+
+def stage_cache_path(pdf_digest, page_index, stage):
+    key = cache_key(pdf_digest, page_index, stage, STAGE_VERSIONS[stage])
+    return cache_path(CACHE_NAMESPACE, key, '.json')
+
+
+def analyze_page(page, page_index, pdf_digest, use_cache=True):
+    """페이지 하나의 단계별 결과 → ({단계: 결과}, 캐시에서 읽은 단계 수)"""
+    results = {}
+    cached = 0
+    data = PageData(page)
+    for stage, analyze in PAGE_STAGES.items():
+        path = stage_cache_path(pdf_digest, page_index, stage) if use_cache else None
+        if path is not None and path.exists():
+            try:
+                results[stage] = json.loads(path.read_text(encoding='utf-8'))
+                cached += 1
+                continue
+            except ValueError:
+                pass  # 깨진 캐시 - 다시 계산
+        results[stage] = analyze(data)
+        if path is not None:
+            write_atomic(path, json.dumps(results[stage], ensure_ascii=False).encode('utf-8'))
+    page.close()  # 파싱한 레이아웃 객체 해제 (페이지 수와 상관없이 메모리 일정)
+    return results, cached
+
+
+# 분석 워커 프로세스 상태 (_init_page_worker 에서 설정)
+_worker_state = {}
+
+
+def _init_page_worker(pdf_path, pdf_digest, use_cache):
+    """워커 프로세스 초기화 - 워커마다 PDF를 따로 엽니다 (pdfplumber 객체는 프로세스 간에 넘길 수 없음)"""
+    _worker_state.update(pdf=pdfplumber.open(pdf_path), digest=pdf_digest, use_cache=use_cache)
+
+
+def _analyze_chunk(page_indices):
+    state = _worker_state
+    pages = state['pdf'].pages
+    return [analyze_page(pages[i], i, state['digest'], state['use_cache']) for i in page_indices]
+
+
+def iter_page_results(pdf_path, pdf_digest, total_pages, workers=1, use_cache=True, start=0):
+    """start 페이지부터 순서대로 (단계별 결과, 캐시 단계 수) 생성 - workers > 1 이면 프로세스 풀에서 묶음 단위로 분석"""
+    remaining = total_pages - start
+    if workers <= 1 or remaining < 2:
+        with pdfplumber.open(pdf_path) as pdf:
+            for i in range(start, total_pages):
+                yield analyze_page(pdf.pages[i], i, pdf_digest, use_cache)
+        return
+
+    chunk_size = max(1, min(MAX_CHUNK_PAGES, -(-remaining // (workers * 4))))
+    chunks = [list(range(j, min(j + chunk_size, total_pages))) for j in range(start, total_pages, chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_page_worker,
+                             initargs=(str(pdf_path), pdf_digest, use_cache)) as pool:
+        for chunk_results in pool.map(_analyze_chunk, chunks):
+            yield from chunk_results
+
+
+def main_image_position(layout):
+    """가장 큰 이미지의 위치 → background / left / right / center (없으면 None)"""
+    if not layout['images']:
+        return None
+    x0, top, x1, bottom = max(layout['images'], key=lambda box: (box[2] - box[0]) * (box[3] - box[1]))
+    if layout['imageCoverage'] >= BACKGROUND_IMAGE_AREA:
+        return 'background'
+    if (x1 - x0) * (bottom - top) < SIDE_IMAGE_AREA * SLIDE_WIDTH_PX * layout['height']:
+        return None
+    center = (x0 + x1) / 2 / SLIDE_WIDTH_PX
+    return 'left' if center < 0.45 else 'right' if center > 0.55 else 'center'
+
+
+def classify_page(page_index, text, layout):
+    """블록/이미지 배치 → (generate_html 템플릿, 레이아웃 이름, imagePosition)"""
+    chars = sum(block[5] for block in layout['blocks'])
+    blocks = len(layout['blocks'])
+    columns, rows = layout['columns'], layout['rows']
+    alignment = {'center': 'centered', 'left': 'left-aligned', 'right': 'right-aligned'}[layout['alignment']]
+    image = main_image_position(layout)
+    lowered = text.lower()
+
+    if image == 'background':
+        shape = 'image-background'
+    elif image in ('left', 'right'):
+        shape = f'image-{image}'
+    elif chars < SPARSE_TEXT_CHARS:
+        shape = 'minimal'
+    elif columns >= 2 and rows >= 2 and blocks >= 4:
+        shape = f'grid-{rows}x{columns}'
+    else:
+        shape = 'single-column' if columns <= 1 else f'{columns}-column'
+    layout_name = f'{alignment}-{shape}'
+    image_position = image if image in ('left', 'right') else None
+
+    if layout['listNumbers'] >= 3 or (blocks >= 3 and any(keyword in lowered for keyword in TOC_KEYWORDS)):
+        template = 'table-of-contents'
+    elif page_index == 0 and chars < STATEMENT_TEXT_CHARS:
+        template = 'hero-cover'
+    elif image == 'background':
+        template = 'content-image-overlay'
+    elif chars < SPARSE_TEXT_CHARS:
+        template = 'section-divider'
+    elif image_position:
+        template = 'image-features' if blocks >= 4 else 'content-split'
+    elif layout['alignment'] == 'center' and blocks <= 3 and chars < STATEMENT_TEXT_CHARS:
+        template = 'center-statement'
+    elif shape.startswith('grid-'):
+        template = 'feature-grid'
+    elif columns == 3:
+        template = 'three-column'
+    elif columns == 2:
+        template = 'content-split'
+    else:
+        template = 'content-text'
+    return template, layout_name, image_position
+
+
+def size_clusters(sizes, counts):
+    """정렬된 글자 크기 히스토그램 → 군집 목록 [(대표 크기, 글자 수, 군집 안 크기 마스크)]
+
+    이웃한 크기의 비율이 SIZE_CLUSTER_RATIO 보다 크면 군집을 나누고, 대표 크기는 글자 수가 가장 많은 크기입니다.
+    """
+    cluster_id = np.concatenate(([0], np.cumsum(sizes[1:] / sizes[:-1] > SIZE_CLUSTER_RATIO)))
+    clusters = []
+    for cid in range(int(cluster_id[-1]) + 1):
+        mask = cluster_id == cid
+        clusters.append((float(sizes[mask][np.argmax(counts[mask])]), int(counts[mask].sum()), mask))
+    return clusters
+
+
+def _font_token(sizes, fonts, counts, in_cluster, size, line_height=None):
+    """군집에 속한 글자들의 가장 흔한 폰트 → typography 토큰"""
+    weights = {}
+    for font, count in zip(fonts[in_cluster], counts[in_cluster]):
+        weights[font] = weights.get(font, 0) + int(count)
+    fontname = max(weights, key=weights.get)
+    token = {
+        "fontFamily": f"'{font_family(fontname)}', sans-serif",
+        "fontWeight": str(font_weight(fontname)),
+        "fontSize": f"{size:g}px",
+    }
+    if line_height:
+        token["lineHeight"] = f"{line_height:.2f}".rstrip('0').rstrip('.')
+    return token
+
+
+def summarize_typography(page_typography):
+    """페이지별 typography 결과 → designTokens.typography
+
+    - body: 글자 수가 가장 많은 크기 군집
+    - sizes: 본문보다 큰 군집 전부를 큰 순서대로 h1, h2, ... (4개 이상이면 가장 큰 것이 hero)
+    - heading, subheading: 본문보다 큰 군집 중 글자 수가 가장 많은 두 군집 (큰 쪽이 heading)
+    - caption: 본문보다 작은 군집 중 글자 수가 가장 많은 것
+    - fontFamilies / sizeHistogram: 폰트 패밀리 빈도, 글자 크기별 글자 수
+    """
+    runs = [run for page in page_typography for run in page['runs']]
+    if not runs:
+        return {
+            "heading": {"fontFamily": "sans-serif", "fontWeight": "700"},
+            "body": {"fontFamily": "sans-serif", "fontWeight": "400"},
+        }
+
+    run_size = np.array([run[0] for run in runs])
+    run_font = np.array([run[1] for run in runs], dtype=object)
+    run_count = np.array([run[3] for run in runs])
+    sizes, size_index = np.unique(run_size, return_inverse=True)
+    size_counts = np.bincount(size_index, weights=run_count).astype(np.int64)
+
+    clusters = size_clusters(sizes, size_counts)
+    body = max(range(len(clusters)), key=lambda i: clusters[i][1])
+    larger = clusters[body + 1:][::-1]
+    smaller = clusters[:body]
+
+    def token(cluster, line_height=None):
+        size, _, mask = cluster
+        return _font_token(run_size, run_font, run_count, mask[size_index], size, line_height)
+
+    # 본문 크기의 연속된 줄 간격 중 가장 흔한 값 / 크기 → line-height
+    body_size = clusters[body][0]
+    gaps = {}
+    for page in page_typography:
+        for size, gap, count in page['lineGaps']:
+            if size == body_size:
+                gaps[gap] = gaps.get(gap, 0) + count
+    line_height = max(gaps, key=gaps.get) / body_size if gaps else None
+
+    # 본문보다 큰 군집은 모두 이름을 붙임 (4개 이상이면 가장 큰 것이 hero, 나머지는 h1, h2, ... h<N>)
+    names = ['hero'] if len(larger) > 3 else []
+    names += [f"h{level}" for level in range(1, len(larger) - len(names) + 1)]
+    headings = dict(zip(names, larger))
+    # heading/subheading 은 크기 순위가 아니라 글자 수가 가장 많은 두 군집 (큰 쪽이 heading)
+    # - 표지에만 쓰인 큰 크기 때문에 자주 쓰이는 제목 크기가 밀려나지 않도록
+    common = sorted(sorted(larger, key=lambda cluster: -cluster[1])[:2], key=lambda cluster: -cluster[0])
+    typography = {}
+    if common:
+        typography["heading"] = token(common[0])
+    if len(common) > 1:
+        typography["subheading"] = token(common[1])
+    typography["body"] = token(clusters[body], line_height)
+    if smaller:
+        typography["caption"] = token(max(smaller, key=lambda cluster: cluster[1]))
+
+    typography["sizes"] = {name: f"{cluster[0]:g}px" for name, cluster in headings.items()}
+    typography["sizes"]["body"] = f"{body_size:g}px"
+    if smaller:
+        typography["sizes"]["caption"] = typography["caption"]["fontSize"]
+
+    families = {}
+    for font, count in zip(run_font, run_count):
+        family = font_family(font)
+        families[family] = families.get(family, 0) + int(count)
+    total = int(run_count.sum())
+    typography["fontFamilies"] = [
+        {"family": family, "chars": count, "share": round(count / total, 3)}
+        for family, count in sorted(families.items(), key=lambda item: -item[1])
+    ]
+    typography["sizeHistogram"] = {f"{size:g}px": int(count) for size, count in zip(sizes, size_counts)}
+    return typography
+
+
+def build_slide_structure(page_index, results):
+    """단계별 결과 → slideStructures 항목 (background.color 는 조립할 때 팔레트의 페이지 배경색으로 채움)"""
+    text_result = results['text']
+    text = text_result['text']
+    typography = results['typography']
+    elements = {}
+    title = typography['title']
+    if title:
+        elements["title"] = {
+            "text": title['text'],
+            "fontSize": f"{title['size']:g}px",
+            "fontFamily": f"'{font_family(title['font'])}', sans-serif",
+            "fontWeight": str(font_weight(title['font'])),
+            "color": title['color']
+        }
+    body = typography['body'] or {'size': 18, 'color': '#000000'}
+    # 페이지 전체 텍스트를 하나의 element로 저장 (크기/색은 글자 수가 가장 많은 글자 기준)
+    elements["body"] = {
+        "text": text,
+        "position": "center",
+        "fontSize": f"{body['size']:g}px",
+        "color": body['color']
+    }
+    layout = results['layout']
+    template, layout_name, image_position = classify_page(page_index, text, layout)
+    geometry = {
+        "columns": layout['columns'],
+        "rows": layout['rows'],
+        "alignment": layout['alignment'],
+        "textBlocks": len(layout['blocks']),
+        "textDensity": layout['textDensity'],
+        "imageCoverage": layout['imageCoverage'],
+    }
+    if image_position:
+        geometry["imagePosition"] = image_position
+    structure = {
+        "slideNumber": page_index + 1,
+        "type": template,
+        "layout": layout_name,
+        "geometry": geometry,
+        "elements": elements,
+        "background": {
+            "color": "#FFFFFF"
+        },
+        "spacing": {
+            "padding": "40px"
+        }
+    }
+    images = results['images']['images']
+    if images:
+        # imageResources 의 id 참조 + 페이지 위의 위치
+        structure["images"] = [{"ref": image_id(image['sha256']), "bbox": image['bbox']} for image in images]
+    return structure
+
+
+def image_id(sha256):
+    return f"img-{sha256[:12]}"
+
+
+def collect_image_resources(records):
+    """페이지 레코드 → imageResources (내용 해시별 한 항목, 처음 나온 순서)"""
+    resources = {}
+    for record in records:
+        for image in record['images']:
+            resource = resources.get(image['sha256'])
+            if resource is None:
+                resource = resources[image['sha256']] = {
+                    "id": image_id(image['sha256']),
+                    "file": f"{RESOURCE_DIR}/{resource_name(image['sha256'], image['ext'])}",
+                    "sha256": image['sha256'],
+                    "width": image['width'],
+                    "height": image['height'],
+                    "pages": [],
+                    "occurrences": 0,
+                }
+            if resource["pages"][-1:] != [record['page']]:
+                resource["pages"].append(record['page'])
+            resource["occurrences"] += 1
+    return list(resources.values())
+
+
+def page_record(page_index, results):
+    """페이지 분석 결과 → 조립용 레코드 (slideStructures 항목 + 문서 typography 재료) - 체크포인트 한 줄"""
+    typography = results['typography']
+    return {
+        "page": page_index + 1,
+        "slide": build_slide_structure(page_index, results),
+        "typography": {"runs": typography['runs'], "lineGaps": typography['lineGaps']},
+        "images": [{key: image[key] for key in ('sha256', 'ext', 'width', 'height')}
+                   for image in results['images']['images']],
+    }
+
+
+def checkpoint_path(output_path):
+    return Path(output_path).with_suffix(CHECKPOINT_SUFFIX)
+
+
+def resume_checkpoint(path, header):
+    """체크포인트에서 이어서 분석할 페이지 번호 (= 완료된 페이지 수)
+
+    헤더(PDF 해시, 단계 버전, 페이지 수)가 다르면 0을 반환하고, 마지막 줄이 쓰다가 끊긴 경우
+    (강제 종료 등) 완료된 마지막 줄 뒤를 잘라냅니다.
+    """
+    done = 0
+    valid_bytes = 0
+    try:
+        with open(path, 'rb') as f:
+            for line_number, line in enumerate(f):
+                try:
+                    record = json.loads(line) if line.endswith(b'\n') else None
+                except ValueError:
+                    record = None
+                if line_number == 0:
+                    if record != header:
+                        return 0
+                elif record is None or record.get('page') != done + 1:
+                    break
+                else:
+                    done += 1
+                valid_bytes += len(line)
+    except FileNotFoundError:
+        return 0
+    if valid_bytes < os.path.getsize(path):
+        os.truncate(path, valid_bytes)
+    return done
+
+
+def iter_checkpoint(path):
+    """체크포인트의 페이지 레코드 (헤더 제외) - 한 줄씩 읽으므로 메모리 일정"""
+    with open(path, 'r', encoding='utf-8') as f:
+        next(f, None)
+        for line in f:
+            yield json.loads(line)
+
+
+def iter_json_chunks(output_data, slides):
+    """output_data 를 json.dumps(indent=2) 와 같은 형식의 bytes 조각으로 - slideStructures 는 slides 에서 하나씩"""
+    marker = '"__slideStructures__"'
+    head, tail = json.dumps(dict(output_data, slideStructures=marker[1:-1]), indent=2,
+                            ensure_ascii=False).split(marker)
+    yield head.encode('utf-8')
+    separator = "[\n    "
+    for slide in slides:
+        yield (separator + json.dumps(slide, indent=2, ensure_ascii=False).replace("\n", "\n    ")).encode('utf-8')
+        separator = ",\n    "
+    yield ("[]" if separator.startswith("[") else "\n  ]").encode('utf-8')
+    yield tail.encode('utf-8')
+
+
+def analyze_pdf(pdf_path, output_path, workers=1, use_cache=True, stream=False):
     """
     Analyzes a PDF file and generates a source_style.json file.
+
+    stream=True 이면 페이지 결과를 체크포인트(JSONL)에 바로 쓰고, 중단된 분석은 이어서 진행합니다.
     """
     print(f"Analyzing PDF: {pdf_path}")
-    
-    slide_structures = []
-    
+
+    records = []  # stream 모드에서는 체크포인트 파일에 기록
+    checkpoint = checkpoint_path(output_path) if stream else None
+    checkpoint_file = None
+    start = 0
+    cached_stages = 0
+    colors = {
+        "primary": { "main": "#000000", "description": "Detected primary color" },
+        "background": { "main": "#FFFFFF", "description": "Detected background" },
+        "text": { "primary": "#000000", "secondary": "#666666" }
+    }
+    backgrounds = []
+
     try:
+        pdf_digest = file_sha256(pdf_path)
         with pdfplumber.open(pdf_path) as pdf:
             total_pages = len(pdf.pages)
-            print(f"Total pages: {total_pages}")
-            
-            for i, page in enumerate(pdf.pages):
-                slide_number = i + 1
-                text = page.extract_text()
-                words = page.extract_words()
-                
-                # Simple heuristic to determine slide type
-                slide_type = "content-text"
-                if i == 0:
-                    slide_type = "hero-cover"
-                elif "목차" in text or "Contents" in text or "Agenda" in text:
-                    slide_type = "table-of-contents"
-                elif len(text) < 50 and len(words) < 10: # Very little text
-                    slide_type = "section-divider"
-                
-                # Extract elements (simplified)
-                elements = {}
-                
-                # Try to find title (largest font usually, or top position)
-                # pdfplumber words have 'top', 'bottom', 'x0', 'x1', 'size' (if available, often not reliable for size)
-                # Actually extract_words returns dict with x0,top,x1,bottom,text. Font info is in page.chars
-                
-                # Let's just store the raw text for now as a single element
-                elements["body"] = {
-                    "text": text,
-                    "position": "center",
-                    "fontSize": "18px", # Placeholder
-                    "color": "#000000"
-                }
-                
-                slide_structure = {
-                    "slideNumber": slide_number,
-                    "type": slide_type,
-                    "layout": "auto-detected",
-                    "elements": elements,
-                    "background": {
-                        "color": "#FFFFFF" # Default
-                    },
-                    "spacing": {
-                        "padding": "40px"
-                    }
-                }
-                slide_structures.append(slide_structure)
-                
+        print(f"Total pages: {total_pages}" + (f" ({workers} workers)" if workers > 1 else ""))
+
+        if stream:
+            header = {"sourceSha256": pdf_digest, "stageVersions": STAGE_VERSIONS, "totalPages": total_pages}
+            start = resume_checkpoint(checkpoint, header)
+            if start:
+                print(f"Resuming from page {start + 1} ({checkpoint})")
+            checkpoint_file = open(checkpoint, 'a' if start else 'w', encoding='utf-8')
+            if not start:
+                checkpoint_file.write(json.dumps(header) + "\n")
+
+        for i, (results, cached) in enumerate(iter_page_results(pdf_path, pdf_digest, total_pages,
+                                                                 workers, use_cache, start), start):
+            record = page_record(i, results)
+            if checkpoint_file:
+                checkpoint_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+                checkpoint_file.flush()
+            else:
+                records.append(record)
+            cached_stages += cached
+
+        if HAS_PDFIUM:
+            palette = extract_palette([pdf_path], use_cache=use_cache)
+            colors = palette['colors']
+            backgrounds = [image['background'] for image in palette['images']]
+
     except Exception as e:
         print(f"Error analyzing PDF: {e}")
+        if checkpoint is not None and checkpoint.exists():
+            print(f"Completed pages are kept in {checkpoint} - run the same command again to resume")
         return
+    finally:
+        if checkpoint_file:
+            checkpoint_file.close()
+
+    if use_cache:
+        print(f"Cache: {cached_stages}/{(total_pages - start) * len(PAGE_STAGES)} page stages reused")
 
-    # Construct the final JSON
+    def iter_records():
+        return iter_checkpoint(checkpoint) if stream else iter(records)
+
+    def iter_slides():
+        for i, record in enumerate(iter_records()):
+            slide = record['slide']
+            if i < len(backgrounds):
+                slide['background']['color'] = backgrounds[i]
+            yield slide
+
+    # 내장 이미지 - 내용 해시별로 한 번만 image_resources/ 에 복사
+    image_resources = collect_image_resources(iter_records())
+    if image_resources:
+        copied, missing = export_images(image_resources, Path(output_path).parent)
+        placements = sum(resource['occurrences'] for resource in image_resources)
+        print(f"Images: {len(image_resources)} unique of {placements} placements "
+              f"({copied} new in {Path(output_path).parent / RESOURCE_DIR})")
+        if missing:
+            print(f"Warning: {len(missing)} images missing from cache - rerun with --no-cache")
+
+    # Construct the final JSON (slideStructures 는 저장할 때 한 장씩 직렬화)
     output_data = {
         "metadata": {
             "sourceFile": str(pdf_path),
-            "analyzedAt": "2025-12-02T00:00:00Z",
-            "analysisMethod": "pdfplumber-text-extraction",
+            "sourceSha256": pdf_digest,
+            "analyzedAt": build_timestamp(pdf_path).strftime("%Y-%m-%dT%H:%M:%SZ"),  # SOURCE_DATE_EPOCH 또는 PDF 수정 시각
+            "analysisMethod": "pdfplumber-text-char-image-extraction, pdfium-render-palette",
+            "stageVersions": dict(STAGE_VERSIONS, palette=PALETTE_VERSION),
             "totalPages": total_pages,
             "analyzedPages": list(range(1, total_pages + 1))
         },
-        "slideStructures": slide_structures,
+        "slideStructures": None,
         "designTokens": {
-            "colors": {
-                "primary": { "main": "#000000", "description": "Detected primary color" },
-                "background": { "main": "#FFFFFF", "description": "Detected background" },
-                "text": { "primary": "#000000", "secondary": "#666666" }
-            },
-            "typography": {
-                "heading": { "fontFamily": "sans-serif", "fontWeight": "700" },
-                "body": { "fontFamily": "sans-serif", "fontWeight": "400" }
-            },
+            "colors": colors,
+            "typography": summarize_typography([record['typography'] for record in iter_records()]),
             "spacing": {
                 "page": { "horizontal": "50px", "vertical": "50px" }
             },
@@ -90,11 +917,14 @@ def analyze_pdf(pdf_path, output_path):
                 "aspectRatio": "16:9"
             }
         },
+        "imageResources": image_resources,
         "componentPatterns": {},
         "recommendations": {},
         "extractionNotes": {
-            "limitations": ["Text-only extraction", "No visual style analysis"],
-            "strengths": ["Accurate text content"],
+            "limitations": ["Slide type is a geometry-based guess - review templates"],
+            "strengths": ["Accurate text content", "Typography from PDF character data",
+                          "Color palette from rendered pages", "Layout from text-block geometry",
+                          "Embedded images extracted once per content hash"],
             "recommendation": "Review and add visual styles manually."
         },
         "implementationReadiness": {
@@ -102,18 +932,28 @@ def analyze_pdf(pdf_path, output_path):
             "contentInput": "✅ Extracted"
         }
     }
-    
+
     # Save to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, indent=2, ensure_ascii=False)
-    
+    write_atomic(output_path, iter_json_chunks(output_data, iter_slides()))
+    if checkpoint is not None:
+        checkpoint.unlink()
+
     print(f"Analysis complete. Saved to {output_path}")
 
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 스타일 분석 → source_style.json")
+    parser.add_argument("pdf_path", help="분석할 PDF 파일")
+    parser.add_argument("output_path", help="source_style.json 저장 경로")
+    parser.add_argument("--workers", type=int, default=1,
+                        help=f"페이지 분석 프로세스 수 (기본 1, 이 컴퓨터: {os.cpu_count()})")
+    parser.add_argument("--no-cache", action="store_true", help="페이지 분석 캐시(.cache/pdf_analysis) 사용 안 함")
+    parser.add_argument("--stream", action="store_true",
+                        help=f"페이지마다 체크포인트(<output>{CHECKPOINT_SUFFIX})에 기록하고 중단된 분석을 이어서 진행")
+    args = parser.parse_args()
+    analyze_pdf(args.pdf_path, args.output_path, workers=max(1, args.workers), use_cache=not args.no_cache,
+                stream=args.stream)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python analyze_pdf.py <pdf_path> <output_path>")
-        sys.exit(1)
-    
-    pdf_path = sys.argv[1]
-    output_path = sys.argv[2]
-    analyze_pdf(pdf_path, output_path)
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+html_to_json 파서 백엔드 벤치마크
+
+projects/*/presentation.html 을 백엔드별(stream, lxml, bs4)로 html_to_json 변환하여
+소요 시간(최솟값)과 최대 메모리 증가량을 비교하고, 결과 JSON이 모두 같은지 확인합니다.
+메모리는 백엔드마다 새 프로세스에서 측정합니다 (lxml은 C 메모리를 사용하므로 tracemalloc 대신 최대 RSS).
+
+--scale N 을 지정하면 각 HTML의 슬라이드를 N배로 복제한 대형 덱으로 측정합니다.
+
+Usage:
+    python scripts/bench_html_backends.py [--repeat 5] [--scale 20]
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from html_backends import available_backends
+from html_to_json import html_to_json
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_kb():
+    """현재 프로세스의 최대 RSS (KB)
+
+    Linux의 ru_maxrss 는 exec 전 부모 프로세스의 최댓값을 물려받으므로 /proc 의 VmHWM 을 먼저 사용합니다.
+    """
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def scaled_copy(html_path, scale):
+    """<body> 내용을 scale배로 복제한 임시 HTML 경로"""
+    with open(html_path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    start = html.index('<body>') + len('<body>')
+    end = html.rindex('</body>')
+    fd, path = tempfile.mkstemp(suffix='.html')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(html[:start] + html[start:end] * scale + html[end:])
+    return path
+
+
+def measure_memory(html_path, backend):
+    """새 프로세스에서 변환 1회의 최대 RSS 증가량 (KB)"""
+    result = subprocess.run([sys.executable, __file__, '--child', backend, html_path],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    try:
+        return json.loads(result.stdout)['rss_kb']
+    except (ValueError, KeyError):
+        return None
+
+
+def child(backend, html_path):
+    baseline = peak_rss_kb()
+    html_to_json(html_path, backend)
+    print(json.dumps({'rss_kb': peak_rss_kb() - baseline}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="html_to_json 파서 백엔드 벤치마크")
+    parser.add_argument("--repeat", type=int, default=5, help="백엔드별 반복 횟수 (최솟값 사용)")
+    parser.add_argument("--scale", type=int, default=1, help="슬라이드 복제 배수 (대형 덱 측정)")
+    parser.add_argument("--child", nargs=2, metavar=("BACKEND", "HTML"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child)
+        return
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = sorted(glob.glob(os.path.join(base_dir, 'projects', '*', 'presentation.html')))
+    if not paths:
+        print("No projects/*/presentation.html found - run generate_html.py first")
+        return
+
+    backends = available_backends()
+    print(f"{'project':<22} {'slides':>6} {'backend':<8} {'ms':>9} {'peak RSS KB':>12} {'same':>5}")
+    for path in paths:
+        target = scaled_copy(path, args.scale) if args.scale > 1 else path
+        try:
+            reference = None
+            for backend in backends:
+                elapsed = min(timeit.repeat(lambda: html_to_json(target, backend), number=1, repeat=args.repeat))
+                data = html_to_json(target, backend)
+                reference = reference or data
+                rss = measure_memory(target, backend)
+                print(f"{os.path.basename(os.path.dirname(path)):<22} {len(data['slides']):>6} {backend:<8} "
+                      f"{elapsed * 1000:>9.1f} {rss if rss is not None else '-':>12} "
+                      f"{'yes' if data == reference else 'NO':>5}")
+        finally:
+            if target != path:
+                os.unlink(target)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+render_element 마이크로 벤치마크
+
+projects/*/presentation.json 에 있는 element를 type별로 모아
+렌더러 조회(dispatch)와 렌더링 시간을 측정합니다.
+--deck N 을 지정하면 프로젝트 슬라이드를 N장으로 복제한 대형 덱의 render_slide 처리량도 측정합니다.
+
+Usage:
+    python scripts/bench_render_element.py [--repeat 2000] [--deck 5000]
+"""
+
+import argparse
+import glob
+import json
+import os
+import timeit
+from collections import defaultdict
+
+from generate_html import ELEMENT_RENDERERS, render_element, render_slide
+
+
+def collect_slides(base_dir):
+    """프로젝트 JSON의 슬라이드 목록"""
+    slides = []
+    for path in sorted(glob.glob(os.path.join(base_dir, 'projects', '*', 'presentation.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        slides.extend(s for s in data.get('slides', []) if isinstance(s, dict))
+    return slides
+
+
+def collect_elements(base_dir):
+    """프로젝트 JSON에서 element type별 샘플 수집"""
+    samples = defaultdict(list)
+    for slide in collect_slides(base_dir):
+        elements = slide.get('elements', [])
+        if not isinstance(elements, list):
+            continue
+        for el in elements:
+            if isinstance(el, dict):
+                samples[el.get('type', 'body')].append(el)
+    return samples
+
+
+def bench_deck(base_dir, size, repeat=5):
+    """슬라이드를 size장으로 복제한 덱의 render_slide 처리량 (최솟값 기준)"""
+    slides = collect_slides(base_dir)
+    if not slides:
+        return
+    deck = [slides[i % len(slides)] for i in range(size)]
+    theme = {'primary': '#FF6B35', 'secondary': '#FFB800', 'bg_dark': '#1A1A1A', 'bg_card': '#2A2A2A'}
+
+    def render_deck():
+        last = len(deck) - 1
+        for i, slide in enumerate(deck):
+            render_slide(i + 1, slide, i == last, theme)
+
+    elapsed = min(timeit.repeat(render_deck, number=1, repeat=repeat))
+    print(f"\nDeck: {size:,} slides in {elapsed * 1000:.1f}ms "
+          f"({size / elapsed:,.0f} slides/s, {elapsed / size * 1e6:.1f} µs/slide)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="render_element 마이크로 벤치마크")
+    parser.add_argument("--repeat", type=int, default=2000, help="type별 반복 횟수")
+    parser.add_argument("--deck", type=int, default=0, help="대형 덱 벤치마크 슬라이드 수 (0이면 생략)")
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = collect_elements(base_dir)
+    if not samples:
+        print("No elements found in projects/*/presentation.json")
+        return
+
+    print(f"{'type':<20} {'n':>4} {'registered':>10} {'render µs':>10} {'dispatch ns':>12}")
+    total_elements = 0
+    total_time = 0.0
+    for el_type in sorted(samples):
+        elements = samples[el_type]
+        total_elements += len(elements) * args.repeat
+
+        def render_all():
+            for el in elements:
+                render_element(el)
+
+        elapsed = timeit.timeit(render_all, number=args.repeat)
+        total_time += elapsed
+        dispatch = timeit.timeit(lambda: ELEMENT_RENDERERS.get(el_type), number=args.repeat * 10)
+
+        per_render_us = elapsed / (len(elements) * args.repeat) * 1e6
+        per_dispatch_ns = dispatch / (args.repeat * 10) * 1e9
+        registered = 'yes' if el_type in ELEMENT_RENDERERS else 'no'
+        print(f"{el_type:<20} {len(elements):>4} {registered:>10} {per_render_us:>10.2f} {per_dispatch_ns:>12.1f}")
+
+    print(f"\nTotal: {total_elements:,} renders in {total_time:.3f}s "
+          f"({total_elements / total_time:,.0f} elements/s)")
+
+    if args.deck:
+        bench_deck(base_dir, args.deck)
+
+
+if __name__ == '__main__':
+    main()
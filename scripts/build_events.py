@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+빌드 진행 이벤트 / 협조적 취소 (Progress events & cooperative cancellation)
+
+웹 UI 등에서 변환을 실행할 때 진행 상황을 스트리밍하고 빌드를 취소하기 위한 API입니다.
+
+콜백 방식:
+    def on_event(event):
+        print(event["event"], event)
+    convert_json_to_pptx("presentation.json", on_event=on_event, cancel_token=token)
+
+이터레이터 방식 (별도 스레드에서 실행, 이터레이터를 닫으면 빌드도 취소):
+    for event in iter_events(convert_json_to_pptx, "presentation.json"):
+        ...
+
+이벤트는 dict이며 공통 필드는 "event"(이름)와 "elapsed"(빌드 시작 후 초)입니다.
+
+| 이벤트 | 필드 |
+|--------|------|
+| build_started | total_slides, output |
+| slide_started / slide_finished | slide, index, total, title (finished: ok) |
+| image_queued / image_done | url (done: ok, bytes) |
+| bytes_written | path, bytes |
+| build_finished | output, slides |
+| build_cancelled | slide (취소 시점의 다음 슬라이드) |
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+class BuildCancelled(Exception):
+    """CancelToken으로 빌드가 취소됨"""
+
+
+class CancelToken:
+    """스레드 간 공유 가능한 취소 토큰"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise BuildCancelled()
+
+
+class ProgressReporter:
+    """이벤트 콜백 + 취소 토큰 묶음 (콜백 예외는 빌드를 중단시키지 않음)"""
+
+    def __init__(self, callback=None, cancel_token=None):
+        self.callback = callback
+        self.cancel_token = cancel_token
+        self.started = time.monotonic()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_token is not None and self.cancel_token.cancelled
+
+    def check(self):
+        """취소되었으면 BuildCancelled 발생"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+    def emit(self, event, **fields):
+        if self.callback is None:
+            return
+        payload = {"event": event, "elapsed": round(time.monotonic() - self.started, 3)}
+        payload.update(fields)
+        try:
+            self.callback(payload)
+        except Exception as e:
+            print(f"  [WARN] 진행 이벤트 콜백 실패 ({event}): {e}")
+
+
+_NULL_REPORTER = ProgressReporter()
+_current = contextvars.ContextVar("haru_progress_reporter", default=_NULL_REPORTER)
+
+
+def current_reporter() -> ProgressReporter:
+    """현재 빌드의 리포터 (빌드 밖에서는 아무것도 하지 않는 리포터)"""
+    return _current.get()
+
+
+@contextmanager
+def reporting(reporter):
+    """with 블록 안의 빌드 코드가 current_reporter()로 reporter를 사용하도록 설정"""
+    token = _current.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current.reset(token)
+
+
+def iter_events(build, *args, cancel_token=None, **kwargs):
+    """build(*args, on_event=..., cancel_token=..., **kwargs)를 스레드에서 실행하며 이벤트를 yield
+
+    이터레이터를 끝까지 소비하지 않고 닫으면(break, close) 빌드를 취소합니다.
+    build의 반환값은 마지막 이벤트 {"event": "result", "value": ...} 로 전달됩니다.
+    """
+    cancel_token = cancel_token or CancelToken()
+    events = queue.Queue()
+    done = object()
+
+    def run():
+        try:
+            value = build(*args, on_event=events.put, cancel_token=cancel_token, **kwargs)
+            events.put({"event": "result", "value": value})
+        except BaseException as e:
+            events.put({"event": "error", "error": repr(e)})
+        finally:
+            events.put(done)
+
+    worker = threading.Thread(target=run, name="haru-build", daemon=True)
+    worker.start()
+    try:
+        while True:
+            event = events.get()
+            if event is done:
+                break
+            yield event
+    finally:
+        cancel_token.cancel()
+        worker.join()
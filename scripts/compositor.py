@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+오버레이 이미지 사전 합성 (Pre-compositing)
+
+이미지 + 반투명 오버레이 색상을 목표 크기의 비트맵 한 장으로 합성합니다.
+PPTX 벤토 카드(이미지 + 75% 알파 사각형)와 HTML image-overlay 배경
+(<img> + .bg-overlay div)을 단일 이미지로 대체하여 슬라이드당 도형 수와 XML 크기를 줄입니다.
+
+합성 결과는 image_cache 의 공유 캐시에 저장되므로 재빌드 시 다시 계산하지 않습니다.
+NumPy가 없으면 HAS_NUMPY = False 이며, 호출 측은 기존 방식(도형 겹치기)으로 폴백합니다.
+"""
+
+import re
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageOps
+
+from image_cache import cache_key, cache_path, fetch_image, resolve_source, write_atomic
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+
+# 합성 로직이 바뀌면 올려서 기존 캐시를 무효화
+COMPOSITOR_VERSION = 1
+
+JPEG_QUALITY = 88
+
+_HEX_RE = re.compile(r'^#?([0-9a-fA-F]{6})$')
+_RGB_RE = re.compile(r'^rgba?\(\s*([\d.]+)\s*,\s*([\d.]+)\s*,\s*([\d.]+)\s*(?:,\s*([\d.]+)\s*)?\)$')
+
+
+def parse_color(color):
+    """'#RRGGBB' / 'RRGGBB' / 'rgb(...)' / 'rgba(...)' → (r, g, b, alpha)
+
+    지원하지 않는 형식(그라데이션 등)은 None을 반환합니다.
+    """
+    if not isinstance(color, str):
+        return None
+    color = color.strip()
+    m = _HEX_RE.match(color)
+    if m:
+        h = m.group(1)
+        return int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16), 1.0
+    m = _RGB_RE.match(color)
+    if m:
+        r, g, b = (int(float(v)) for v in m.group(1, 2, 3))
+        alpha = float(m.group(4)) if m.group(4) is not None else 1.0
+        return r, g, b, alpha
+    return None
+
+
+def blend_overlay(image, size, overlay_rgb, overlay_alpha, image_opacity=1.0, base_rgb=(0, 0, 0)):
+    """NumPy 벡터 연산으로 (배경색 ← 이미지 ← 오버레이) 순서로 합성
+
+    Args:
+        image: PIL 이미지 (목표 크기에 맞게 cover 방식으로 잘라냄)
+        size: (width, height) 픽셀
+        overlay_rgb: 오버레이 색상 (r, g, b)
+        overlay_alpha: 오버레이 불투명도 0.0~1.0
+        image_opacity: 이미지 불투명도 0.0~1.0 (CSS opacity)
+        base_rgb: 이미지 아래 배경색 (image_opacity < 1 일 때 비침)
+
+    Returns:
+        RGB PIL 이미지
+    """
+    fitted = ImageOps.fit(image.convert("RGB"), size, Image.Resampling.LANCZOS)
+    pixels = np.asarray(fitted, dtype=np.float32)
+
+    base = np.asarray(base_rgb, dtype=np.float32)
+    overlay = np.asarray(overlay_rgb, dtype=np.float32)
+
+    out = base + (pixels - base) * image_opacity
+    out += (overlay - out) * overlay_alpha
+
+    return Image.fromarray(np.clip(out + 0.5, 0, 255).astype(np.uint8), "RGB")
+
+
+def rounded_mask(size, radius_px):
+    """라운드 코너 알파 마스크"""
+    mask = Image.new("L", size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle([(0, 0), size], radius=radius_px, fill=255)
+    return mask
+
+
+def composite_overlay(image_url, size, overlay_color, overlay_alpha=None,
+                      image_opacity=1.0, base_color="#000000", corner_radius=0, base_dir=None):
+    """이미지와 오버레이를 합성한 캐시 파일 경로 반환
+
+    Args:
+        image_url: 원본 이미지 URL 또는 로컬 경로
+        size: (width, height) 목표 픽셀 크기
+        overlay_color: 오버레이 색상 (HEX 또는 rgba 문자열)
+        overlay_alpha: 오버레이 불투명도 (None이면 rgba의 alpha 사용)
+        image_opacity: 이미지 불투명도 (HTML imageOpacity)
+        base_color: 이미지 아래 배경색
+        corner_radius: 라운드 반경 px (0보다 크면 투명 코너가 있는 PNG)
+        base_dir: 로컬 이미지 상대 경로의 기준 폴더 (프로젝트 폴더)
+
+    Returns:
+        Path | None - NumPy가 없거나 이미지/색상을 처리할 수 없으면 None
+    """
+    if not HAS_NUMPY:
+        return None
+
+    overlay = parse_color(overlay_color)
+    base = parse_color(base_color) or (0, 0, 0, 1.0)
+    if overlay is None:
+        return None
+    if overlay_alpha is None:
+        overlay_alpha = overlay[3]
+
+    image_url = resolve_source(image_url, base_dir)  # 캐시 키도 프로젝트별 절대 경로 기준
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+    ext = ".png" if corner_radius > 0 else ".jpg"
+    key = cache_key(COMPOSITOR_VERSION, image_url, size, overlay[:3], round(overlay_alpha, 4),
+                    round(image_opacity, 4), base[:3], int(corner_radius))
+    path = cache_path("composited", key, ext)
+    if path.exists():
+        return path
+
+    data = fetch_image(image_url)
+    if not data:
+        return None
+
+    try:
+        result = blend_overlay(Image.open(BytesIO(data)), size, overlay[:3], overlay_alpha,
+                               image_opacity, base[:3])
+        out = BytesIO()
+        if corner_radius > 0:
+            result = result.convert("RGBA")
+            result.putalpha(rounded_mask(size, int(corner_radius)))
+            result.save(out, format="PNG", optimize=True)
+        else:
+            result.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    except Exception as e:
+        print(f"  [WARN] 오버레이 합성 실패: {image_url} - {e}")
+        return None
+
+    write_atomic(path, out.getvalue())
+    return path
@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""
+CSS 캐스케이드 계산 (CSS cascade resolver)
+
+html_to_json.py 가 브라우저 없이 element의 계산된 스타일(font-size, color 등)을 구할 때 사용합니다.
+문서의 모든 <style> 을 한 번 파싱하고, 규칙을 선택자의 가장 오른쪽 compound 키(#id → .class → 태그 → *)로 색인하여
+element마다 후보 규칙만 검사합니다.
+
+- 캐스케이드 순서: !important → 인라인 style → 명시도(specificity) → 선언 순서
+- 상속: INHERITED_PROPERTIES 와 사용자 정의 속성(--*)만 부모 값을 물려받음
+- var(--name, fallback) 치환, font-size 의 em / rem / % / pt / 키워드 → px
+- 선택자: 태그, #id, .class, *, :root, :first-child, :not(...), 자손( ) / 자식(>) 결합자
+  (형제 결합자 + ~, 속성 선택자, 그 밖의 의사 클래스/요소가 들어간 선택자는 일치하지 않는 것으로 처리)
+- @media print, @page, @font-face, @keyframes 등 화면 스타일이 아닌 at-rule 은 제외
+
+선택자 일치 결과는 조상 경로(태그, id, class, 첫 번째 자식 여부)별로, 계산된 스타일은 (부모 스타일, 경로, 인라인 style)별로
+메모이즈되므로 같은 구조가 반복되는 슬라이드에서는 다시 계산하지 않습니다.
+
+Usage:
+    resolver = StyleResolver(style_texts)
+    body = resolver.document()                              # html > body
+    style = resolver.enter(body, slide_node, first_child=True)  # html_backends 노드 어댑터
+    style.computed['font-size'], style.computed['color']
+"""
+
+import re
+
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.S)
+_IMPORTANT_RE = re.compile(r'\s*!\s*important\s*$', re.I)
+_LENGTH_RE = re.compile(r'^(-?\d*\.?\d+)(px|em|rem|%|pt)?$')
+_SIMPLE_SELECTOR_RE = re.compile(
+    r'\*|[a-zA-Z][\w-]*|#[\w-]+|\.[\w-]+|::?[\w-]+(?:\((?:[^()]|\([^()]*\))*\))?|\[[^\]]*\]')
+
+# 부모 값을 물려받는 속성 (사용자 정의 속성 --* 는 항상 상속)
+INHERITED_PROPERTIES = frozenset([
+    'color', 'font-family', 'font-size', 'font-style', 'font-weight', 'letter-spacing',
+    'line-height', 'text-align', 'text-transform', 'visibility', 'white-space', 'word-break',
+])
+
+# 브라우저 기본값 (medium, 검은 글자)
+INITIAL_STYLE = {'font-size': '16px', 'color': '#000000'}
+
+FONT_SIZE_KEYWORDS = {
+    'xx-small': 9.0, 'x-small': 10.0, 'small': 13.0, 'medium': 16.0,
+    'large': 18.0, 'x-large': 24.0, 'xx-large': 32.0, 'xxx-large': 48.0,
+}
+
+# var() 안의 var() / 순환 참조 방지
+MAX_VAR_DEPTH = 32
+
+
+# ========================================
+# Parsing
+# ========================================
+
+def _split_top_level(text, sep):
+    """괄호/따옴표 밖의 sep 로 분리 (url(data:...;base64,...) 등 보호)"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _iter_blocks(css):
+    """최상위 (prelude, 중괄호 안 내용) - 블록 없는 at-rule(@import ...;)은 건너뜀"""
+    i = 0
+    n = len(css)
+    while i < n:
+        brace = css.find('{', i)
+        if brace < 0:
+            return
+        prelude = css[i:brace]
+        prelude = prelude[prelude.rfind(';') + 1:]
+        depth = 1
+        j = brace + 1
+        while j < n and depth:
+            if css[j] == '{':
+                depth += 1
+            elif css[j] == '}':
+                depth -= 1
+            j += 1
+        yield prelude.strip(), css[brace + 1:j - 1]
+        i = j
+
+
+def _media_applies(query):
+    """화면 기준으로 적용되는 @media 인지 (print 전용 쿼리만 제외, 크기 조건은 따지지 않음)"""
+    query = query.lower()
+    return 'print' not in query or 'screen' in query
+
+
+def parse_declarations(text):
+    """선언 블록 → [(속성, 값, important)] (속성 이름은 소문자, 사용자 정의 속성은 그대로)"""
+    declarations = []
+    for part in _split_top_level(text, ';'):
+        prop, sep, value = part.partition(':')
+        prop = prop.strip()
+        if not sep or not prop:
+            continue
+        if not prop.startswith('--'):
+            prop = prop.lower()
+        value, important = _IMPORTANT_RE.subn('', value.strip())
+        declarations.append((prop, value.strip(), bool(important)))
+    return declarations
+
+
+def parse_stylesheet(css_text):
+    """스타일시트 → [(선택자 목록 문자열, 선언 목록)] (화면에 적용되는 규칙만, 문서 순서)"""
+    rules = []
+    for prelude, body in _iter_blocks(_COMMENT_RE.sub('', css_text)):
+        if prelude.startswith('@'):
+            if prelude[:6].lower() == '@media' and _media_applies(prelude[6:]):
+                rules.extend(parse_stylesheet(body))
+            continue
+        declarations = parse_declarations(body)
+        if prelude and declarations:
+            rules.append((prelude, declarations))
+    return rules
+
+
+# ========================================
+# Selectors
+# ========================================
+
+class Compound:
+    """compound 선택자 (.a.b:first-child 처럼 결합자 없이 붙은 단순 선택자 묶음)"""
+
+    __slots__ = ('tag', 'id', 'classes', 'first_child', 'root', 'negations', 'specificity')
+
+    def __init__(self, tag=None, el_id=None, classes=frozenset(), first_child=False, root=False,
+                 negations=(), specificity=(0, 0, 0)):
+        self.tag = tag
+        self.id = el_id
+        self.classes = classes
+        self.first_child = first_child
+        self.root = root
+        self.negations = negations
+        self.specificity = specificity
+
+    def matches(self, descriptor):
+        """descriptor: (태그, id, class frozenset, 첫 번째 자식 여부, 문서 루트 여부)"""
+        tag, el_id, classes, first_child, root = descriptor
+        if self.tag is not None and self.tag != tag:
+            return False
+        if self.id is not None and self.id != el_id:
+            return False
+        if self.classes and not self.classes <= classes:
+            return False
+        if (self.first_child and not first_child) or (self.root and not root):
+            return False
+        return not any(negation.matches(descriptor) for negation in self.negations)
+
+
+def parse_compound(text):
+    """compound 선택자 문자열 → Compound (지원하지 않는 선택자는 None)"""
+    tokens = _SIMPLE_SELECTOR_RE.findall(text)
+    if ''.join(tokens) != text:
+        return None
+    tag = el_id = None
+    classes = []
+    first_child = root = False
+    negations = []
+    ids = others = tags = 0
+    for token in tokens:
+        if token == '*':
+            continue
+        if token[0] == '#':
+            el_id = token[1:]
+            ids += 1
+        elif token[0] == '.':
+            classes.append(token[1:])
+            others += 1
+        elif token[0] == '[' or token.startswith('::'):
+            return None
+        elif token[0] == ':':
+            name = token[1:].lower()
+            if name == 'first-child':
+                first_child = True
+            elif name == 'root':
+                root = True
+            elif name.startswith('not(') and name.endswith(')'):
+                args = [parse_compound(arg.strip()) for arg in _split_top_level(token[5:-1], ',')]
+                if not args or None in args:
+                    return None
+                negations.extend(args)
+                best = max(arg.specificity for arg in args)
+                ids, others, tags = ids + best[0], others + best[1], tags + best[2]
+                continue
+            else:
+                return None  # :hover, :last-child, :before 등 - 정적 문서에서 판단할 수 없음
+            others += 1
+        else:
+            tag = token.lower()
+            tags += 1
+    return Compound(tag, el_id, frozenset(classes), first_child, root, tuple(negations), (ids, others, tags))
+
+
+def _split_compounds(selector):
+    """'.a > .b .c' → ['.a', '>', '.b', ' ', '.c']"""
+    tokens = []
+    buf = []
+    depth = 0
+    combinator = ' '
+    for ch in selector.strip():
+        if depth == 0 and (ch.isspace() or ch in '>+~'):
+            if buf:
+                tokens.append(''.join(buf))
+                buf = []
+                combinator = ' '
+            if ch in '>+~':
+                combinator = ch
+            continue
+        if not buf and tokens:
+            tokens.append(combinator)
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        buf.append(ch)
+    if buf:
+        tokens.append(''.join(buf))
+    return tokens
+
+
+class Selector:
+    """복합 선택자 - compounds/combinators 는 오른쪽(대상 element)부터"""
+
+    __slots__ = ('compounds', 'combinators', 'specificity')
+
+    def __init__(self, compounds, combinators):
+        self.compounds = compounds
+        self.combinators = combinators
+        self.specificity = tuple(sum(parts) for parts in zip(*(c.specificity for c in compounds)))
+
+    @property
+    def key(self):
+        """색인 키 (가장 오른쪽 compound의 #id → .class → 태그 → *)"""
+        subject = self.compounds[0]
+        if subject.id is not None:
+            return '#' + subject.id
+        if subject.classes:
+            return '.' + min(subject.classes)
+        return subject.tag or '*'
+
+    def matches(self, chain, i=0):
+        if not self.compounds[i].matches(chain.descriptor):
+            return False
+        if i + 1 == len(self.compounds):
+            return True
+        ancestor = chain.parent
+        if self.combinators[i] == '>':
+            return ancestor is not None and self.matches(ancestor, i + 1)
+        while ancestor is not None:
+            if self.matches(ancestor, i + 1):
+                return True
+            ancestor = ancestor.parent
+        return False
+
+
+def parse_selector(text):
+    """선택자 문자열 → Selector (지원하지 않는 선택자는 None)"""
+    tokens = _split_compounds(text)
+    if not tokens:
+        return None
+    compounds = [parse_compound(token) for token in tokens[::2]]
+    combinators = tokens[1::2]
+    if None in compounds or any(c not in (' ', '>') for c in combinators):
+        return None
+    return Selector(compounds[::-1], combinators[::-1])
+
+
+# ========================================
+# Values
+# ========================================
+
+def resolve_vars(value, variables, depth=0):
+    """var(--name, fallback) 치환 - 정의되지 않았고 fallback 도 없으면 None"""
+    start = value.find('var(')
+    if start < 0:
+        return value
+    if depth > MAX_VAR_DEPTH:
+        return None
+    end = start + 4
+    level = 1
+    while end < len(value) and level:
+        if value[end] == '(':
+            level += 1
+        elif value[end] == ')':
+            level -= 1
+        end += 1
+    if level:
+        return None
+    name, comma, fallback = value[start + 4:end - 1].partition(',')
+    replacement = variables.get(name.strip())
+    if replacement is None:
+        if not comma:
+            return None
+        replacement = resolve_vars(fallback.strip(), variables, depth + 1)
+        if replacement is None:
+            return None
+    return resolve_vars(value[:start] + replacement + value[end:], variables, depth + 1)
+
+
+def font_size_px(value, parent_px, root_px):
+    """font-size 값 → px (변환할 수 없으면 None - calc() 등)"""
+    value = value.strip().lower()
+    if value in FONT_SIZE_KEYWORDS:
+        return FONT_SIZE_KEYWORDS[value]
+    if value == 'smaller':
+        return parent_px / 1.2
+    if value == 'larger':
+        return parent_px * 1.2
+    m = _LENGTH_RE.match(value)
+    if not m:
+        return None
+    number = float(m.group(1))
+    unit = m.group(2)
+    if unit == 'px' or (unit is None and number == 0):
+        return number
+    if unit == 'em':
+        return number * parent_px
+    if unit == 'rem':
+        return number * root_px
+    if unit == '%':
+        return number * parent_px / 100
+    if unit == 'pt':
+        return number * 4 / 3
+    return None
+
+
+def format_px(px):
+    return f"{round(px, 2):g}px"
+
+
+# ========================================
+# Cascade
+# ========================================
+
+class _Chain:
+    """조상 경로 한 단계 - 선택자 일치 결과(캐스케이드된 선언)를 경로별로 한 번만 계산"""
+
+    __slots__ = ('parent', 'descriptor', 'normal', 'important')
+
+    def __init__(self, parent, descriptor):
+        self.parent = parent
+        self.descriptor = descriptor
+        self.normal = {}
+        self.important = {}
+
+
+class StyleContext:
+    """element 하나의 계산된 스타일
+
+    computed: CSS 속성 → 값 (font-size 는 px), variables: 사용자 정의 속성 → 값
+    (variables 는 element가 --* 를 선언하지 않으면 부모와 같은 dict를 공유)
+    """
+
+    __slots__ = ('parent', 'chain', 'computed', 'variables')
+
+    def __init__(self, parent, chain, computed, variables):
+        self.parent = parent
+        self.chain = chain
+        self.computed = computed
+        self.variables = variables
+
+    @property
+    def font_size_px(self):
+        return float(self.computed['font-size'][:-2])
+
+
+HTML_DESCRIPTOR = ('html', '', frozenset(), True, True)
+BODY_DESCRIPTOR = ('body', '', frozenset(), False, False)
+
+
+class StyleResolver:
+    """문서의 스타일시트 전체에 대한 캐스케이드 계산기"""
+
+    def __init__(self, style_texts):
+        self.root_font_px = float(INITIAL_STYLE['font-size'][:-2])
+        self._index = {}
+        self.rules = 0
+        order = 0
+        for css_text in style_texts:
+            for selectors, declarations in parse_stylesheet(css_text):
+                order += 1
+                for text in _split_top_level(selectors, ','):
+                    selector = parse_selector(text)
+                    if selector is None:
+                        continue
+                    self._index.setdefault(selector.key, []).append((selector, order, declarations))
+                    self.rules += 1
+        self._chains = {}
+        self._contexts = {}
+        self.root = self._enter(None, HTML_DESCRIPTOR, '')
+        self.root_font_px = self.root.font_size_px
+
+    def _candidates(self, descriptor):
+        tag, el_id, classes = descriptor[:3]
+        candidates = self._index.get('*', []) + self._index.get(tag, [])
+        if el_id:
+            candidates += self._index.get('#' + el_id, [])
+        for class_name in classes:
+            candidates += self._index.get('.' + class_name, [])
+        return candidates
+
+    def _chain(self, parent, descriptor):
+        key = (parent, descriptor)
+        chain = self._chains.get(key)
+        if chain is not None:
+            return chain
+        chain = _Chain(parent, descriptor)
+        matched = []
+        for selector, order, declarations in self._candidates(descriptor):
+            if selector.matches(chain):
+                matched.append((selector.specificity, order, declarations))
+        matched.sort(key=lambda m: (m[0], m[1]))
+        for _, _, declarations in matched:
+            for prop, value, important in declarations:
+                (chain.important if important else chain.normal)[prop] = value
+        self._chains[key] = chain
+        return chain
+
+    def _enter(self, parent, descriptor, inline_style):
+        chain = self._chain(parent.chain if parent is not None else None, descriptor)
+        key = (parent, chain, inline_style)
+        context = self._contexts.get(key)
+        if context is None:
+            context = StyleContext(parent, chain, *self._compute(parent, chain, inline_style))
+            self._contexts[key] = context
+        return context
+
+    def enter(self, parent, node, first_child=False):
+        """parent 아래 node(html_backends 어댑터)의 StyleContext"""
+        descriptor = (node.name, node.get('id', ''), frozenset(node.classes), first_child, False)
+        return self._enter(parent, descriptor, node.get('style', ''))
+
+    def document(self):
+        """<body> 의 StyleContext (슬라이드 div 의 부모)"""
+        return self._enter(self.root, BODY_DESCRIPTOR, '')
+
+    def root_variables(self):
+        """:root / html 에 선언된 사용자 정의 속성 (var() 치환 후)"""
+        return dict(self.root.variables)
+
+    def _compute(self, parent, chain, inline_style):
+        inline_normal = {}
+        inline_important = {}
+        for prop, value, important in parse_declarations(inline_style) if inline_style else ():
+            (inline_important if important else inline_normal)[prop] = value
+        declared = dict(chain.normal)
+        declared.update(inline_normal)
+        declared.update(chain.important)
+        declared.update(inline_important)
+
+        parent_style = parent.computed if parent is not None else INITIAL_STYLE
+        variables = parent.variables if parent is not None else {}
+        custom = [(prop, value) for prop, value in declared.items() if prop.startswith('--')]
+        if custom:
+            variables = dict(variables)
+            for prop, value in custom:
+                value = resolve_vars(value, variables)
+                if value is not None:
+                    variables[prop] = value
+        computed = {prop: value for prop, value in parent_style.items() if prop in INHERITED_PROPERTIES}
+
+        parent_px = float(parent_style['font-size'][:-2])
+        root_px = self.root_font_px if parent is not None else parent_px
+        for prop, value in declared.items():
+            if prop.startswith('--'):
+                continue
+            value = resolve_vars(value, variables)
+            if value is None:
+                continue  # 정의되지 않은 변수 - 선언 무시 (상속값 유지)
+            keyword = value.lower()
+            if keyword == 'unset':
+                keyword = 'inherit' if prop in INHERITED_PROPERTIES else 'initial'
+            if keyword == 'inherit' and prop in parent_style:
+                computed[prop] = parent_style[prop]
+                continue
+            if keyword in ('inherit', 'initial'):
+                computed.pop(prop, None)
+                if prop in INITIAL_STYLE:
+                    computed[prop] = INITIAL_STYLE[prop]
+                continue
+            if prop == 'font-size':
+                px = font_size_px(value, parent_px, root_px)
+                if px is None:
+                    continue
+                value = format_px(px)
+            elif prop == 'color' and keyword == 'currentcolor':
+                value = parent_style.get('color', INITIAL_STYLE['color'])
+            computed[prop] = value
+        return computed, variables
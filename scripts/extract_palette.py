@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+색상 팔레트 추출 (PDF 페이지 / 스타일 샘플 이미지)
+
+PDF 페이지를 낮은 DPI로 렌더링하거나 샘플 이미지(PNG/JPG)를 읽어 NumPy 배열로 만든 뒤,
+이미지마다 일정 수의 픽셀을 뽑아 Lab 색 공간에서 mini-batch k-means 로 군집화합니다.
+군집 결과에서 background(가장 흔한 페이지 배경), primary(가장 많이 쓰인 유채색),
+accent(primary와 색상이 다른 두 번째 유채색), text(배경과 대비가 큰 무채색)를 골라
+designTokens.colors 형식으로 출력합니다.
+
+- 렌더링한 페이지는 (PDF SHA-256, 페이지, DPI) 키로 .cache/pdf_render/ 에 PNG로 저장
+- 팔레트 결과는 (입력 파일 SHA-256 목록, 설정, PALETTE_VERSION) 키로 .cache/palette/ 에 저장
+- 샘플링/초기화는 고정 시드를 사용하므로 같은 입력이면 항상 같은 팔레트
+
+Usage:
+    python scripts/extract_palette.py <pdf|image|folder>... [--k 8] [--dpi 36] [--output colors.json]
+    python scripts/extract_palette.py projects/icecreammedia_v1/style_sample
+"""
+
+import argparse
+import json
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from image_cache import cache_key, cache_path, file_sha256, write_atomic
+
+try:
+    import pypdfium2 as pdfium
+    HAS_PDFIUM = True
+except ImportError:  # pdfplumber 설치 시 함께 설치됨
+    pdfium = None
+    HAS_PDFIUM = False
+
+
+# 알고리즘/출력 형식이 바뀌면 올려서 기존 팔레트 캐시를 무효화
+PALETTE_VERSION = 1
+RENDER_NAMESPACE = 'pdf_render'
+PALETTE_NAMESPACE = 'palette'
+
+RENDER_DPI = 36
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+# 샘플 이미지는 긴 변을 이 크기로 줄인 뒤 사용 (팔레트에는 충분한 해상도)
+MAX_IMAGE_SIDE = 480
+SAMPLES_PER_IMAGE = 2048
+PALETTE_SIZE = 8
+BATCH_SIZE = 1024
+KMEANS_ITERATIONS = 64
+RANDOM_SEED = 0
+
+# Lab 거리(ΔE76) 기준: 이보다 가까운 군집은 합치고, accent 는 primary 와 ACCENT_DELTA_E 이상 달라야 함
+MERGE_DELTA_E = 10
+ACCENT_DELTA_E = 25
+# 유채색으로 볼 최소 채도 (Lab chroma), 토큰 후보로 볼 최소 비율
+CHROMA_MIN = 20
+SHARE_MIN = 0.01
+
+# sRGB(D65) → XYZ
+_RGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_XYZ_TO_RGB = np.linalg.inv(_RGB_TO_XYZ)
+_WHITE_D65 = np.array([0.95047, 1.0, 1.08883])
+_LAB_EPSILON = 216 / 24389
+_LAB_KAPPA = 24389 / 27
+_SRGB_CHANNEL = np.arange(256) / 255
+_SRGB_LINEAR = np.where(_SRGB_CHANNEL <= 0.04045, _SRGB_CHANNEL / 12.92,
+                        ((_SRGB_CHANNEL + 0.055) / 1.055) ** 2.4)
+
+
+# ========================================
+# Color space
+# ========================================
+
+def srgb_to_lab(rgb):
+    """uint8 RGB 배열 (N, 3) → CIE Lab (N, 3)"""
+    xyz = _SRGB_LINEAR[rgb] @ _RGB_TO_XYZ.T / _WHITE_D65
+    f = np.where(xyz > _LAB_EPSILON, np.cbrt(xyz), (_LAB_KAPPA * xyz + 16) / 116)
+    return np.stack([116 * f[:, 1] - 16, 500 * (f[:, 0] - f[:, 1]), 200 * (f[:, 1] - f[:, 2])], axis=1)
+
+
+def lab_to_hex(lab):
+    """Lab 색 하나 → #RRGGBB"""
+    fy = (lab[0] + 16) / 116
+    f = np.array([fy + lab[1] / 500, fy, fy - lab[2] / 200])
+    xyz = np.where(f ** 3 > _LAB_EPSILON, f ** 3, (116 * f - 16) / _LAB_KAPPA) * _WHITE_D65
+    linear = np.clip(_XYZ_TO_RGB @ xyz, 0, 1)
+    srgb = np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * linear ** (1 / 2.4) - 0.055)
+    return '#' + ''.join(f"{round(v * 255):02X}" for v in np.clip(srgb, 0, 1))
+
+
+def chroma(lab):
+    return float(np.hypot(lab[1], lab[2]))
+
+
+def delta_e(lab1, lab2):
+    return float(np.linalg.norm(np.asarray(lab1) - np.asarray(lab2)))
+
+
+# ========================================
+# Image loading
+# ========================================
+
+def load_image(path):
+    """이미지 파일 → uint8 RGB 배열 (투명 영역은 흰 배경에 합성, 긴 변 MAX_IMAGE_SIDE 이하)"""
+    with Image.open(path) as image:
+        image.draft('RGB', (MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))  # JPEG는 디코딩 단계에서 축소
+        image = image.convert('RGBA')
+    image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+    background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+    return np.asarray(Image.alpha_composite(background, image).convert('RGB'))
+
+
+def render_pdf_pages(pdf_path, pdf_digest=None, dpi=RENDER_DPI, use_cache=True):
+    """PDF 페이지를 dpi 로 렌더링한 uint8 RGB 배열을 페이지 순서대로 생성 (캐시된 페이지는 렌더링 생략)"""
+    if not HAS_PDFIUM:
+        raise RuntimeError("PDF 렌더링에 pypdfium2 가 필요합니다 - pip install pdfplumber")
+    if use_cache and not pdf_digest:
+        pdf_digest = file_sha256(pdf_path)
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    try:
+        for i in range(len(pdf)):
+            path = cache_path(RENDER_NAMESPACE, cache_key(pdf_digest, i, dpi), '.png') if use_cache else None
+            if path is not None and path.exists():
+                try:
+                    with Image.open(path) as image:
+                        yield np.asarray(image.convert('RGB'))
+                    continue
+                except OSError:
+                    pass  # 깨진 캐시 - 다시 렌더링
+            page = pdf[i]
+            image = page.render(scale=dpi / 72).to_pil().convert('RGB')
+            page.close()
+            if path is not None:
+                buffer = BytesIO()
+                image.save(buffer, 'PNG')
+                write_atomic(path, buffer.getvalue())
+            yield np.asarray(image)
+    finally:
+        pdf.close()
+
+
+def expand_sources(paths):
+    """입력 경로 목록 → 파일 목록 (폴더는 하위 이미지 파일을 이름 순으로)"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += sorted(p for p in path.rglob('*') if p.suffix.lower() in IMAGE_EXTENSIONS)
+        else:
+            files.append(path)
+    return files
+
+
+# ========================================
+# Clustering
+# ========================================
+
+def dominant_color(image):
+    """가장 많은 픽셀이 속한 색 (채널당 16단계로 묶은 뒤 그 픽셀들의 평균) - 페이지 배경 추정용"""
+    pixels = image.reshape(-1, 3)
+    codes = (pixels >> 4).astype(np.int32) @ np.array([256, 16, 1], dtype=np.int32)
+    top = np.argmax(np.bincount(codes, minlength=4096))
+    return pixels[codes == top].mean(axis=0).round().astype(np.uint8)
+
+
+def sample_pixels(image, count, rng):
+    pixels = image.reshape(-1, 3)
+    if len(pixels) <= count:
+        return pixels
+    return pixels[rng.choice(len(pixels), count, replace=False)]
+
+
+def nearest_center(points, centers):
+    """점마다 가장 가까운 중심 인덱스 (|p|² - 2p·c + |c|², 점 × 중심 행렬만 사용)"""
+    distances = (centers ** 2).sum(axis=1) - 2 * points @ centers.T
+    return np.argmin(distances, axis=1)
+
+
+def _init_centers(points, k, rng):
+    """k-means++ 초기 중심 (서로 다른 색이 k개보다 적으면 그만큼만)"""
+    centers = [points[rng.integers(len(points))]]
+    distance = ((points - centers[0]) ** 2).sum(axis=1)
+    while len(centers) < k and distance.sum() > 0:
+        center = points[rng.choice(len(points), p=distance / distance.sum())]
+        centers.append(center)
+        distance = np.minimum(distance, ((points - center) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+def minibatch_kmeans(points, k=PALETTE_SIZE, rng=None):
+    """Mini-batch k-means (Sculley 2010) - 중심마다 지금까지 배정된 점 수의 역수를 학습률로 사용"""
+    rng = rng or np.random.default_rng(RANDOM_SEED)
+    init = points if len(points) <= 4 * BATCH_SIZE else points[rng.choice(len(points), 4 * BATCH_SIZE, replace=False)]
+    centers = _init_centers(init, k, rng)
+    totals = np.zeros(len(centers))
+    for _ in range(KMEANS_ITERATIONS):
+        batch = points[rng.integers(len(points), size=min(BATCH_SIZE, len(points)))]
+        labels = nearest_center(batch, centers)
+        counts = np.bincount(labels, minlength=len(centers))
+        sums = np.stack([np.bincount(labels, weights=batch[:, c], minlength=len(centers)) for c in range(3)], axis=1)
+        totals += counts
+        assigned = counts > 0
+        rate = counts[assigned] / totals[assigned]
+        centers[assigned] += rate[:, None] * (sums[assigned] / counts[assigned, None] - centers[assigned])
+    return centers
+
+
+def build_palette(lab_points, k=PALETTE_SIZE, rng=None):
+    """Lab 점 → [{'lab', 'share'}] (비율 내림차순, ΔE 가 MERGE_DELTA_E 보다 가까운 군집은 합침)"""
+    centers = minibatch_kmeans(lab_points, k, rng)
+    shares = np.bincount(nearest_center(lab_points, centers), minlength=len(centers)) / len(lab_points)
+    palette = [{'lab': center, 'share': float(share)} for center, share in zip(centers, shares) if share > 0]
+    merged = True
+    while merged and len(palette) > 1:
+        merged = False
+        for i in range(len(palette)):
+            for j in range(i + 1, len(palette)):
+                a, b = palette[i], palette[j]
+                if delta_e(a['lab'], b['lab']) < MERGE_DELTA_E:
+                    share = a['share'] + b['share']
+                    palette[i] = {'lab': (a['lab'] * a['share'] + b['lab'] * b['share']) / share, 'share': share}
+                    del palette[j]
+                    merged = True
+                    break
+            if merged:
+                break
+    return sorted(palette, key=lambda entry: -entry['share'])
+
+
+def palette_tokens(palette, backgrounds=()):
+    """팔레트 → designTokens.colors
+
+    background 는 페이지 배경 중 가장 흔한 색 (이미지별 배경이 없으면 비율이 가장 큰 군집),
+    primary/accent 는 배경이 아닌 유채색 군집 중 비율 순, text 는 배경과 명도 차이가 큰 무채색 순입니다.
+    """
+    if backgrounds:
+        labs = srgb_to_lab(np.array(backgrounds, dtype=np.uint8))
+        hexes = [lab_to_hex(lab) for lab in labs]
+        background = labs[max(range(len(hexes)), key=lambda i: (hexes.count(hexes[i]), -i))]
+    else:
+        background = palette[0]['lab']
+
+    candidates = [entry for entry in palette
+                  if entry['share'] >= SHARE_MIN and delta_e(entry['lab'], background) >= MERGE_DELTA_E]
+    chromatic = [entry for entry in candidates if chroma(entry['lab']) >= CHROMA_MIN]
+    neutral = sorted((entry for entry in candidates if chroma(entry['lab']) < CHROMA_MIN),
+                     key=lambda entry: -abs(entry['lab'][0] - background[0]))
+    text_default = np.array([0.0, 0.0, 0.0]) if background[0] > 50 else np.array([100.0, 0.0, 0.0])
+
+    primary = chromatic[0] if chromatic else (neutral[0] if neutral else None)
+    primary_lab = primary['lab'] if primary else text_default
+    tokens = {
+        "primary": {"main": lab_to_hex(primary_lab), "description": "Most used chromatic color (k-means, Lab)"},
+        "background": {"main": lab_to_hex(background), "description": "Most common page background"},
+    }
+    accent = next((entry for entry in chromatic[1:] if delta_e(entry['lab'], primary_lab) >= ACCENT_DELTA_E), None)
+    if accent:
+        tokens["accent"] = {"main": lab_to_hex(accent['lab']), "description": "Second chromatic color"}
+    tokens["text"] = {
+        "primary": lab_to_hex(neutral[0]['lab'] if neutral else text_default),
+        "secondary": lab_to_hex(neutral[1]['lab']) if len(neutral) > 1 else "#666666",
+    }
+    tokens["palette"] = [{"color": lab_to_hex(entry['lab']), "share": round(entry['share'], 3)} for entry in palette]
+    return tokens
+
+
+# ========================================
+# Extraction
+# ========================================
+
+def iter_images(files, digests, dpi=RENDER_DPI, use_cache=True):
+    """입력 파일 → (이름, RGB 배열) - PDF는 페이지마다 '파일#페이지'"""
+    for path, digest in zip(files, digests):
+        if path.suffix.lower() == '.pdf':
+            for i, image in enumerate(render_pdf_pages(path, digest, dpi, use_cache)):
+                yield f"{path.name}#{i + 1}", image
+        else:
+            yield path.name, load_image(path)
+
+
+def extract_palette(paths, k=PALETTE_SIZE, dpi=RENDER_DPI, use_cache=True):
+    """PDF / 이미지 / 폴더 경로 목록 → {'colors': designTokens.colors, 'images': [{'source', 'background'}]}
+
+    결과는 입력 파일 내용 해시 기준으로 캐시됩니다.
+    """
+    files = expand_sources(paths)
+    if not files:
+        raise ValueError("팔레트를 추출할 PDF/이미지가 없습니다")
+    path = None
+    digests = [file_sha256(f) for f in files] if use_cache else [None] * len(files)
+    if use_cache:
+        key = cache_key(PALETTE_VERSION, k, dpi, SAMPLES_PER_IMAGE, *digests)
+        path = cache_path(PALETTE_NAMESPACE, key, '.json')
+        if path.exists():
+            try:
+                return json.loads(path.read_text(encoding='utf-8'))
+            except ValueError:
+                pass
+
+    rng = np.random.default_rng(RANDOM_SEED)
+    samples = []
+    images = []
+    for name, image in iter_images(files, digests, dpi, use_cache):
+        samples.append(sample_pixels(image, SAMPLES_PER_IMAGE, rng))
+        images.append({"source": name, "background": dominant_color(image)})
+
+    palette = build_palette(srgb_to_lab(np.concatenate(samples)), k, rng)
+    result = {
+        "colors": palette_tokens(palette, [image['background'] for image in images]),
+        "images": [{"source": image['source'], "background": "#%02X%02X%02X" % tuple(image['background'])}
+                   for image in images],
+    }
+    if path is not None:
+        write_atomic(path, json.dumps(result, ensure_ascii=False).encode('utf-8'))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF / 스타일 샘플 이미지 색상 팔레트 추출")
+    parser.add_argument("paths", nargs='+', help="PDF, 이미지 파일 또는 폴더")
+    parser.add_argument("--k", type=int, default=PALETTE_SIZE, help=f"군집 수 (기본 {PALETTE_SIZE})")
+    parser.add_argument("--dpi", type=int, default=RENDER_DPI, help=f"PDF 렌더링 DPI (기본 {RENDER_DPI})")
+    parser.add_argument("--output", help="designTokens.colors JSON 저장 경로 (없으면 출력만)")
+    parser.add_argument("--no-cache", action="store_true", help="렌더링/팔레트 캐시 사용 안 함")
+    args = parser.parse_args()
+
+    result = extract_palette(args.paths, k=max(1, args.k), dpi=args.dpi, use_cache=not args.no_cache)
+    colors = result['colors']
+    for name in ('background', 'primary', 'accent'):
+        if name in colors:
+            print(f"{name:<12} {colors[name]['main']}")
+    print(f"{'text':<12} {colors['text']['primary']} / {colors['text']['secondary']}")
+    print("palette      " + "  ".join(f"{entry['color']} {entry['share']:.0%}" for entry in colors['palette']))
+
+    if args.output:
+        write_atomic(args.output, (json.dumps(colors, indent=2, ensure_ascii=False) + "\n").encode('utf-8'))
+        print(f"Saved to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+슬라이드 HTML 조각 캐시 (Per-slide fragment cache)
+
+generate_html.py 가 슬라이드마다 렌더링한 HTML 조각을 프로젝트 폴더에 저장하고,
+다음 빌드에서 바뀌지 않은 슬라이드는 다시 렌더링하지 않고 그대로 이어 붙입니다.
+
+캐시 키: 슬라이드 JSON + 빌드 컨텍스트(디자인 토큰, 렌더러/템플릿 버전, 빌드 옵션) + 슬라이드 번호 + 마지막 여부
+캐시 위치: projects/<name>/.build_cache/fragments/<빌드 컨텍스트>/
+
+조각은 빌드 컨텍스트별 폴더에 저장하므로 옵션을 바꿔 가며 빌드해도 각 옵션의 조각이 함께 유지됩니다.
+전체 빌드 후 정리(prune)는 현재 컨텍스트 폴더에서 이번 빌드에 쓰지 않은 조각과,
+STALE_CONTEXT_AGE 동안 빌드하지 않은 다른 컨텍스트 폴더만 삭제합니다.
+"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+from image_cache import cache_key, write_atomic
+
+
+FRAGMENT_CACHE_DIR = os.path.join('.build_cache', 'fragments')
+# 다른 빌드 컨텍스트의 조각 폴더는 이 기간(초) 동안 빌드하지 않았을 때 삭제
+STALE_CONTEXT_AGE = 7 * 24 * 3600
+
+
+class FragmentCache:
+    """슬라이드 조각 캐시 - context 는 덱 전체에 공통인 키 요소 (토큰, 버전, 옵션)"""
+
+    def __init__(self, project_dir, context):
+        self.base = Path(project_dir) / FRAGMENT_CACHE_DIR
+        self.context = cache_key(*context)
+        self.root = self.base / self.context[:16]
+        self.hits = 0
+        self.misses = 0
+        self.used = set()
+
+    def key(self, slide_number, slide, is_last):
+        slide_json = json.dumps(slide, sort_keys=True, ensure_ascii=False, default=str)
+        return cache_key(self.context, slide_number, is_last, slide_json)
+
+    def path(self, key):
+        return self.root / key[:2] / f"{key}.html"
+
+    def get(self, key):
+        """캐시된 조각 (없으면 None)"""
+        self.used.add(key)
+        try:
+            fragment = self.path(key).read_text(encoding='utf-8')
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return fragment
+
+    def put(self, key, fragment):
+        self.used.add(key)
+        try:
+            write_atomic(self.path(key), fragment.encode('utf-8'))
+        except OSError as e:
+            print(f"  [WARN] 조각 캐시 저장 실패: {e}")
+
+    def prune(self):
+        """현재 컨텍스트에서 이번 빌드에 쓰지 않은 조각 + 오래된 다른 컨텍스트 삭제 (전체 빌드 후에만 호출)
+
+        삭제한 파일 수 반환
+        """
+        removed = 0
+        if not self.base.is_dir():
+            return removed
+        for path in self.root.glob('*/*.html'):
+            if path.stem not in self.used:
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError:
+                    pass
+        try:
+            os.utime(self.root)  # 폴더 수정 시각 = 이 컨텍스트로 마지막 빌드한 시각
+        except OSError:
+            pass
+
+        expires = time.time() - STALE_CONTEXT_AGE
+        for path in self.base.iterdir():
+            try:
+                if path == self.root or not path.is_dir() or path.stat().st_mtime > expires:
+                    continue
+                stale = sum(1 for _ in path.rglob('*.html'))
+                shutil.rmtree(path)
+                removed += stale
+            except OSError:
+                pass
+        return removed
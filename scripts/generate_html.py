@@ -1,6 +1,37 @@
+import argparse
+import hashlib
+import importlib.util
 import json
 import os
+import re
+import shutil
 import sys
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+
+from slide_selection import select_slides, is_partial
+from reproducible import record_artifact
+from html_templates import ENGINE_VERSION, load_templates, read_static
+from image_cache import write_atomic
+from fragment_cache import FragmentCache
+from html_minify import format_report, minify_css, minify_html, size_report
+
+# 슬라이드 크기 (297mm × 167mm @ 96 DPI) - 합성 배경 이미지 해상도 기준
+SLIDE_SIZE_PX = (1123, 631)
+# 인쇄 품질을 위한 합성 이미지 배율
+COMPOSITE_SCALE = 2
+# HTML 출력 파일 쓰기 버퍼 크기
+WRITE_BUFFER_SIZE = 1 << 16
+# --shared-css 기본 출력 폴더 (프로젝트 폴더 기준)
+SHARED_CSS_DIR = 'assets'
+# render_slide/render_element 출력 형식이 바뀌면 올려서 슬라이드 조각 캐시 무효화
+RENDERER_VERSION = 2
+# --workers: 작업 하나에 묶는 최대 슬라이드 수 / 워커당 동시에 제출해 두는 작업 수
+MAX_CHUNK_SLIDES = 64
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
 
 # Icon mapping - Unicode/Emoji icons for common logistics icons
 ICON_MAP = {
@@ -45,6 +76,11 @@ def get_icon(icon_name):
     """Convert icon name to actual icon (emoji or SVG)"""
     return ICON_MAP.get(icon_name, '●')
 
+# 마크업 템플릿 (scripts/templates/*.html, Jinja2) - 모듈 로드 시 한 번만 컴파일
+DOCUMENT_TEMPLATES = load_templates('document')
+SLIDE_TEMPLATES = load_templates('slide')
+ELEMENT_TEMPLATES = load_templates('elements', get_icon=get_icon)
+
 def extract_color_value(color_obj):
     """Extract actual color value from color object or string"""
     if isinstance(color_obj, dict):
@@ -52,20 +88,74 @@ def extract_color_value(color_obj):
         return color_obj.get('main') or color_obj.get('dark') or next(iter(color_obj.values()), '#333333')
     return color_obj if color_obj else '#333333'
 
-def generate_html(project_name):
+def composite_background(background, base_color, project_dir):
+    """image-overlay 배경(이미지 + 오버레이)을 합성 이미지 1장으로 만들어 상대 경로 반환
+
+    합성할 수 없으면(NumPy 없음, 다운로드 실패, 그라데이션 오버레이 등) None을 반환합니다.
+    """
+    import compositor  # Pillow/requests 필요 - --composite 빌드에서만 로드
+    size = (SLIDE_SIZE_PX[0] * COMPOSITE_SCALE, SLIDE_SIZE_PX[1] * COMPOSITE_SCALE)
+    path = compositor.composite_overlay(
+        background.get('image', ''), size,
+        background.get('overlayColor', 'rgba(0, 0, 0, 0.7)'),
+        image_opacity=background.get('imageOpacity', 0.4),
+        base_color=base_color,
+        base_dir=project_dir,
+    )
+    if not path:
+        return None
+    target = os.path.join(project_dir, 'assets', 'composited', path.name)
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copyfile(path, target)
+    return f"assets/composited/{path.name}"
+
+def generate_html(project_name, slides=None, template=None, composite=False, reproducible=False,
+                  intern_styles=False, shared_css=None, self_contained=None, use_cache=True, workers=1,
+                  minify=False):
+    """presentation.json → presentation.html
+
+    slides/template 필터를 지정하면 선택한 슬라이드만 presentation_preview.html로 생성합니다.
+    composite=True 이면 image-overlay 배경을 합성 이미지 1장으로 출력합니다.
+    reproducible=True 이면 결과물 다이제스트를 build_manifest.json에 기록합니다.
+    intern_styles=True 이면 반복되는 element 인라인 스타일을 <style>의 클래스 하나로 출력합니다.
+    shared_css 를 지정하면 정적 CSS를 콘텐츠 해시 이름의 공유 파일로 쓰고 <link>로 참조합니다
+    (True: <project>/assets/, 문자열: 해당 폴더). :root 디자인 토큰만 인라인으로 남습니다.
+    self_contained='inline' | 'assets' 이면 네트워크 없이 인쇄할 수 있도록 subset 폰트를 포함하고
+    이미지를 렌더링 크기로 재인코딩하여 data URI('inline') 또는 assets/images/('assets')로 바꿉니다.
+    use_cache=True 이면 바뀌지 않은 슬라이드는 .build_cache/fragments/ 의 조각을 재사용합니다.
+    workers > 1 이면 다시 렌더링할 슬라이드를 묶음 단위로 프로세스 풀에서 렌더링합니다 (대형 덱용).
+    minify=True 이면 HTML/CSS를 최소화하여 쓰고 분류별 크기(CSS, markup, inline style, data URI)를 출력합니다.
+
+    Returns:
+        bool - JSON이 없거나 슬라이드 필터가 잘못되었거나 선택된 슬라이드가 없으면 파일을 쓰지 않고 False
+    """
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     project_dir = os.path.join(base_dir, 'projects', project_name)
     json_path = os.path.join(project_dir, 'presentation.json')
-    html_path = os.path.join(project_dir, 'presentation.html')
+    partial = is_partial(slides, template)
+    html_name = 'presentation_preview.html' if partial else 'presentation.html'
+    html_path = os.path.join(project_dir, html_name)
 
     if not os.path.exists(json_path):
         print(f"Error: {json_path} not found.")
-        return
+        return False
 
     with open(json_path, 'r', encoding='utf-8') as f:
         data = json.load(f)
 
-    slides = data.get('slides', [])
+    renderers = load_project_renderers(project_dir)
+
+    try:
+        selected = select_slides(data.get('slides', []), slides, template)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return False
+    if partial:
+        print(f"Preview: {len(selected)} slides selected (slides={slides or '*'}, template={template or '*'})")
+        if not selected:
+            print("Error: no slides match the given --slides/--template filter.")
+            return False
     design_tokens = data.get('designTokens', {})
     colors = design_tokens.get('colors', {})
     typography = design_tokens.get('typography', {})
@@ -82,1441 +172,698 @@ def generate_html(project_name):
     text_secondary = extract_color_value(colors.get('text', {}).get('secondary', '#CCCCCC')) if isinstance(colors.get('text'), dict) else '#CCCCCC'
     text_muted = extract_color_value(colors.get('text', {}).get('muted', '#888888')) if isinstance(colors.get('text'), dict) else '#888888'
     
-    # CSS Variables - properly formatted with full design token system
-    css_vars = f""":root {{
-  /* Colors */
-  --primary: {primary_color};
-  --primary-light: {colors.get('primary', {}).get('light', '#FF8A5B') if isinstance(colors.get('primary'), dict) else '#FF8A5B'};
-  --primary-dark: {colors.get('primary', {}).get('dark', '#E55A25') if isinstance(colors.get('primary'), dict) else '#E55A25'};
-  --secondary: {secondary_color};
-  --bg-dark: {bg_dark};
-  --bg-darker: {colors.get('background', {}).get('darker', '#0D0D0D') if isinstance(colors.get('background'), dict) else '#0D0D0D'};
-  --bg-card: {bg_card};
-  --bg-overlay: rgba(0, 0, 0, 0.7);
-  --text-primary: {text_primary};
-  --text-secondary: {text_secondary};
-  --text-muted: {text_muted};
-  --chart-orange: {primary_color};
-  --chart-yellow: {secondary_color};
-  --chart-gray: #4A4A4A;
-  
-  /* Typography */
-  --font-main: 'Pretendard', 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-  --font-heading: 'Pretendard', 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-  
-  /* Font Sizes - from design tokens */
-  --size-hero: 72px;
-  --size-h1: 48px;
-  --size-h2: 36px;
-  --size-h3: 24px;
-  --size-body: 16px;
-  --size-caption: 12px;
-  --size-stat: 64px;
-  
-  /* Font Weights */
-  --weight-extra-bold: 800;
-  --weight-bold: 700;
-  --weight-semi-bold: 600;
-  --weight-regular: 400;
-  
-  /* Spacing - 8px grid system */
-  --space-page-h: 60px;
-  --space-page-v: 48px;
-  --space-section: 40px;
-  --space-element: 24px;
-  --space-tight: 12px;
-  --space-xs: 8px;
-  
-  /* Effects */
-  --radius-card: 8px;
-  --radius-image: 4px;
-  --shadow-card: 0 4px 20px rgba(0, 0, 0, 0.3);
-}}
-"""
-
-    html_content = f"""<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{data.get('metadata', {}).get('companyName', data.get('projectName', 'Presentation'))}</title>
-    <style>
-        {css_vars}
-        
-        /* Import Fonts */
-        @import url('https://cdn.jsdelivr.net/gh/orioncactus/pretendard/dist/web/static/pretendard.css');
-
-        * {{
-            box-sizing: border-box;
-            margin: 0;
-            padding: 0;
-        }}
-
-        body {{
-            font-family: var(--font-main);
-            background-color: #202020;
-            color: var(--text-primary);
-            -webkit-print-color-adjust: exact;
-            print-color-adjust: exact;
-            -webkit-font-smoothing: antialiased;
-            -moz-osx-font-smoothing: grayscale;
-        }}
-
-        .slide {{
-            width: 297mm;
-            height: 167mm;
-            background: var(--bg-dark);
-            color: var(--text-primary);
-            position: relative;
-            overflow: hidden;
-            page-break-after: always;
-            break-after: page;
-            margin: 0 auto;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .slide.last-slide {{
-            page-break-after: avoid;
-            break-after: avoid;
-        }}
-
-        /* Layout Containers */
-        .content-overlay {{
-            position: relative;
-            z-index: 2;
-            width: 100%;
-            height: 100%;
-            padding: var(--space-page-v) var(--space-page-h);
-            display: flex;
-            flex-direction: column;
-        }}
-
-        /* Split Layout (Left Text / Right Image) */
-        .layout-split {{
-            display: flex;
-        }}
-        
-        .layout-split .content-overlay {{
-            display: grid;
-            grid-template-columns: 1fr 1fr;
-            gap: 0;
-            align-items: stretch;
-            padding: 0;
-            width: 100%;
-            height: 100%;
-        }}
-        
-        /* Image Left Layout */
-        .layout-split.image-left .content-overlay {{
-            grid-template-columns: 1fr 1fr;
-        }}
-        
-        .layout-split .col-left {{
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            height: 100%;
-            padding: var(--space-page-v) var(--space-section) var(--space-page-v) var(--space-page-h);
-            overflow: hidden;
-        }}
-        
-        .layout-split.image-left .col-left {{
-            padding: 0;
-            overflow: hidden;
-        }}
-        
-        .layout-split.image-left .col-left .element-image {{
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-            border-radius: 0;
-        }}
-        
-        .layout-split .col-right {{
-            position: relative;
-            height: 100%;
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            overflow: hidden;
-        }}
-        
-        .layout-split:not(.image-left) .col-right {{
-            padding: 0;
-        }}
-        
-        .layout-split.image-left .col-right {{
-            padding: var(--space-page-v) var(--space-page-h) var(--space-page-v) var(--space-section);
-        }}
-        
-        .layout-split:not(.image-left) .col-right .element-image {{
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-            border-radius: 0;
-        }}
-
-        /* Center Layout */
-        .layout-center .content-overlay {{
-            align-items: center;
-            text-align: center;
-            justify-content: center;
-        }}
-
-        /* Typography - Professional Template Style */
-        .element-heading {{
-            font-family: var(--font-heading);
-            font-size: var(--size-h1);
-            font-weight: var(--weight-extra-bold);
-            line-height: 1.1;
-            letter-spacing: -0.02em;
-            margin-bottom: var(--space-element);
-            color: var(--text-primary);
-            text-transform: uppercase;
-            white-space: pre-line;
-        }}
-        
-        .element-subheading {{
-            font-size: 20px;
-            font-weight: var(--weight-regular);
-            line-height: 1.5;
-            margin-bottom: var(--space-element);
-            color: var(--text-secondary);
-            white-space: pre-line;
-        }}
-        
-        .element-badge {{
-            font-size: var(--size-caption);
-            font-weight: var(--weight-regular);
-            color: var(--text-muted);
-            letter-spacing: 0.05em;
-            margin-bottom: var(--space-tight);
-            display: inline-block;
-            text-transform: none;
-        }}
-        
-        .element-body {{
-            font-size: var(--size-body);
-            font-weight: var(--weight-regular);
-            line-height: 1.7;
-            color: var(--text-secondary);
-            margin-bottom: var(--space-tight);
-        }}
-        
-        .element-quote {{
-            font-size: 18px;
-            font-style: italic;
-            color: var(--text-secondary);
-            margin-top: var(--space-element);
-            padding: 20px;
-            border-left: 3px solid var(--primary);
-            background: rgba(255,255,255,0.03);
-        }}
-        
-        .element-logo {{
-            font-size: var(--size-h3);
-            font-weight: var(--weight-bold);
-            color: var(--primary);
-            margin-bottom: var(--space-xs);
-        }}
-
-        /* Image Handling */
-        .element-image {{
-            max-width: 100%;
-            height: auto;
-            border-radius: var(--radius-image);
-            box-shadow: var(--shadow-card);
-        }}
-
-        /* Background Image */
-        .bg-image {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            object-fit: cover;
-            z-index: 0;
-        }}
-        
-        .bg-overlay {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            z-index: 1;
-        }}
-        
-        /* Section Divider - Professional Style */
-        .template-section-divider .content-overlay {{
-            justify-content: center;
-            align-items: flex-start;
-            padding: var(--space-page-v) var(--space-page-h);
-            padding-left: 80px;
-        }}
-        
-        .template-section-divider.align-center .content-overlay {{
-            align-items: center;
-            text-align: center;
-            padding-left: var(--space-page-h);
-            padding-right: var(--space-page-h);
-        }}
-        
-        .template-section-divider.align-right .content-overlay {{
-            align-items: flex-end;
-            text-align: right;
-            padding-left: var(--space-page-h);
-            padding-right: 80px;
-        }}
-        
-        .template-section-divider .element-heading {{
-            font-size: 96px;
-            opacity: 0.3;
-            margin-bottom: -16px;
-            letter-spacing: -0.03em;
-            white-space: nowrap;
-        }}
-        
-        .template-section-divider .element-subheading {{
-            font-size: 72px;
-            font-weight: var(--weight-extra-bold);
-            margin: 0;
-            color: var(--primary);
-            letter-spacing: -0.02em;
-            white-space: nowrap;
-        }}
-        
-        .section-divider-text {{
-            display: flex;
-            flex-direction: column;
-            gap: 0;
-        }}
-        
-        .section-divider-text .element-heading {{
-            font-size: 96px;
-            opacity: 0.3;
-            margin-bottom: -16px;
-            letter-spacing: -0.03em;
-        }}
-        
-        .section-divider-text .element-subheading {{
-            font-size: 72px;
-            font-weight: var(--weight-extra-bold);
-            margin: 0;
-            color: var(--primary);
-            letter-spacing: -0.02em;
-        }}
-        
-        /* Timeline Styles - Greyco Roadmap Style */
-        .timeline-container {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(100px, 1fr));
-            gap: 0;
-            margin-top: var(--space-section);
-            width: 100%;
-        }}
-        
-        .timeline-item {{
-            padding: var(--space-tight) var(--space-tight) 0 0;
-            position: relative;
-            border-top: 4px solid var(--primary);
-        }}
-        
-        .timeline-year {{
-            font-size: 18px;
-            font-weight: var(--weight-extra-bold);
-            margin-bottom: var(--space-xs);
-            letter-spacing: -0.01em;
-        }}
-        
-        .timeline-milestone {{
-            font-size: 12px;
-            color: var(--text-secondary);
-            line-height: 1.4;
-        }}
-        
-        /* TOC - Table of Contents (Greyco Style) */
-        .toc-container {{
-            display: flex;
-            flex-direction: column;
-            gap: var(--space-element);
-            margin-top: var(--space-section);
-        }}
-        
-        .toc-item {{
-            display: flex;
-            align-items: baseline;
-            gap: var(--space-tight);
-        }}
-        
-        .toc-number {{
-            font-size: var(--size-h3);
-            font-weight: var(--weight-bold);
-            min-width: 50px;
-            letter-spacing: -0.01em;
-        }}
-        
-        .toc-title {{
-            font-size: 20px;
-            font-weight: var(--weight-semi-bold);
-        }}
-        
-        /* Stats Block - Greyco Style */
-        .stats-container {{
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: var(--space-section);
-            margin-top: var(--space-section);
-        }}
-        
-        .stat-item {{
-            display: flex;
-            flex-direction: column;
-        }}
-        
-        .stat-value {{
-            font-size: var(--size-stat);
-            font-weight: var(--weight-bold);
-            line-height: 1;
-            margin-bottom: var(--space-xs);
-            letter-spacing: -0.02em;
-        }}
-        
-        .stat-unit {{
-            font-size: var(--size-h3);
-            font-weight: var(--weight-regular);
-            margin-left: 4px;
-        }}
-        
-        .stat-label {{
-            font-size: 14px;
-            color: var(--text-secondary);
-            line-height: 1.5;
-        }}
-        
-        /* Chart - Horizontal Bar */
-        .chart-container {{
-            margin-top: var(--space-section);
-            width: 100%;
-        }}
-        
-        .chart-title {{
-            font-size: var(--size-body);
-            font-weight: var(--weight-semi-bold);
-            margin-bottom: var(--space-tight);
-            color: var(--text-primary);
-        }}
-        
-        .chart-bar-item {{
-            margin-bottom: var(--space-tight);
-        }}
-        
-        .chart-bar-label {{
-            font-size: 13px;
-            color: var(--text-secondary);
-            margin-bottom: 4px;
-        }}
-        
-        .chart-bar-wrapper {{
-            background: rgba(255, 255, 255, 0.1);
-            border-radius: 4px;
-            height: 8px;
-            overflow: hidden;
-        }}
-        
-        .chart-bar {{
-            height: 100%;
-            border-radius: 4px;
-        }}
-        
-        /* Business Model Cards - Greyco Style */
-        .model-cards-container {{
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: var(--space-element);
-            margin-top: var(--space-section);
-        }}
-        
-        .model-card {{
-            background: var(--bg-card);
-            border-radius: var(--radius-card);
-            padding: var(--space-section) var(--space-element);
-            text-align: center;
-        }}
-        
-        .model-card-icon {{
-            font-size: 48px;
-            margin-bottom: 20px;
-        }}
-        
-        .model-card-title {{
-            font-size: 20px;
-            font-weight: var(--weight-bold);
-            color: var(--text-primary);
-            margin-bottom: var(--space-tight);
-        }}
-        
-        .model-card-desc {{
-            font-size: 14px;
-            color: var(--text-secondary);
-            line-height: 1.5;
-        }}
-        
-        /* Comparison Table - Greyco Style */
-        .comparison-table {{
-            width: 100%;
-            margin-top: var(--space-section);
-            border-collapse: collapse;
-        }}
-        
-        .comparison-table th,
-        .comparison-table td {{
-            padding: var(--space-tight);
-            text-align: center;
-            border-bottom: 1px solid rgba(255, 255, 255, 0.1);
-        }}
-        
-        .comparison-table th {{
-            font-size: 14px;
-            font-weight: var(--weight-semi-bold);
-            color: var(--text-muted);
-            background: rgba(255, 255, 255, 0.05);
-        }}
-        
-        .comparison-table td:first-child {{
-            text-align: left;
-            font-weight: var(--weight-semi-bold);
-        }}
-        
-        .comparison-table tr.highlight {{
-            background: rgba(255, 107, 53, 0.1);
-        }}
-        
-        .comparison-table tr.highlight td {{
-            color: var(--primary);
-            font-weight: var(--weight-bold);
-        }}
-        
-        .comparison-table .check {{
-            color: var(--text-muted);
-            font-size: 18px;
-        }}
-        
-        .comparison-table .highlight-check {{
-            color: var(--primary);
-            font-weight: var(--weight-bold);
-            font-size: 18px;
-        }}
-        
-        /* Icon Grid (6 out of 10 style) - Greyco Style */
-        .icon-grid-container {{
-            display: flex;
-            gap: var(--space-tight);
-            margin: var(--space-section) 0;
-            justify-content: center;
-        }}
-        
-        .icon-grid-item {{
-            width: 40px;
-            height: 40px;
-            border-radius: var(--radius-card);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            font-size: 20px;
-        }}
-        
-        /* Client Logos - Greyco Style */
-        .client-logos-container {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: var(--space-tight);
-            margin-top: var(--space-element);
-            justify-content: center;
-        }}
-        
-        .client-logo-item {{
-            background: rgba(255, 255, 255, 0.1);
-            padding: var(--space-tight) var(--space-element);
-            border-radius: var(--radius-card);
-            font-size: 14px;
-            font-weight: var(--weight-semi-bold);
-            color: var(--text-secondary);
-        }}
-        
-        .client-logo-item.highlighted {{
-            background: var(--primary);
-            color: #FFFFFF;
-        }}
-        
-        /* Center Statement - Greyco Style */
-        .template-content-statement .content-overlay {{
-            justify-content: center;
-            align-items: center;
-            text-align: center;
-        }}
-        
-        .center-statement-text {{
-            max-width: 900px;
-            text-align: center;
-        }}
-        
-        .center-statement-text .element-heading {{
-            font-size: var(--size-h1);
-            font-weight: var(--weight-bold);
-            line-height: 1.2;
-            text-transform: none;
-            letter-spacing: -0.01em;
-        }}
-        
-        /* Contact Info - Greyco Style */
-        .template-contact .content-overlay,
-        .template-contact-info .content-overlay {{
-            justify-content: center;
-            align-items: center;
-            text-align: center;
-            padding: var(--space-element) var(--space-page-h);
-            gap: 4px;
-        }}
-        
-        .template-contact .element-heading,
-        .template-contact-info .element-heading {{
-            margin-bottom: 0;
-            font-size: 36px !important;
-            line-height: 1.1;
-        }}
-        
-        .template-contact .element-badge,
-        .template-contact-info .element-badge {{
-            margin-bottom: 0;
-            font-size: 11px !important;
-        }}
-        
-        .template-contact .element-logo,
-        .template-contact-info .element-logo {{
-            margin: 8px 0;
-            font-size: 16px !important;
-        }}
-        
-        .contact-info-list {{
-            display: flex;
-            flex-direction: column;
-            gap: 4px;
-            margin: 8px 0;
-            align-items: center;
-        }}
-        
-        .contact-info-item {{
-            display: flex;
-            align-items: center;
-            gap: 6px;
-            font-size: 13px;
-            color: var(--text-secondary);
-        }}
-        
-        .contact-info-icon {{
-            font-size: 14px;
-            width: 20px;
-            text-align: center;
-        }}
-        
-        .template-contact .element-body,
-        .template-contact-info .element-body {{
-            font-size: 12px !important;
-            margin-top: 8px;
-        }}
-        
-        /* Value Cards (Why E-UM) - Greyco Style */
-        .value-cards-container {{
-            display: grid;
-            grid-template-columns: repeat(3, 1fr);
-            gap: 16px;
-            margin-top: var(--space-element);
-            width: 100%;
-        }}
-        
-        .value-card {{
-            background: var(--bg-card);
-            border-radius: var(--radius-card);
-            padding: 16px;
-            text-align: center;
-            display: flex;
-            flex-direction: column;
-            align-items: center;
-            min-height: 0;
-        }}
-        
-        .value-card-icon {{
-            font-size: 28px;
-            margin-bottom: 8px;
-        }}
-        
-        .value-card-title {{
-            font-size: 14px;
-            font-weight: var(--weight-bold);
-            margin-bottom: 4px;
-            color: var(--text-primary);
-        }}
-        
-        .value-card-desc {{
-            font-size: 11px;
-            color: var(--text-secondary);
-            line-height: 1.4;
-        }}
-        
-        /* Image Overlay Layout - Greyco Style */
-        .template-content-image .content-overlay {{
-            justify-content: center;
-            padding-left: 80px;
-        }}
-
-        /* Feature List - Greyco Style */
-        .list-container {{
-            margin-top: var(--space-element);
-            display: flex;
-            flex-direction: column;
-            gap: var(--space-tight);
-        }}
-        
-        .list-item {{
-            display: flex;
-            align-items: flex-start;
-            background: rgba(255,255,255,0.05);
-            padding: var(--space-tight) 20px;
-            border-radius: 10px;
-        }}
-        
-        .list-icon {{
-            font-size: 20px;
-            margin-right: var(--space-tight);
-            flex-shrink: 0;
-        }}
-        
-        .list-content {{
-            flex: 1;
-        }}
-        
-        .list-title {{
-            font-weight: var(--weight-bold);
-            font-size: 17px;
-            margin-bottom: 4px;
-            color: var(--text-primary);
-        }}
-        
-        .list-desc {{
-            font-size: 14px;
-            color: var(--text-secondary);
-            line-height: 1.4;
-        }}
-        
-        /* Content Features Template - Split Layout with Image */
-        .template-content-features .content-overlay,
-        .template-image-features .content-overlay {{
-            display: grid;
-            grid-template-columns: 2fr 3fr;
-            gap: var(--space-section);
-            align-items: center;
-            padding: var(--space-page-v) var(--space-page-h);
-            height: 100%;
-        }}
-        
-        .template-content-features.image-right .content-overlay,
-        .template-image-features.image-right .content-overlay {{
-            grid-template-columns: 3fr 2fr;
-        }}
-        
-        .template-content-features .content-left,
-        .template-image-features .content-left {{
-            display: flex;
-            flex-direction: column;
-            gap: var(--space-element);
-            height: 100%;
-            justify-content: center;
-        }}
-        
-        .template-content-features .content-right,
-        .template-image-features .content-right {{
-            display: flex;
-            flex-direction: column;
-            gap: var(--space-element);
-            height: 100%;
-            justify-content: center;
-        }}
-        
-        .template-content-features .element-image,
-        .template-image-features .element-image {{
-            width: 100%;
-            height: auto;
-            max-height: 400px;
-            object-fit: cover;
-            border-radius: var(--radius-card);
-        }}
-
-        /* Cards Container */
-        .cards-container {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            width: 100%;
-            margin-top: var(--space-section);
-        }}
-        
-        .cards-container.service-cards {{
-            grid-template-columns: repeat(5, 1fr);
-        }}
-        
-        .cards-container.value-cards {{
-            grid-template-columns: repeat(3, 1fr);
-        }}
-
-        /* Card Styles */
-        .card {{
-            background: var(--bg-card);
-            border: 1px solid rgba(255, 255, 255, 0.1);
-            border-radius: var(--radius-card);
-            padding: var(--space-element);
-            display: flex;
-            flex-direction: column;
-        }}
-        
-        .card-icon {{
-            font-size: 32px;
-            margin-bottom: var(--space-tight);
-        }}
-        
-        .card-title {{
-            font-size: 18px;
-            font-weight: var(--weight-bold);
-            margin-bottom: var(--space-xs);
-            color: var(--primary);
-        }}
-        
-        .card-subtitle {{
-            font-size: 14px;
-            color: var(--text-muted);
-            margin-bottom: var(--space-xs);
-        }}
-        
-        .card-value {{
-            font-size: 15px;
-            color: var(--text-secondary);
-            line-height: 1.5;
-        }}
-        
-        /* Client Grid */
-        .clients-grid {{
-            display: flex;
-            flex-wrap: wrap;
-            gap: 10px;
-            margin-top: var(--space-tight);
-        }}
-        
-        .client-item {{
-            background: white;
-            color: #333;
-            padding: 10px 20px;
-            border-radius: 6px;
-            font-weight: var(--weight-bold);
-            font-size: 14px;
-        }}
-        
-        .client-item.highlight {{
-            background: var(--primary);
-            color: white;
-        }}
-
-        /* Print Optimization */
-        @media print {{
-            @page {{
-                size: 297mm 167mm;
-                margin: 0;
-            }}
-            html, body {{
-                margin: 0 !important;
-                padding: 0 !important;
-                background: white !important;
-            }}
-            .slide {{
-                margin: 0 !important;
-                box-shadow: none !important;
-                page-break-inside: avoid !important;
-            }}
-        }}
-    </style>
-</head>
-<body>
-"""
-
-    for i, slide in enumerate(slides):
-        is_last = (i == len(slides) - 1)
-        slide_class = "slide last-slide" if is_last else "slide"
-        
-        # Determine Layout Type
-        layout_config = slide.get('layout', {})
-        template = slide.get('type', 'content-text')
-        if isinstance(layout_config, dict):
-            template = layout_config.get('template', template)
-        
-        # Check imagePosition for split layouts
-        image_position = ""
-        if isinstance(layout_config, dict):
-            image_position = layout_config.get('imagePosition', 'right')
-        
-        # Map templates to layout classes
-        layout_class = ""
-        split_templates = ['hero-cover', 'content-split', 'service-detail', 'content-profile']
-        center_templates = ['center-statement', 'contact-info', 'vision-mission', 'content-statement', 'contact']
-        features_templates = ['content-features', 'image-features']
-        
-        if template in split_templates:
-            layout_class = "layout-split"
-            if image_position == 'left':
-                layout_class += " image-left"
-        elif template in center_templates:
-            layout_class = "layout-center"
-        elif template in features_templates:
-            if image_position == 'right':
-                layout_class = "image-right"
-        
-        # Add alignment class for section-divider
-        alignment = ""
-        if template == 'section-divider':
-            alignment_config = layout_config.get('alignment', 'center-left') if isinstance(layout_config, dict) else 'center-left'
-            if 'right' in alignment_config:
-                alignment = "align-right"
-            elif 'center' in alignment_config and 'left' not in alignment_config:
-                alignment = "align-center"
-            else:
-                alignment = "align-left"
-        
-        # Handle slide background
-        bg_style = ""
-        bg_html = ""
-        background = slide.get('background', {})
-        if background.get('type') == 'solid':
-            bg_style = f"background-color: {background.get('color', bg_dark)};"
-        elif background.get('type') == 'gradient':
-            grad_colors = background.get('colors', [bg_dark, bg_card])
-            if grad_colors:
-                bg_style = f"background: linear-gradient(135deg, {', '.join(grad_colors)});"
-        elif background.get('type') == 'image-overlay':
-            bg_image = background.get('image', '')
-            bg_opacity = background.get('imageOpacity', 0.4)
-            overlay_color = background.get('overlayColor', 'rgba(0, 0, 0, 0.7)')
-            bg_html = f'<img src="{bg_image}" class="bg-image" style="opacity: {bg_opacity};" alt="">'
-            bg_html += f'<div class="bg-overlay" style="background: {overlay_color};"></div>'
-            bg_style = f"background-color: {bg_dark};"
+    # CSS Variables - 디자인 토큰(:root)만 빌드마다 채우고, 정적 CSS는 templates/slides.css 그대로 사용
+    primary_tokens = colors.get('primary') if isinstance(colors.get('primary'), dict) else {}
+    background_tokens = colors.get('background') if isinstance(colors.get('background'), dict) else {}
+    css_vars = DOCUMENT_TEMPLATES.root_tokens(
+        primary_color,
+        primary_tokens.get('light', '#FF8A5B'),
+        primary_tokens.get('dark', '#E55A25'),
+        secondary_color,
+        bg_dark,
+        background_tokens.get('darker', '#0D0D0D'),
+        bg_card,
+        text_primary,
+        text_secondary,
+        text_muted,
+    )
+    theme = {
+        'primary': primary_color,
+        'secondary': secondary_color,
+        'bg_dark': bg_dark,
+        'bg_card': bg_card,
+        'renderers': renderers,
+    }
+
+    # 오프라인 HTML: 원격 폰트 @import 대신 subset 폰트, 이미지는 렌더링 전에 로컬 src로 교체
+    static_css = read_static('slides.css')
+    font_css = ''
+    if self_contained:
+        # Pillow/fontTools 필요 - --self-contained 빌드에서만 로드
+        from self_contained import ImageLocalizer, font_face_css, localize_slides, offline_css
+        static_css = offline_css(static_css)
+        font_css = font_face_css([slide for _, slide in selected], project_dir)
+        localizer = ImageLocalizer(project_dir, inline=(self_contained != 'assets'))
+        selected = localize_slides(selected, localizer, SLIDE_SIZE_PX, slide_template_name,
+                                   skip_backgrounds=composite)
+        theme['localizer'] = localizer
+        print(f"Self-contained: {len(localizer.sources)} images ({localizer.bytes_out / 1024:.0f}KB)")
+        if localizer.failed:
+            print(f"  [WARN] 로컬화하지 못한 이미지 {len(localizer.failed)}개는 원격 URL로 남습니다")
+
+    # 스타일 인터닝: 슬라이드를 렌더링하기 전에 스타일을 모아 <style>에 클래스로 출력
+    interned_css = ''
+    if intern_styles:
+        styles = StyleInterner()
+        collect_styles(selected, styles, renderers)
+        theme['styles'] = styles
+        interned_css = styles.css()
+        print(f"Interned styles: {styles.uses} elements → {len(styles)} classes")
+
+    title = data.get('metadata', {}).get('companyName', data.get('projectName', 'Presentation'))
+    if shared_css:
+        css_dir = os.path.join(project_dir, SHARED_CSS_DIR) if shared_css is True else shared_css
+        css_path = write_shared_css(css_dir, minify_css(static_css) if minify else static_css)
+        href = os.path.relpath(css_path, os.path.dirname(html_path)).replace(os.sep, '/')
+        html_head = DOCUMENT_TEMPLATES.document_head(title, css_vars, '', font_css + interned_css,
+                                                     DOCUMENT_TEMPLATES.stylesheet_link(href))
+        print(f"Shared CSS: {css_path}")
+    else:
+        html_head = DOCUMENT_TEMPLATES.document_head(title, css_vars, static_css, font_css + interned_css)
+
+    cache = None
+    if use_cache:
+        styles = theme.get('styles')
+        cache = FragmentCache(project_dir, (
+            renderer_fingerprint(project_dir),
+            primary_color, secondary_color, bg_dark, bg_card,
+            composite, self_contained,
+            sorted(styles.classes.items()) if styles else None,
+        ))
+
+    # 슬라이드 조각을 임시 파일에 순차 기록한 뒤 교체 (빌드 중/실패 시에도 기존 HTML이 깨지지 않음)
+    chunks = chain([html_head], iter_slide_fragments(selected, theme, composite, project_dir, cache, workers),
+                   [DOCUMENT_TEMPLATES.document_end()])
+    size_before = dict.fromkeys(('css', 'markup', 'inline_style', 'data_uri', 'total'), 0)
+    size_after = dict(size_before)
+    fd, tmp_path = tempfile.mkstemp(dir=project_dir, prefix='.tmp-', suffix='.html')
+    try:
+        with open(fd, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            for chunk in chunks:
+                if minify:
+                    # 조각 단위로 최소화 (head 조각에 <style> 전체가 들어 있어 분류별 크기를 더해도 됨)
+                    for category, size in size_report(chunk).items():
+                        size_before[category] += size
+                    chunk = minify_html(chunk)
+                    for category, size in size_report(chunk).items():
+                        size_after[category] += size
+                f.write(chunk)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, html_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    if cache is not None:
+        removed = cache.prune() if not partial else 0
+        print(f"Fragment cache: {cache.hits} reused, {cache.misses} rendered"
+              + (f", {removed} stale removed" if removed else ""))
+    if minify:
+        print("Minified output size:")
+        print(format_report(size_after, size_before))
+    print(f"Generated {html_path}")
+
+    if reproducible:
+        digest, changed = record_artifact(html_path)
+        print(f"Reproducible: sha256={digest[:16]}… ({'changed' if changed else 'unchanged'})")
+    return True
+
+
+# 이미 확인한 공유 CSS 파일 (상주 프로세스에서 반복 빌드 시 파일 검사 생략)
+_shared_css_files = {}
+
+
+def write_shared_css(css_dir, static_css=None):
+    """정적 CSS(templates/slides.css)를 css_dir/slides.<해시>.css 로 저장하고 경로 반환
+
+    파일 이름이 내용 해시이므로 같은 CSS는 여러 덱이 한 파일을 공유하며 (이미 있으면 다시 쓰지 않음),
+    CSS가 바뀌면 새 이름이 되어 CDN/브라우저 캐시를 무효화할 필요가 없습니다.
+    """
+    if static_css is None:
+        static_css = read_static('slides.css')
+    css_dir = os.path.abspath(css_dir)
+    cached = _shared_css_files.get(css_dir)
+    if cached and cached[0] is static_css and os.path.exists(cached[1]):
+        return cached[1]
+    # 외부 파일에서는 인라인 <style>의 들여쓰기가 필요 없음
+    css_text = '\n'.join(line[8:] if line.startswith('        ') else line
+                         for line in static_css.split('\n'))
+    data = css_text.encode('utf-8')
+    css_path = os.path.join(css_dir, f"slides.{hashlib.sha256(data).hexdigest()[:12]}.css")
+    if not os.path.exists(css_path):
+        write_atomic(css_path, data)
+    _shared_css_files[css_dir] = (static_css, css_path)
+    return css_path
+
+
+def render_slide(slide_number, slide, is_last, theme, composite=False, project_dir=None):
+    """슬라이드 하나의 HTML 조각 (슬라이드 구분 주석 포함) - templates/slide.html"""
+    primary_color = theme['primary']
+    secondary_color = theme['secondary']
+    bg_dark = theme['bg_dark']
+    bg_card = theme['bg_card']
+    styles = theme.get('styles')
+    renderers = theme.get('renderers')
+    slide_class = "slide last-slide" if is_last else "slide"
+    
+    # Determine Layout Type
+    layout_config = slide.get('layout', {})
+    template = slide_template_name(slide)
+    
+    # Check imagePosition for split layouts
+    image_position = ""
+    if isinstance(layout_config, dict):
+        image_position = layout_config.get('imagePosition', 'right')
+    
+    # Map templates to layout classes
+    layout_class = ""
+    split_templates = ['hero-cover', 'content-split', 'service-detail', 'content-profile']
+    center_templates = ['center-statement', 'contact-info', 'vision-mission', 'content-statement', 'contact']
+    features_templates = ['content-features', 'image-features']
+    
+    if template in split_templates:
+        layout_class = "layout-split"
+        if image_position == 'left':
+            layout_class += " image-left"
+    elif template in center_templates:
+        layout_class = "layout-center"
+    elif template in features_templates:
+        if image_position == 'right':
+            layout_class = "image-right"
+    
+    # Add alignment class for section-divider
+    alignment = ""
+    if template == 'section-divider':
+        alignment_config = layout_config.get('alignment', 'center-left') if isinstance(layout_config, dict) else 'center-left'
+        if 'right' in alignment_config:
+            alignment = "align-right"
+        elif 'center' in alignment_config and 'left' not in alignment_config:
+            alignment = "align-center"
         else:
-            bg_style = f"background-color: {bg_dark};"
-        
-        html_content += f'<div class="{slide_class} {layout_class} {alignment} template-{template}" id="slide-{slide.get("slideNumber", i+1)}" style="{bg_style}">'
-        
-        # Add background image overlay if present
-        if bg_html:
-            html_content += bg_html
-        
-        elements = slide.get('elements', [])
-        
-        # Handle content-features template specially
-        if template in features_templates:
-            html_content += '<div class="content-overlay">'
-            
-            # Separate image elements from text elements
-            image_elements = [el for el in elements if el.get('type') == 'image']
-            text_elements = [el for el in elements if el.get('type') != 'image']
-            
-            if image_position == 'left':
-                # Image on left, text on right
-                html_content += '<div class="content-left">'
-                for el in image_elements:
-                    html_content += render_element(el, primary_color, secondary_color)
-                html_content += '</div>'
-                html_content += '<div class="content-right">'
-                for el in text_elements:
-                    html_content += render_element(el, primary_color, secondary_color)
-                html_content += '</div>'
-            else:
-                # Text on left, image on right
-                html_content += '<div class="content-left">'
-                for el in text_elements:
-                    html_content += render_element(el, primary_color, secondary_color)
-                html_content += '</div>'
-                html_content += '<div class="content-right">'
-                for el in image_elements:
-                    html_content += render_element(el, primary_color, secondary_color)
-                html_content += '</div>'
-            
-            html_content += '</div>'
+            alignment = "align-left"
+    
+    # Handle slide background
+    bg_style = ""
+    bg_html = ""
+    background = slide.get('background', {})
+    if background.get('type') == 'solid':
+        bg_style = f"background-color: {background.get('color', bg_dark)};"
+    elif background.get('type') == 'gradient':
+        grad_colors = background.get('colors', [bg_dark, bg_card])
+        if grad_colors:
+            bg_style = f"background: linear-gradient(135deg, {', '.join(grad_colors)});"
+    elif background.get('type') == 'image-overlay':
+        composited_src = composite_background(background, bg_dark, project_dir) if composite else None
+        if composited_src and 'localizer' in theme:
+            composited_src = theme['localizer'].file_src(composited_src)
+        if composited_src:
+            bg_html = SLIDE_TEMPLATES.bg_composited(composited_src)
+        else:
+            bg_html = SLIDE_TEMPLATES.bg_image_overlay(
+                background.get('image', ''),
+                background.get('imageOpacity', 0.4),
+                background.get('overlayColor', 'rgba(0, 0, 0, 0.7)'),
+            )
+        bg_style = f"background-color: {bg_dark};"
+    else:
+        bg_style = f"background-color: {bg_dark};"
+    
+    elements = slide.get('elements', [])
+    
+    # Handle content-features template specially
+    if template in features_templates:
+        # Separate image elements from text elements
+        image_elements = [(i, el) for i, el in enumerate(elements) if el.get('type') == 'image']
+        text_elements = [(i, el) for i, el in enumerate(elements) if el.get('type') != 'image']
         
-        # Handle split layouts
-        elif "layout-split" in layout_class:
-            # Separate elements for split layout
-            left_elements = []
-            right_elements = []
-            
-            if "image-left" in layout_class:
-                # Image goes to left, everything else to right
-                for el in elements:
-                    if el.get('type') == 'image' and el.get('position') != 'right':
-                        left_elements.append(el)
-                    else:
-                        right_elements.append(el)
-            else:
-                # Text goes to left, image to right
-                for el in elements:
-                    if el.get('position') == 'right' or (el.get('type') == 'image' and el.get('position') != 'left'):
-                        right_elements.append(el)
-                    else:
-                        left_elements.append(el)
-            
-            html_content += '<div class="content-overlay">'
-            
-            # Left Column
-            html_content += '<div class="col-left">'
-            for el in left_elements:
-                html_content += render_element(el, primary_color, secondary_color)
-            html_content += '</div>'
-            
-            # Right Column
-            html_content += '<div class="col-right">'
-            for el in right_elements:
-                html_content += render_element(el, primary_color, secondary_color)
-            html_content += '</div>'
-            
-            html_content += '</div>'
-            
+        if image_position == 'left':
+            # Image on left, text on right
+            left_elements, right_elements = image_elements, text_elements
         else:
-            # Standard Layout
-            html_content += '<div class="content-overlay">'
-            for el in elements:
-                # For contact-info template, limit font sizes to avoid overflow
-                if template == 'contact-info':
-                    el_copy = el.copy()
-                    if 'style' in el_copy:
-                        style_copy = el_copy['style'].copy()
-                        el_type = el_copy.get('type', '')
-                        if el_type == 'heading':
-                            style_copy['fontSize'] = '36px'
-                        elif el_type == 'badge':
-                            style_copy['fontSize'] = '12px'
-                        elif el_type in ['company-name', 'logo']:
-                            style_copy['fontSize'] = '16px'
-                        elif el_type in ['body', 'tagline']:
-                            style_copy['fontSize'] = '12px'
-                        el_copy['style'] = style_copy
-                    html_content += render_element(el_copy, primary_color, secondary_color)
+            # Text on left, image on right
+            left_elements, right_elements = text_elements, image_elements
+        content = SLIDE_TEMPLATES.columns(
+            'content-left', render_elements(left_elements, primary_color, secondary_color, styles, slide_number,
+                                       renderers),
+            'content-right', render_elements(right_elements, primary_color, secondary_color, styles, slide_number,
+                                       renderers),
+        )
+    
+    # Handle split layouts
+    elif "layout-split" in layout_class:
+        # Separate elements for split layout
+        left_elements = []
+        right_elements = []
+        
+        if "image-left" in layout_class:
+            # Image goes to left, everything else to right
+            for i, el in enumerate(elements):
+                if el.get('type') == 'image' and el.get('position') != 'right':
+                    left_elements.append((i, el))
                 else:
-                    html_content += render_element(el, primary_color, secondary_color)
-            html_content += '</div>'
-
-        html_content += '</div>'
+                    right_elements.append((i, el))
+        else:
+            # Text goes to left, image to right
+            for i, el in enumerate(elements):
+                if el.get('position') == 'right' or (el.get('type') == 'image' and el.get('position') != 'left'):
+                    right_elements.append((i, el))
+                else:
+                    left_elements.append((i, el))
         
-        if not is_last:
-            html_content += '<!-- Slide -->'
+        content = SLIDE_TEMPLATES.columns(
+            'col-left', render_elements(left_elements, primary_color, secondary_color, styles, slide_number,
+                                       renderers),
+            'col-right', render_elements(right_elements, primary_color, secondary_color, styles, slide_number,
+                                       renderers),
+        )
+        
+    else:
+        # Standard Layout
+        content = ''.join([render_element(prepare_element(el, template), primary_color, secondary_color, styles,
+                                          element_id(slide_number, i), renderers)
+                           for i, el in enumerate(elements)])
+
+    return SLIDE_TEMPLATES.slide(slide_number, slide_class, layout_class, alignment, template,
+                                 bg_style, bg_html, content, is_last)
+
+
+def slide_template_name(slide):
+    """레이아웃 판단에 쓰는 템플릿 이름 (layout.template → type)"""
+    template = slide.get('type', 'content-text')
+    layout_config = slide.get('layout', {})
+    if isinstance(layout_config, dict):
+        template = layout_config.get('template', template)
+    return template
+
+
+# contact-info 템플릿에서 넘치지 않도록 제한하는 element type별 글자 크기
+CONTACT_INFO_FONT_SIZES = {
+    'heading': '36px',
+    'badge': '12px',
+    'company-name': '16px',
+    'logo': '16px',
+    'body': '12px',
+    'tagline': '12px',
+}
 
-    html_content += """</body></html>"""
 
-    with open(html_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
-    
-    print(f"Generated {html_path}")
+def prepare_element(el, template):
+    """템플릿에 따른 element 보정 - contact-info는 글자 크기 제한 (원본 dict는 수정하지 않음)"""
+    if template != 'contact-info':
+        return el
+    el_copy = el.copy()
+    if 'style' in el_copy:
+        style_copy = el_copy['style'].copy()
+        font_size = CONTACT_INFO_FONT_SIZES.get(el_copy.get('type', ''))
+        if font_size:
+            style_copy['fontSize'] = font_size
+        el_copy['style'] = style_copy
+    return el_copy
+
+
+def renderer_fingerprint(project_dir=None):
+    """슬라이드 조각 캐시 키에 들어가는 렌더러 버전 (코드/템플릿/프로젝트 플러그인)"""
+    parts = [RENDERER_VERSION, ENGINE_VERSION, read_static('slide.html'), read_static('elements.html')]
+    plugin_path = os.path.join(project_dir, 'renderers.py') if project_dir else None
+    if plugin_path and os.path.exists(plugin_path):
+        with open(plugin_path, 'rb') as f:
+            parts.append(hashlib.sha256(f.read()).hexdigest())
+    return tuple(parts)
+
+
+def iter_slide_fragments(selected, theme, composite=False, project_dir=None, cache=None, workers=1):
+    """선택된 슬라이드의 HTML 조각을 순서대로 생성 (문서 전체를 메모리에 두지 않음)
+
+    cache(FragmentCache)가 있으면 바뀌지 않은 슬라이드는 캐시된 조각을 그대로 사용합니다.
+    --composite 합성 배경 슬라이드는 assets/ 파일을 다시 확인하도록 항상 렌더링합니다.
+    workers > 1 이면 iter_slide_fragments_parallel 로 렌더링합니다.
+    """
+    if workers > 1:
+        yield from iter_slide_fragments_parallel(selected, theme, composite, project_dir, cache, workers)
+        return
+    for i, (slide_number, slide) in enumerate(selected):
+        is_last = (i == len(selected) - 1)
+        if cache is None or (composite and slide.get('background', {}).get('type') == 'image-overlay'):
+            yield render_slide(slide_number, slide, is_last, theme, composite, project_dir)
+            continue
+        key = cache.key(slide_number, slide, is_last)
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = render_slide(slide_number, slide, is_last, theme, composite, project_dir)
+            cache.put(key, fragment)
+        yield fragment
+
+
+# 렌더 워커 프로세스 상태 (_init_render_worker 에서 설정)
+_worker_state = {}
+
+
+def _init_render_worker(theme, composite, project_dir):
+    """워커 프로세스 초기화 - 프로젝트 렌더러 플러그인을 불러오고 빌드 공통 값을 보관"""
+    theme = dict(theme, renderers=load_project_renderers(project_dir) if project_dir else None)
+    _worker_state.update(theme=theme, composite=composite, project_dir=project_dir)
+
+
+def _render_chunk(items):
+    """워커에서 슬라이드 묶음 렌더링 - items: [(slide_number, slide, is_last)]"""
+    state = _worker_state
+    return [render_slide(slide_number, slide, is_last, state['theme'], state['composite'], state['project_dir'])
+            for slide_number, slide, is_last in items]
+
+
+def iter_slide_fragments_parallel(selected, theme, composite, project_dir, cache, workers):
+    """프로세스 풀에서 슬라이드 묶음을 렌더링하고 원래 순서대로 생성
+
+    캐시에 있는 슬라이드는 메인 프로세스에서 바로 사용하고, 나머지만 묶음(chunk)으로 나누어 제출합니다.
+    제출해 두는 묶음 수를 제한하여 앞쪽 슬라이드부터 순서대로 파일에 쓰는 동안 메모리가 늘지 않게 합니다.
+    """
+    last = len(selected) - 1
+    entries = []   # 슬라이드 순서대로 (캐시된 조각 또는 None, 캐시 키)
+    todo = []      # 렌더링할 슬라이드 인덱스
+    for i, (slide_number, slide) in enumerate(selected):
+        key = fragment = None
+        if cache is not None and not (composite and slide.get('background', {}).get('type') == 'image-overlay'):
+            key = cache.key(slide_number, slide, i == last)
+            fragment = cache.get(key)
+        entries.append((fragment, key))
+        if fragment is None:
+            todo.append(i)
+
+    if not todo:
+        for fragment, _ in entries:
+            yield fragment
+        return
+
+    chunk_size = max(1, min(MAX_CHUNK_SLIDES, -(-len(todo) // (workers * 4))))
+    # 플러그인 렌더러는 pickle 할 수 없으므로 워커가 직접 불러옴 (_init_render_worker)
+    worker_theme = {name: value for name, value in theme.items() if name != 'renderers'}
+    chunks = iter([todo[j:j + chunk_size] for j in range(0, len(todo), chunk_size)])
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                             initargs=(worker_theme, composite, project_dir)) as pool:
+        in_flight = deque()
+
+        def submit_next():
+            chunk = next(chunks, None)
+            if chunk is not None:
+                items = [(selected[i][0], selected[i][1], i == last) for i in chunk]
+                in_flight.append((chunk, pool.submit(_render_chunk, items)))
+
+        for _ in range(workers * CHUNKS_IN_FLIGHT_PER_WORKER):
+            submit_next()
+
+        rendered = {}
+        for i, (fragment, key) in enumerate(entries):
+            if fragment is None:
+                while i not in rendered:
+                    chunk, future = in_flight.popleft()
+                    rendered.update(zip(chunk, future.result()))
+                    submit_next()
+                fragment = rendered.pop(i)
+                if key is not None:
+                    cache.put(key, fragment)
+            yield fragment
 
 
-def render_element(el, primary_color='#FF6B35', secondary_color='#FFB800'):
-    el_type = el.get('type', 'body')
-    style_obj = el.get('style', {})
-    
+# ========================================
+# Element renderers
+# ========================================
+# element type → renderer(el, style_str, primary_color, secondary_color) -> str
+ELEMENT_RENDERERS = {}
+# style_class 인자를 받는 렌더러 (스타일 인터닝 대상) - 그 외 렌더러는 항상 인라인 스타일
+STYLE_CLASS_RENDERERS = set()
+
+
+def register_element_renderer(el_type, renderer, style_class=False):
+    """element type에 대한 렌더러 등록 (기존 렌더러가 있으면 교체)
+
+    style_class=True 인 렌더러는 renderer(el, '', primary, secondary, ' s-xxxxxxxx') 형태로도
+    호출되며, 스타일 대신 클래스를 붙인 마크업을 반환해야 합니다.
+    """
+    ELEMENT_RENDERERS[el_type] = renderer
+    if style_class:
+        STYLE_CLASS_RENDERERS.add(renderer)
+    return renderer
+
+
+class RendererRegistry:
+    """빌드 하나에서 쓰는 element 렌더러 (내장 렌더러 + 프로젝트 플러그인)
+
+    프로젝트 플러그인은 빌드마다 만드는 복사본에 등록하므로, watch 등 상주 프로세스에서
+    한 프로젝트의 플러그인이 다른 프로젝트 빌드에 남거나 내장 렌더러를 덮어쓰지 않습니다.
+    """
+
+    def __init__(self, renderers=None, style_class_renderers=None):
+        """인자가 없으면 현재 내장 렌더러의 복사본으로 시작"""
+        if renderers is None:
+            renderers, style_class_renderers = dict(ELEMENT_RENDERERS), set(STYLE_CLASS_RENDERERS)
+        self.renderers = renderers
+        self.style_class_renderers = style_class_renderers
+
+    def register(self, el_type, renderer, style_class=False):
+        """register_element_renderer 와 같은 인자 - 이 등록표에만 등록"""
+        self.renderers[el_type] = renderer
+        if style_class:
+            self.style_class_renderers.add(renderer)
+        return renderer
+
+    def get(self, el_type):
+        return self.renderers.get(el_type)
+
+    def uses_style_class(self, renderer):
+        return renderer in self.style_class_renderers
+
+
+# 내장 렌더러만 쓰는 등록표 (전역 등록표를 그대로 참조 - renderers 인자가 없을 때)
+BUILTIN_RENDERERS = RendererRegistry(ELEMENT_RENDERERS, STYLE_CLASS_RENDERERS)
+
+
+def element_renderer(*el_types):
+    """렌더러 등록 데코레이터"""
+    def decorator(renderer):
+        for el_type in el_types:
+            register_element_renderer(el_type, renderer)
+        return renderer
+    return decorator
+
+
+def load_project_renderers(project_dir):
+    """빌드에 쓸 렌더러 등록표 - 내장 렌더러 + 프로젝트별 플러그인 (projects/<name>/renderers.py)
+
+    플러그인은 register(register_element_renderer) 함수를 정의하고,
+    전달받은 함수로 프로젝트 전용 element type을 등록합니다.
+    전달되는 함수는 이번 빌드의 RendererRegistry.register 이므로 전역 ELEMENT_RENDERERS 는 바뀌지 않습니다.
+
+        def register(register_element_renderer):
+            register_element_renderer('price-tag', lambda el, style, primary, secondary: ...)
+    """
+    registry = RendererRegistry()
+    plugin_path = os.path.join(project_dir, 'renderers.py')
+    if not os.path.exists(plugin_path):
+        return registry
+    spec = importlib.util.spec_from_file_location(f"haru_renderers_{os.path.basename(project_dir)}", plugin_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if hasattr(module, 'register'):
+        module.register(registry.register)
+    return registry
+
+
+def render_elements(indexed_elements, primary_color, secondary_color, styles=None, slide_number=None,
+                    renderers=None):
+    """(slide.elements 안의 순번, element) 목록의 HTML을 이어 붙인 문자열"""
+    return ''.join([render_element(el, primary_color, secondary_color, styles, element_id(slide_number, i),
+                                   renderers)
+                    for i, el in indexed_elements])
+
+
+def element_id(slide_number, index):
+    """element 루트 태그의 data-el-id ("<슬라이드 번호>.<elements 순번>", html_to_json --merge 에서 사용)"""
+    return None if slide_number is None else f"{slide_number}.{index}"
+
+
+_ROOT_TAG_RE = re.compile(r'<[a-zA-Z][\w-]*')
+
+
+def render_element(el, primary_color='#FF6B35', secondary_color='#FFB800', styles=None, el_id=None,
+                   renderers=None):
+    """element 하나의 HTML - renderers(RendererRegistry)가 없으면 내장 렌더러만 사용"""
+    registry = renderers or BUILTIN_RENDERERS
+    renderer = registry.get(el.get('type', 'body'))
+    if renderer is None:
+        return ''
+    declarations = style_declarations(el.get('style'))
+
+    # 인터닝된 스타일은 클래스로 출력 (빈 style 속성은 제거)
+    if styles is not None and declarations and registry.uses_style_class(renderer):
+        class_name = styles.class_for(declarations)
+        if class_name is not None:
+            html = renderer(el, '', primary_color, secondary_color, ' ' + class_name).replace(' style=""', '', 1)
+            return _with_element_id(html, el_id)
+
     # Convert style dict to string
-    style_str = ""
+    style_str = ''.join([f"{prop}: {value}; " for prop, value in declarations])
+    return _with_element_id(renderer(el, style_str, primary_color, secondary_color), el_id)
+
+
+def _with_element_id(html, el_id):
+    """첫 번째 태그(element 루트)에 data-el-id 추가 - 프로젝트 렌더러 출력에도 동일하게 적용"""
+    if el_id is None:
+        return html
+    m = _ROOT_TAG_RE.search(html)
+    if m is None:
+        return html
+    return f'{html[:m.end()]} data-el-id="{el_id}"{html[m.end():]}'
+
+
+# ========================================
+# Style interning
+# ========================================
+# Skip positioning styles that might conflict with grid
+SKIPPED_STYLE_PROPERTIES = frozenset(['position', 'top', 'left', 'right', 'bottom', 'transform'])
+
+
+@lru_cache(maxsize=None)
+def css_property_name(key):
+    """camelCase 스타일 키 → CSS 속성 이름 (fontSize → font-size)"""
+    return ''.join(['-' + c.lower() if c.isupper() else c for c in key]).lstrip('-')
+
+
+def style_declarations(style_obj):
+    """element style dict → 정규화된 (속성, 값) 튜플 (출력하지 않는 위치 속성 제외)"""
+    if not style_obj:
+        return ()
+    declarations = []
     for k, v in style_obj.items():
-        kebab = ''.join(['-' + c.lower() if c.isupper() else c for c in k]).lstrip('-')
-        # Skip positioning styles that might conflict with grid
-        if kebab in ['position', 'top', 'left', 'right', 'bottom', 'transform']:
+        prop = css_property_name(k)
+        if prop in SKIPPED_STYLE_PROPERTIES:
             continue
-        style_str += f"{kebab}: {v}; "
-    
-    content = ""
-    
-    # Text elements
-    if el_type == 'heading':
-        text = el.get('text', '')
-        content = f'<div class="element-heading" style="{style_str}">{text}</div>'
-    
-    elif el_type == 'subheading':
-        text = el.get('text', '')
-        content = f'<div class="element-subheading" style="{style_str}">{text}</div>'
-    
-    elif el_type == 'badge':
-        text = el.get('text', '')
-        content = f'<div class="element-badge" style="{style_str}">{text}</div>'
-    
-    elif el_type == 'logo':
-        text = el.get('text', '')
-        content = f'<div class="element-logo" style="{style_str}">{text}</div>'
-    
-    elif el_type in ['body', 'tagline']:
-        text = el.get('text', '')
-        content = f'<div class="element-body" style="{style_str}">{text}</div>'
-    
-    elif el_type == 'quote':
-        text = el.get('text', '')
-        content = f'<div class="element-quote" style="{style_str}">{text}</div>'
-    
-    elif el_type == 'company-name':
-        text = el.get('text', '')
-        content = f'<div class="element-logo" style="font-size: 28px; {style_str}">{text}</div>'
-    
-    elif el_type == 'image':
-        src = el.get('src', '')
-        alt = el.get('alt', '')
-        content = f'<img src="{src}" alt="{alt}" class="element-image" style="{style_str}">'
-    
-    # Card-based elements
-    elif el_type in ['info-cards', 'philosophy-cards', 'service-cards', 'value-cards']:
-        items = el.get('items', [])
-        content += f'<div class="cards-container {el_type}">'
-        for item in items:
-            title = item.get('title', '') or item.get('label', '')
-            value = item.get('value', '') or item.get('description', '')
-            subtitle = item.get('subtitle', '')
-            icon = item.get('icon', '')
-            color = item.get('color', primary_color)
-            
-            content += f'<div class="card">'
-            if icon:
-                icon_char = get_icon(icon)
-                content += f'<div class="card-icon">{icon_char}</div>'
-            if title:
-                content += f'<div class="card-title" style="color: {color};">{title}</div>'
-            if subtitle:
-                content += f'<div class="card-subtitle">{subtitle}</div>'
-            if value:
-                content += f'<div class="card-value">{value}</div>'
-            content += '</div>'
-        content += '</div>'
-
-    # Timeline
-    elif el_type == 'timeline':
-        periods = el.get('periods', [])
-        content += '<div class="timeline-container">'
-        for p in periods:
-            # Support both 'year' and 'label' keys
-            year = p.get('label', '') or p.get('year', '')
-            milestone = p.get('milestone', '')
-            color = p.get('barColor', primary_color)
-            highlight = p.get('highlight', False)
-            highlight_style = f"background: {color}; color: white; padding: 4px 8px; border-radius: 4px;" if highlight else ""
-            content += f'<div class="timeline-item" style="border-top: 4px solid {color};">'
-            content += f'<div class="timeline-year" style="color: {color}; {highlight_style}">{year}</div>'
-            content += f'<div class="timeline-milestone">{milestone}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Feature/Service/Capability lists
-    elif el_type in ['feature-list', 'service-list', 'capability-list']:
-        items = el.get('items', [])
-        content += '<div class="list-container">'
-        for item in items:
-            title = item.get('title', '')
-            desc = item.get('description', '')
-            icon = item.get('icon', '')
-            icon_char = get_icon(icon) if icon else '●'
-            content += f'<div class="list-item">'
-            content += f'<span class="list-icon">{icon_char}</span>'
-            content += f'<div class="list-content">'
-            content += f'<div class="list-title">{title}</div>'
-            content += f'<div class="list-desc">{desc}</div>'
-            content += '</div></div>'
-        content += '</div>'
-    
-    # Client sections
-    elif el_type in ['client-section', 'client-highlight']:
-        title = el.get('title', '')
-        clients = el.get('clients', [])
-        if title:
-            content += f'<div class="section-title">{title}</div>'
-        
-        content += '<div class="clients-grid">'
-        for client in clients:
-            if isinstance(client, dict):
-                name = client.get('name', '')
-                highlight = client.get('highlight', False)
-                cls = 'client-item highlight' if highlight else 'client-item'
-            else:
-                name = client
-                cls = 'client-item'
-            content += f'<div class="{cls}">{name}</div>'
-        content += '</div>'
-
-    # Contact section
-    elif el_type == 'contact-section':
-        title = el.get('title', '')
-        items = el.get('items', [])
-        content += f'<div class="contact-section">'
-        if title:
-            content += f'<div class="contact-title">{title}</div>'
-        for item in items:
-            val = item.get('value', '')
-            itype = item.get('type', '')
-            icon = item.get('icon', itype)
-            icon_char = get_icon(icon) if icon else ''
-            content += f'<div class="contact-item">'
-            content += f'<span class="contact-label">{itype.upper()}</span>'
-            if icon_char:
-                content += f'<span style="margin-right: 8px;">{icon_char}</span>'
-            content += f'{val}</div>'
-        content += '</div>'
-    
-    # Highlight box
-    elif el_type == 'highlight-box':
-        title = el.get('title', '')
-        content_text = el.get('content', '')
-        content += f'<div class="highlight-box">'
-        if title:
-            content += f'<div class="box-title">{title}</div>'
-        content += f'<div class="box-content">{content_text}</div>'
-        content += '</div>'
-
-    # Image grid
-    elif el_type == 'image-grid':
-        images = el.get('images', [])
-        content += '<div class="image-grid">'
-        for img in images:
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            content += f'<div class="grid-image-wrapper">'
-            content += f'<img src="{src}" alt="{alt}">'
-            content += '</div>'
-        content += '</div>'
-    
-    # Process flow
-    elif el_type == 'process-flow':
-        title = el.get('title', '')
-        steps = el.get('steps', [])
-        if title:
-            content += f'<div class="section-title">{title}</div>'
-        content += '<div class="process-flow">'
-        for step in steps:
-            num = step.get('step', '')
-            step_title = step.get('title', '')
-            desc = step.get('description', '')
-            content += f'<div class="process-step">'
-            content += f'<div class="process-number">{num}</div>'
-            content += f'<div class="process-title">{step_title}</div>'
-            content += f'<div class="process-desc">{desc}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Facility info
-    elif el_type == 'facility-info':
-        items = el.get('items', [])
-        content += '<div class="facility-info">'
-        for item in items:
-            label = item.get('label', '')
-            value = item.get('value', '')
-            content += f'<div class="facility-item">'
-            content += f'<div class="facility-label">{label}</div>'
-            content += f'<div class="facility-value">{value}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Feature grid
-    elif el_type == 'feature-grid':
-        items = el.get('items', [])
-        content += '<div class="feature-grid">'
-        for item in items:
-            icon = item.get('icon', '')
-            title = item.get('title', '')
-            desc = item.get('description', '')
-            icon_char = get_icon(icon) if icon else '●'
-            content += f'<div class="feature-item">'
-            content += f'<div class="feature-icon">{icon_char}</div>'
-            content += f'<div class="feature-title">{title}</div>'
-            content += f'<div class="feature-desc">{desc}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Network regions
-    elif el_type == 'network-regions':
-        items = el.get('items', [])
-        content += '<div class="network-regions">'
-        for item in items:
-            region = item.get('region', '')
-            countries = item.get('countries', [])
-            icon = item.get('icon', '')
-            icon_char = get_icon(icon) if icon else '🌐'
-            content += f'<div class="region-card">'
-            content += f'<div class="region-icon">{icon_char}</div>'
-            content += f'<div class="region-name">{region}</div>'
-            content += f'<div class="region-countries">{", ".join(countries)}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Image gallery
-    elif el_type == 'image-gallery':
-        images = el.get('images', [])
-        content += '<div class="image-grid">'
-        for img in images:
-            src = img.get('src', '')
-            alt = img.get('alt', '')
-            caption = img.get('caption', '')
-            content += f'<div class="grid-image-wrapper">'
-            content += f'<img src="{src}" alt="{alt}">'
-            if caption:
-                content += f'<div style="text-align: center; margin-top: 8px; font-size: 12px; color: #888;">{caption}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # TOC Item (Table of Contents)
-    elif el_type == 'toc-item':
-        items = el.get('items', [])
-        content += '<div class="toc-container">'
-        for item in items:
-            num = item.get('number', '')
-            title = item.get('title', '')
-            num_color = item.get('numberColor', primary_color)
-            title_color = item.get('titleColor', '#FFFFFF')
-            content += f'<div class="toc-item">'
-            content += f'<span class="toc-number" style="color: {num_color};">{num}</span>'
-            content += f'<span class="toc-title" style="color: {title_color};">{title}</span>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Stat Block
-    elif el_type == 'stat-block':
-        items = el.get('items', [])
-        content += '<div class="stats-container">'
-        for item in items:
-            value = item.get('value', '')
-            unit = item.get('unit', '')
-            label = item.get('label', '')
-            value_color = item.get('valueColor', '#FFFFFF')
-            value_size = item.get('valueSize', '64px')
-            content += f'<div class="stat-item">'
-            content += f'<div class="stat-value" style="color: {value_color}; font-size: {value_size};">{value}<span class="stat-unit">{unit}</span></div>'
-            content += f'<div class="stat-label">{label}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Chart (Horizontal Bar)
-    elif el_type == 'chart':
-        chart_type = el.get('chartType', 'horizontal-bar')
-        title = el.get('title', '')
-        data = el.get('data', [])
-        content += '<div class="chart-container">'
-        if title:
-            content += f'<div class="chart-title">{title}</div>'
-        for item in data:
-            label = item.get('label', '')
-            value = item.get('value', 0)
-            color = item.get('color', primary_color)
-            content += f'<div class="chart-bar-item">'
-            content += f'<div class="chart-bar-label">{label} ({value}%)</div>'
-            content += f'<div class="chart-bar-wrapper">'
-            content += f'<div class="chart-bar" style="width: {value}%; background: {color};"></div>'
-            content += '</div></div>'
-        content += '</div>'
-    
-    # Model Cards (Business Model)
-    elif el_type == 'model-cards':
-        items = el.get('items', [])
-        content += '<div class="model-cards-container">'
-        for item in items:
-            icon = item.get('icon', 'circle')
-            icon_color = item.get('iconColor', primary_color)
-            title = item.get('title', '')
-            desc = item.get('description', '')
-            icon_char = get_icon(icon)
-            content += f'<div class="model-card">'
-            content += f'<div class="model-card-icon" style="color: {icon_color};">{icon_char}</div>'
-            content += f'<div class="model-card-title">{title}</div>'
-            content += f'<div class="model-card-desc">{desc}</div>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Comparison Table
-    elif el_type == 'comparison-table':
-        headers = el.get('headers', [])
-        rows = el.get('rows', [])
-        highlight_color = el.get('highlightColor', primary_color)
-        content += '<table class="comparison-table">'
-        # Header row
-        content += '<thead><tr>'
-        for h in headers:
-            content += f'<th>{h}</th>'
-        content += '</tr></thead>'
-        # Body rows
-        content += '<tbody>'
-        for row in rows:
-            company = row.get('company', '')
-            values = row.get('values', [])
-            is_highlight = row.get('isHighlight', False)
-            row_class = 'highlight' if is_highlight else ''
-            content += f'<tr class="{row_class}">'
-            content += f'<td>{company}</td>'
-            for v in values:
-                if v == 'check':
-                    content += '<td class="check">✓</td>'
-                elif v == 'highlight':
-                    content += f'<td class="highlight-check">✓</td>'
-                else:
-                    content += f'<td>{v}</td>'
-            content += '</tr>'
-        content += '</tbody></table>'
-    
-    # Icon Grid (6 out of 10)
-    elif el_type == 'icon-grid':
-        total = el.get('total', 10)
-        highlighted = el.get('highlighted', 6)
-        highlight_color = el.get('highlightColor', primary_color)
-        default_color = el.get('defaultColor', '#4A4A4A')
-        content += '<div class="icon-grid-container">'
-        for i in range(total):
-            color = highlight_color if i < highlighted else default_color
-            content += f'<div class="icon-grid-item" style="background: {color};">●</div>'
-        content += '</div>'
-    
-    # Client Logos
-    elif el_type == 'client-logos':
-        clients = el.get('clients', [])
-        content += '<div class="client-logos-container">'
-        for client in clients:
-            name = client.get('name', '')
-            is_highlight = client.get('highlight', False)
-            cls = 'client-logo-item highlighted' if is_highlight else 'client-logo-item'
-            content += f'<div class="{cls}">{name}</div>'
-        content += '</div>'
-    
-    # Contact Info (list style)
-    elif el_type == 'contact-info':
-        items = el.get('items', [])
-        content += '<div class="contact-info-list">'
-        for item in items:
-            itype = item.get('type', '')
-            value = item.get('value', '')
-            icon = get_icon(itype) if itype else ''
-            content += f'<div class="contact-info-item">'
-            content += f'<span class="contact-info-icon">{icon}</span>'
-            content += f'<span>{value}</span>'
-            content += '</div>'
-        content += '</div>'
-    
-    # Label
-    elif el_type == 'label':
-        text = el.get('text', '')
-        content = f'<div class="element-body" style="font-style: italic; {style_str}">{text}</div>'
-    
-    # Logo placeholder
-    elif el_type == 'logo-placeholder':
-        text = el.get('text', '')
-        content = f'<div style="margin-top: 32px; font-size: 14px; color: {primary_color}; {style_str}">{text}</div>'
+        declarations.append((prop, str(v)))
+    return tuple(declarations)
+
+
+class StyleInterner:
+    """정규화된 스타일 → 생성 클래스 이름 (s-<해시 8자리>)
+
+    collect_styles()로 덱 전체의 스타일 사용 횟수를 먼저 세고, min_uses 번 이상 반복되는
+    스타일만 해시 한 번으로 클래스를 만들어 <style>에 규칙 하나로 출력합니다 (나머지는 인라인).
+    인라인 스타일과 같은 우선순위를 갖도록 선언마다 !important 를 붙입니다
+    (slides.css 의 .element-* 규칙보다 우선).
+    """
+
+    def __init__(self, min_uses=2):
+        self.min_uses = min_uses
+        self.counts = {}
+        self.classes = {}
+
+    def __len__(self):
+        return len(self.classes)
+
+    @property
+    def uses(self):
+        """클래스로 출력되는 element 수"""
+        return sum(self.counts[declarations] for declarations in self.classes)
+
+    def add(self, style_obj):
+        """스타일 사용 횟수 등록 (출력할 선언이 없으면 무시)"""
+        declarations = style_declarations(style_obj)
+        if not declarations:
+            return
+        count = self.counts.get(declarations, 0) + 1
+        self.counts[declarations] = count
+        if count == self.min_uses:
+            digest = hashlib.sha1(repr(declarations).encode('utf-8')).hexdigest()
+            self.classes[declarations] = f"s-{digest[:8]}"
+
+    def class_for(self, declarations):
+        """인터닝된 스타일의 클래스 이름 (인라인으로 출력할 스타일이면 None)"""
+        return self.classes.get(declarations)
+
+    def css(self):
+        if not self.classes:
+            return ''
+        lines = ["        /* Interned element styles (--intern-styles) */"]
+        for declarations, class_name in self.classes.items():
+            body = ' '.join(f"{prop}: {value.replace('!important', '').strip()} !important;"
+                            for prop, value in declarations)
+            lines.append(f"        .{class_name} {{ {body} }}")
+        return '\n'.join(lines) + '\n'
+
+
+def collect_styles(selected, styles, renderers=None):
+    """렌더링 전에 선택된 슬라이드의 인터닝 대상 element 스타일을 등록"""
+    registry = renderers or BUILTIN_RENDERERS
+    for _, slide in selected:
+        template = slide_template_name(slide)
+        for el in slide.get('elements', []):
+            if registry.uses_style_class(registry.get(el.get('type', 'body'))):
+                styles.add(prepare_element(el, template).get('style'))
+
+
+# element type → templates/elements.html 의 macro 이름 (Jinja2 매크로가 그대로 렌더러)
+ELEMENT_TEMPLATE_NAMES = {
+    'heading': 'heading',
+    'subheading': 'subheading',
+    'badge': 'badge',
+    'logo': 'logo',
+    'body': 'body',
+    'tagline': 'body',
+    'quote': 'quote',
+    'company-name': 'company_name',
+    'image': 'image',
+    'info-cards': 'cards',
+    'philosophy-cards': 'cards',
+    'service-cards': 'cards',
+    'value-cards': 'cards',
+    'timeline': 'timeline',
+    'feature-list': 'feature_list',
+    'service-list': 'feature_list',
+    'capability-list': 'feature_list',
+    'client-section': 'client_section',
+    'client-highlight': 'client_section',
+    'contact-section': 'contact_section',
+    'highlight-box': 'highlight_box',
+    'image-grid': 'image_grid',
+    'process-flow': 'process_flow',
+    'facility-info': 'facility_info',
+    'feature-grid': 'feature_grid',
+    'network-regions': 'network_regions',
+    'image-gallery': 'image_gallery',
+    'toc-item': 'toc_item',
+    'stat-block': 'stat_block',
+    'chart': 'chart',
+    'model-cards': 'model_cards',
+    'comparison-table': 'comparison_table',
+    'icon-grid': 'icon_grid',
+    'client-logos': 'client_logos',
+    'contact-info': 'contact_info',
+    'label': 'label',
+    'logo-placeholder': 'logo_placeholder',
+}
+
+# style_class 인자를 받는 def (단일 div/img 텍스트 element)
+STYLE_CLASS_TEMPLATES = {'heading', 'subheading', 'badge', 'logo', 'body', 'quote', 'company_name', 'image', 'label'}
+
+for _el_type, _template_name in ELEMENT_TEMPLATE_NAMES.items():
+    register_element_renderer(_el_type, getattr(ELEMENT_TEMPLATES, _template_name),
+                              style_class=_template_name in STYLE_CLASS_TEMPLATES)
 
-    return content
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python generate_html.py [project_name]")
-    else:
-        generate_html(sys.argv[1])
+    parser = argparse.ArgumentParser(description="presentation.json → presentation.html")
+    parser.add_argument("project_name", help="projects/ 아래 프로젝트 폴더 이름")
+    parser.add_argument("--slides", help="부분 빌드할 슬라이드 번호/범위 (예: 3-5,9)")
+    parser.add_argument("--template", help="부분 빌드할 템플릿 이름 (예: section-divider)")
+    parser.add_argument("--composite", action="store_true",
+                        help="image-overlay 배경을 합성 이미지 1장으로 출력 (NumPy 필요)")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="결과물 다이제스트를 build_manifest.json에 기록")
+    parser.add_argument("--intern-styles", action="store_true",
+                        help="반복되는 element 인라인 스타일을 <style>의 클래스로 출력")
+    parser.add_argument("--shared-css", nargs="?", const=True, metavar="DIR",
+                        help="정적 CSS를 콘텐츠 해시 이름의 공유 파일로 출력 (기본: projects/<name>/assets)")
+    parser.add_argument("--self-contained", nargs="?", const="inline", choices=["inline", "assets"],
+                        help="오프라인 HTML: subset 폰트 포함, 이미지를 data URI(inline) 또는 assets/images/로 저장")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="슬라이드 조각 캐시(.build_cache/fragments)를 사용하지 않고 전체 렌더링")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="슬라이드 렌더링 프로세스 수 (수천 장 규모의 덱용, 기본 1)")
+    parser.add_argument("--minify", action="store_true",
+                        help="HTML/CSS 최소화 (인쇄 결과 유지) 및 분류별 크기 보고")
+    args = parser.parse_args()
+    success = generate_html(args.project_name, slides=args.slides, template=args.template,
+                            composite=args.composite, reproducible=args.reproducible,
+                            intern_styles=args.intern_styles, shared_css=args.shared_css,
+                            self_contained=args.self_contained, use_cache=not args.no_cache,
+                            workers=max(1, args.workers), minify=args.minify)
+    sys.exit(0 if success else 1)
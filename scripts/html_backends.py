@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+html_to_json 파서 백엔드 (HTML parser backends)
+
+생성된 presentation.html 을 읽는 방법을 선택할 수 있도록 파서를 추상화합니다.
+
+| 백엔드 | 방식 | 메모리 |
+|--------|------|--------|
+| stream | lxml iterparse - div.slide 가 끝날 때마다 처리하고 버림 (기본) | 슬라이드 1장 |
+| lxml   | lxml.html 로 문서 전체 파싱 | 문서 전체 (BeautifulSoup보다 작음) |
+| bs4    | BeautifulSoup(lxml) 전체 트리 (lxml 직접 사용이 불가능할 때 폴백) | 문서 전체 |
+
+iter_document()는 백엔드와 상관없이 ('title', 텍스트) / ('style', CSS) / ('slide', 노드) 이벤트를
+문서 순서대로 생성합니다. 노드는 BsNode / LxmlNode 어댑터로 감싸 같은 방법으로 다룹니다.
+
+벤치마크: python scripts/bench_html_backends.py
+"""
+
+try:
+    from lxml import etree
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    etree = None
+    HAS_LXML = False
+
+try:
+    from bs4 import BeautifulSoup, NavigableString, Tag
+    HAS_BS4 = True
+except ImportError:
+    BeautifulSoup = NavigableString = Tag = None
+    HAS_BS4 = False
+
+
+BACKENDS = ('stream', 'lxml', 'bs4')
+
+
+def available_backends():
+    """현재 환경에서 사용할 수 있는 백엔드 이름 목록"""
+    names = []
+    if HAS_LXML:
+        names += ['stream', 'lxml']
+    if HAS_BS4:
+        names.append('bs4')
+    return names
+
+
+def resolve_backend(backend='auto'):
+    """'auto' → 사용 가능한 첫 번째 백엔드 (stream → lxml → bs4)"""
+    available = available_backends()
+    if not available:
+        raise RuntimeError("HTML 파서가 없습니다 - pip install lxml beautifulsoup4")
+    if backend == 'auto':
+        return available[0]
+    if backend not in BACKENDS:
+        raise ValueError(f"알 수 없는 백엔드: {backend} (선택: {', '.join(BACKENDS)})")
+    if backend not in available:
+        raise RuntimeError(f"'{backend}' 백엔드를 사용할 수 없습니다 (설치된 백엔드: {', '.join(available)})")
+    return backend
+
+
+# ========================================
+# Node adapters
+# ========================================
+
+class BsNode:
+    """BeautifulSoup Tag 어댑터"""
+
+    __slots__ = ('tag',)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    @property
+    def name(self):
+        return self.tag.name
+
+    @property
+    def classes(self):
+        return self.tag.get('class', [])
+
+    def get(self, attr, default=''):
+        return self.tag.get(attr, default)
+
+    def has_direct_text(self):
+        """바로 아래에 공백이 아닌 텍스트 노드가 있는지 (주석 등 제외)"""
+        return any(type(child) is NavigableString and not child.isspace() for child in self.tag.children)
+
+    def child_elements(self):
+        return [BsNode(child) for child in self.tag.contents if isinstance(child, Tag)]
+
+    def text(self):
+        """하위 텍스트를 앞뒤 공백 제거 후 이어 붙인 문자열 (get_text(strip=True))"""
+        return self.tag.get_text(strip=True)
+
+    def images(self):
+        return [BsNode(img) for img in self.tag.find_all('img')]
+
+    def raw_text(self):
+        """하위 텍스트 원문 (공백/줄바꿈 유지)"""
+        return self.tag.get_text()
+
+    def inner_html(self):
+        return self.tag.decode_contents()
+
+    def with_attribute(self, attr):
+        """attr 속성이 있는 하위 요소 (문서 순서)"""
+        return [BsNode(tag) for tag in self.tag.find_all(attrs={attr: True})]
+
+    def find_first(self, names):
+        found = self.tag.find(list(names))
+        return BsNode(found) if found is not None else None
+
+
+class LxmlNode:
+    """lxml 요소 어댑터 (lxml.html 트리와 iterparse 트리 공용)"""
+
+    __slots__ = ('el',)
+
+    def __init__(self, el):
+        self.el = el
+
+    @property
+    def name(self):
+        return self.el.tag
+
+    @property
+    def classes(self):
+        return self.el.get('class', '').split()
+
+    def get(self, attr, default=''):
+        return self.el.get(attr, default)
+
+    def has_direct_text(self):
+        el = self.el
+        if el.text and not el.text.isspace():
+            return True
+        return any(child.tail and not child.tail.isspace() for child in el)
+
+    def child_elements(self):
+        return [LxmlNode(child) for child in self.el if isinstance(child.tag, str)]
+
+    def text(self):
+        return ''.join(t.strip() for t in self.el.itertext() if not t.isspace())
+
+    def images(self):
+        return [LxmlNode(img) for img in self.el.iter('img')]
+
+    def raw_text(self):
+        return self.el.xpath('string()')
+
+    def with_attribute(self, attr):
+        return [LxmlNode(el) for el in self.el.iterfind(f'.//*[@{attr}]')]
+
+    def inner_html(self):
+        el = self.el
+        return (el.text or '') + ''.join(etree.tostring(child, encoding='unicode', method='html') for child in el)
+
+    def find_first(self, names):
+        for el in self.el.iter(*names):
+            return LxmlNode(el)
+        return None
+
+
+# ========================================
+# Document iteration
+# ========================================
+
+def _is_slide(classes):
+    return 'slide' in classes.split()
+
+
+def _iter_bs4(html_path):
+    with open(html_path, 'r', encoding='utf-8') as f:
+        soup = BeautifulSoup(f.read(), 'lxml')
+    title = soup.find('title')
+    if title is not None:
+        yield 'title', title.string
+    for style in soup.find_all('style'):
+        yield 'style', style.get_text()
+    for slide in soup.find_all('div', class_='slide'):
+        yield 'slide', BsNode(slide)
+
+
+def _iter_lxml(html_path):
+    with open(html_path, 'rb') as f:
+        doc = lxml.html.document_fromstring(f.read(), parser=lxml.html.HTMLParser(encoding='utf-8'))
+    for el in doc.iter('title', 'style', 'div'):
+        if el.tag == 'title':
+            yield 'title', el.text if len(el) == 0 else None
+        elif el.tag == 'style':
+            yield 'style', el.text or ''
+        elif _is_slide(el.get('class', '')):
+            yield 'slide', LxmlNode(el)
+
+
+def _iter_stream(html_path):
+    """iterparse - 슬라이드 div가 끝나면 처리 후 비우고, 앞서 처리한 형제 요소도 트리에서 제거"""
+    context = etree.iterparse(html_path, events=('end',), tag=('title', 'style', 'div'),
+                              html=True, encoding='utf-8', remove_comments=True)
+    for _, el in context:
+        if el.tag == 'title':
+            yield 'title', el.text if len(el) == 0 else None
+        elif el.tag == 'style':
+            yield 'style', el.text or ''
+        elif _is_slide(el.get('class', '')):
+            yield 'slide', LxmlNode(el)
+            el.clear()
+            parent = el.getparent()
+            while parent is not None and el.getprevious() is not None:
+                del parent[0]
+
+
+def iter_document(html_path, backend='auto'):
+    """('title', 텍스트) / ('style', CSS 텍스트) / ('slide', 노드) 이벤트를 문서 순서대로 생성
+
+    stream 백엔드의 슬라이드 노드는 다음 이벤트를 받기 전까지만 유효합니다.
+    """
+    backend = resolve_backend(backend)
+    if backend == 'stream':
+        return _iter_stream(str(html_path))
+    if backend == 'lxml':
+        return _iter_lxml(html_path)
+    return _iter_bs4(html_path)
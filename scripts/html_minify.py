@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+HTML/CSS 최소화 및 출력 크기 보고 (Minification & size report)
+
+generate_html.py --minify 에서 사용하며, 이미 생성된 HTML도 직접 처리할 수 있습니다.
+인쇄 결과가 바뀌지 않는 범위에서만 줄입니다.
+
+- CSS(<style>): 주석/들여쓰기 제거, { } ; , : > 주변 공백 제거 (문자열, calc()의 + - 공백은 유지)
+- 인라인 style 속성: 같은 규칙으로 선언 공백 제거 ("font-size: 12px; " → "font-size:12px")
+- 마크업: <!-- Slide --> 등 주석 제거, 줄바꿈이 포함된 태그 사이 공백 제거, class 속성 공백 정리
+  (텍스트 내용은 건드리지 않음 - .element-heading 등은 white-space: pre-line 으로 줄바꿈을 표시)
+
+크기 보고 분류: CSS(<style> 내용), markup(태그/텍스트), inline style(style 속성 값), data URI
+
+Usage:
+    python scripts/html_minify.py projects/my-project/presentation.html            # 크기 보고만
+    python scripts/html_minify.py projects/my-project/presentation.html -o out.html # 최소화 결과 저장
+    python scripts/html_minify.py projects/my-project/presentation.html --in-place
+"""
+
+import argparse
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+from image_cache import write_atomic
+
+
+_STRING_RE = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+_CSS_COLON_RE = re.compile(r":\s+")
+
+_STYLE_BLOCK_RE = re.compile(r"(<style[^>]*>)(.*?)(</style>)", re.S | re.I)
+_RAW_BLOCK_RE = re.compile(r"(<(script|pre|textarea)\b.*?</\2>)", re.S | re.I)
+_STYLE_ATTR_RE = re.compile(r'(\sstyle=")([^"]*)(")')
+_CLASS_ATTR_RE = re.compile(r'(\sclass=")([^"]*)(")')
+_EMPTY_STYLE_ATTR_RE = re.compile(r'\sstyle=""')
+_HTML_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_TAG_GAP_RE = re.compile(r">[ \t]*\n\s*<")
+_DATA_URI_RE = re.compile(r"data:[\w/+.-]+(?:;[\w=.-]+)*,[^\"')\s]*")
+
+
+def _minify_css_code(code):
+    code = _SPACE_RE.sub(" ", code)
+    code = _CSS_PUNCT_RE.sub(r"\1", code)
+    return _CSS_COLON_RE.sub(":", code)
+
+
+def minify_declarations(css):
+    """선언/규칙 문자열 최소화 - 따옴표 문자열 안은 그대로 둡니다"""
+    parts = _STRING_RE.split(_CSS_COMMENT_RE.sub("", css))
+    out = []
+    for i, part in enumerate(parts):
+        out.append(part if i % 2 else _minify_css_code(part))
+    return "".join(out).strip().replace(";}", "}")
+
+
+@lru_cache(maxsize=32)
+def minify_css(css):
+    """스타일시트 최소화 (같은 CSS는 메모리 캐시 - 정적 CSS는 빌드마다 다시 계산하지 않음)"""
+    css = minify_declarations(css)
+    return css[:-1] if css.endswith(";") else css
+
+
+def minify_style_attr(value):
+    value = minify_declarations(value)
+    return value[:-1] if value.endswith(";") else value
+
+
+def _minify_markup(html):
+    html = _HTML_COMMENT_RE.sub("", html)
+    html = _TAG_GAP_RE.sub("><", html)
+    html = _STYLE_ATTR_RE.sub(lambda m: m.group(1) + minify_style_attr(m.group(2)) + m.group(3), html)
+    html = _EMPTY_STYLE_ATTR_RE.sub("", html)
+    return _CLASS_ATTR_RE.sub(lambda m: m.group(1) + " ".join(m.group(2).split()) + m.group(3), html)
+
+
+def minify_html(html):
+    """HTML 문서 또는 조각 최소화 (<style> 내용은 CSS 규칙으로, script/pre/textarea 는 그대로)"""
+    out = []
+    markup = ""
+    pos = 0
+    for m in _STYLE_BLOCK_RE.finditer(html):
+        # 태그 사이 공백을 지우도록 <style>/</style> 태그는 앞뒤 마크업과 함께 처리
+        out.append(_minify_outside_raw(markup + html[pos:m.start()] + m.group(1)))
+        out.append(minify_css(m.group(2)))
+        markup = m.group(3)
+        pos = m.end()
+    out.append(_minify_outside_raw(markup + html[pos:]))
+    return "".join(out)
+
+
+def _minify_outside_raw(html):
+    parts = _RAW_BLOCK_RE.split(html)
+    out = []
+    i = 0
+    while i < len(parts):
+        out.append(_minify_markup(parts[i]))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])  # script/pre/textarea 블록 원문
+        i += 3
+    return "".join(out)
+
+
+# ========================================
+# Size report
+# ========================================
+SIZE_CATEGORIES = ("css", "markup", "inline_style", "data_uri")
+
+
+def _utf8_len(text):
+    return len(text.encode("utf-8"))
+
+
+def size_report(html):
+    """분류별 UTF-8 바이트 수 {css, markup, inline_style, data_uri, total}"""
+    data_uri = sum(_utf8_len(m.group(0)) for m in _DATA_URI_RE.finditer(html))
+    css = sum(_utf8_len(m.group(2)) for m in _STYLE_BLOCK_RE.finditer(html))
+    inline_style = sum(_utf8_len(m.group(2)) for m in _STYLE_ATTR_RE.finditer(html))
+    # data URI는 CSS/style 속성 안에 있어도 data URI로만 계산
+    css_data = sum(_utf8_len(d.group(0)) for m in _STYLE_BLOCK_RE.finditer(html)
+                   for d in _DATA_URI_RE.finditer(m.group(2)))
+    style_data = sum(_utf8_len(d.group(0)) for m in _STYLE_ATTR_RE.finditer(html)
+                     for d in _DATA_URI_RE.finditer(m.group(2)))
+    total = _utf8_len(html)
+    report = {
+        "css": css - css_data,
+        "inline_style": inline_style - style_data,
+        "data_uri": data_uri,
+    }
+    report["markup"] = total - sum(report.values())
+    report["total"] = total
+    return report
+
+
+def format_report(after, before=None):
+    """크기 보고 표 (before가 있으면 전/후 비교)"""
+    labels = {"css": "CSS", "markup": "Markup", "inline_style": "Inline style", "data_uri": "Data URIs"}
+    lines = []
+    for category in SIZE_CATEGORIES + ("total",):
+        label = labels.get(category, "Total")
+        if before is None:
+            lines.append(f"  {label:<13} {after[category] / 1024:>9.1f} KB")
+        else:
+            change = (after[category] - before[category]) / before[category] * 100 if before[category] else 0.0
+            lines.append(f"  {label:<13} {before[category] / 1024:>9.1f} KB → {after[category] / 1024:>9.1f} KB"
+                         f"  ({change:+.1f}%)")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML/CSS 최소화 및 분류별 크기 보고")
+    parser.add_argument("html_file", help="presentation.html 경로")
+    parser.add_argument("-o", "--output", help="최소화한 HTML 저장 경로")
+    parser.add_argument("--in-place", action="store_true", help="원본 파일을 최소화 결과로 교체")
+    args = parser.parse_args()
+
+    path = Path(args.html_file)
+    if not path.exists():
+        print(f"Error: {path} not found.")
+        sys.exit(1)
+    html = path.read_text(encoding="utf-8")
+    before = size_report(html)
+    if not args.output and not args.in_place:
+        print(f"📊 {path}")
+        print(format_report(before))
+        return
+
+    minified = minify_html(html)
+    output = path if args.in_place else Path(args.output)
+    write_atomic(output, minified.encode("utf-8"))
+    print(f"✅ Minified: {output}")
+    print(format_report(size_report(minified), before))
+
+
+if __name__ == "__main__":
+    main()
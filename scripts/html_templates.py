@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+HTML 템플릿 (Jinja2)
+
+generate_html.py 의 슬라이드/element 마크업 템플릿(scripts/templates/*.html)을 Jinja2 매크로로 불러옵니다.
+
+- autoescape: {{ value }} 는 HTML 이스케이프, {{ value|safe }} 는 그대로 (이미 렌더링된 HTML)
+- 컴파일은 한 번만: Environment 가 컴파일된 템플릿을 메모리에 보관하고 (파일이 바뀌면 auto_reload),
+  바이트코드는 FileSystemBytecodeCache 로 .cache/templates 에 저장
+- 템플릿의 각 {% macro %} 가 파이썬에서 호출하는 함수입니다 (load_templates('elements').heading(...))
+
+공백: slide.html, elements.html 은 각 줄의 앞뒤 공백과 줄바꿈을 제거하고 이어 붙인 뒤 컴파일합니다
+(CompactLines - 태그는 한 줄에 작성). 공백을 그대로 출력해야 하는 템플릿은 VERBATIM_TEMPLATES 에 둡니다.
+
+Usage:
+    from html_templates import load_templates
+    T = load_templates('elements', get_icon=get_icon)
+    T.heading({'text': 'Hello'}, 'color: red; ', '#FF6B35', '#FFB800')
+"""
+
+import os
+from pathlib import Path
+
+import jinja2
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from jinja2.ext import Extension
+
+import image_cache
+
+
+# 조각 캐시 키에 들어가는 템플릿 엔진 버전
+ENGINE_VERSION = f"jinja2-{jinja2.__version__}"
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# 줄 공백을 그대로 출력하는 템플릿 (문서 머리말)
+VERBATIM_TEMPLATES = frozenset(['document.html'])
+
+# template_dir → Environment
+_environments = {}
+# 메모리 캐시: 파일 경로 → (mtime_ns, size, 파일 내용) - read_static
+_static = {}
+
+
+class CompactLines(Extension):
+    """컴파일 전에 각 줄의 앞뒤 공백과 줄바꿈 제거 (VERBATIM_TEMPLATES 제외)"""
+
+    def preprocess(self, source, name, filename=None):
+        if name in VERBATIM_TEMPLATES:
+            return source
+        return "".join(line.strip() for line in source.splitlines())
+
+
+def template_environment(template_dir=TEMPLATE_DIR):
+    """template_dir 의 Jinja2 Environment (프로세스당 하나)"""
+    template_dir = str(template_dir)
+    env = _environments.get(template_dir)
+    if env is None:
+        cache_dir = image_cache.CACHE_DIR / "templates"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=True,
+            auto_reload=True,
+            bytecode_cache=FileSystemBytecodeCache(str(cache_dir)),
+            extensions=[CompactLines],
+        )
+        _environments[template_dir] = env
+    return env
+
+
+def load_templates(name, template_dir=TEMPLATE_DIR, **helpers):
+    """templates/<name>.html 의 매크로들을 속성으로 가진 템플릿 모듈 반환
+
+    helpers는 템플릿 표현식에서 사용할 전역 이름입니다 (예: get_icon).
+    같은 파일을 다시 불러도 파일이 바뀌지 않았으면 재컴파일하지 않습니다.
+    """
+    template = template_environment(template_dir).get_template(f"{name}.html", globals=helpers)
+    return template.module
+
+
+def read_static(name, template_dir=TEMPLATE_DIR):
+    """templates/ 아래 정적 파일(CSS 등) 내용 (메모리 캐시)"""
+    path = str(Path(template_dir) / name)
+    stat = os.stat(path)
+    cached = _static.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    _static[path] = (stat.st_mtime_ns, stat.st_size, text)
+    return text
@@ -5,42 +5,59 @@ HTML → JSON 역변환 스크립트
 HTML 파일을 파싱하여 presentation.json 형식으로 변환합니다.
 HTML을 수정한 후 JSON을 업데이트하여 PPTX 생성 시 최신 상태를 반영합니다.
 
+HTML 파서는 html_backends.py 참조 (--backend stream | lxml | bs4, 기본: 사용 가능한 가장 빠른 백엔드)
+텍스트의 fontSize/color 와 designTokens 는 문서의 모든 <style> 을 캐스케이드 계산한 값입니다 (css_cascade.py -
+클래스 규칙, 상속, var() 포함).
+
+--merge: presentation.json 을 새로 만들지 않고, generate_html.py 가 element 루트에 출력한
+data-el-id("<슬라이드 번호>.<elements 순번>")로 원본 element를 찾아 바뀐 필드(text, src, alt, style)만 수정합니다.
+metadata, companyInfo, element 구조 등 HTML에 없는 정보는 그대로 유지되고,
+바뀌지 않은 슬라이드는 JSON이 같으므로 슬라이드 조각 캐시도 그대로 사용됩니다.
+텍스트 element 안에 태그(<b>, <br> 등)를 넣은 수정은 text 문자열로 표현할 수 없으므로 병합하지 않고 경고합니다.
+
 Usage:
     python scripts/html_to_json.py projects/[project-name]/presentation.html
-    python scripts/html_to_json.py projects/eumlogistic/presentation.html
+    python scripts/html_to_json.py projects/eumlogistic/presentation.html --backend bs4
+    python scripts/html_to_json.py projects/eumlogistic/presentation.html --merge
 """
 
+import argparse
+import html
 import sys
 import json
 import re
 from pathlib import Path
-from bs4 import BeautifulSoup, Comment
 
+import css_cascade
+from css_cascade import StyleResolver
+from html_backends import BACKENDS, iter_document
+from image_cache import write_atomic
+from json_patch import dumps_like
+from reproducible import build_timestamp
+from slide_selection import get_slide_number
 
-def extract_css_variables(soup):
-    """CSS :root 변수를 추출하여 designTokens 생성"""
-    style_tag = soup.find('style')
-    if not style_tag:
-        return {}
-    
-    css_text = style_tag.string
-    root_match = re.search(r':root\s*\{([^}]+)\}', css_text, re.DOTALL)
-    
-    if not root_match:
-        return {}
-    
+
+_INTERNED_RULE_RE = re.compile(r'\.(s-[0-9a-f]{8})\s*\{([^}]*)\}')
+
+_ROOT_STYLE_RE = re.compile(r'\s*<[a-zA-Z][^>]*?\sstyle="([^"]*)"')
+_ROOT_HAS_CHILD_RE = re.compile(r'\s*<[a-zA-Z][^>]*>[^<]*<[a-zA-Z]')
+_CSS_PROPERTY_RE = re.compile(r'-([a-z])')
+
+# 텍스트를 추출하지 않는 태그 (내용이 텍스트가 아님)
+SKIPPED_TAGS = frozenset(['style', 'script', 'title', 'template', 'noscript'])
+
+# --merge: element 루트 태그의 원본 element 위치 (generate_html.element_id)
+ELEMENT_ID_ATTR = 'data-el-id'
+# 빌드 시 교체된 이미지 src (--self-contained 의 data URI / assets 파일) - 원본 URL을 덮어쓰지 않음
+LOCALIZED_SRC_PREFIXES = ('data:', 'assets/')
+
+
+def extract_css_variables(variables):
+    """CSS :root 변수(StyleResolver.root_variables - 모든 <style>, var() 치환 후)로 designTokens 생성"""
     tokens = {}
-    root_content = root_match.group(1)
     
-    # CSS 변수 파싱
-    for line in root_content.split(';'):
-        line = line.strip()
-        if not line or ':' not in line:
-            continue
-        
-        var_name, var_value = line.split(':', 1)
-        var_name = var_name.strip().lstrip('--')
-        var_value = var_value.strip()
+    for var_name, var_value in variables.items():
+        var_name = var_name[2:]
         
         # 카테고리별 분류
         if var_name.startswith('gradient-'):
@@ -69,66 +86,97 @@ def extract_css_variables(soup):
     return tokens
 
 
-def extract_slide_content(slide_div):
-    """슬라이드 div에서 콘텐츠 추출"""
+def extract_interned_styles(style_texts):
+    """generate_html.py --intern-styles 로 생성된 스타일 클래스 → 선언 문자열 (!important 제거)"""
+    styles = {}
+    for css_text in style_texts:
+        for class_name, body in _INTERNED_RULE_RE.findall(css_text):
+            styles[class_name] = body.replace(' !important', '').strip()
+    return styles
+
+
+def _text_entry(tag, text, style):
+    """텍스트 노드(html_backends 어댑터) → {'text', 'type', 'fontSize', 'color'} (style: css_cascade.StyleContext)"""
+    # 클래스로 타입 추정
+    classes = tag.classes
+    text_type = 'body'
+
+    if tag.name == 'h1' or 'h1' in classes:
+        text_type = 'heading'
+    elif tag.name == 'h2' or 'h2' in classes:
+        text_type = 'subheading'
+    elif tag.name == 'h3' or 'h3' in classes:
+        text_type = 'title'
+    elif 'label' in classes:
+        text_type = 'label'
+    elif 'caption' in classes:
+        text_type = 'caption'
+
+    # 계산된 스타일 (클래스 규칙 + 인라인 + 상속)
+    return {
+        'text': text,
+        'type': text_type,
+        'fontSize': style.computed.get('font-size'),
+        'color': style.computed.get('color')
+    }
+
+
+def _child_entries(tag, style):
+    """순회 스택에 넣을 (노드, 부모 스타일, 첫 번째 자식 여부) - 문서 순서의 역순"""
+    return [(child, style, i == 0) for i, child in enumerate(tag.child_elements())][::-1]
+
+
+def extract_slide_content(slide_div, resolver=None, slide_style=None):
+    """슬라이드 div(html_backends 노드 어댑터)에서 콘텐츠 추출
+    (resolver: 문서 스타일시트의 css_cascade.StyleResolver, slide_style: 슬라이드 div 의 StyleContext)
+
+    트리를 위에서부터 한 번만 순회합니다. 직접 텍스트를 가진 가장 바깥 태그(텍스트 블록)에서 텍스트를 꺼내고
+    그 아래로는 내려가지 않으며, 텍스트가 없는 컨테이너만 내려가므로 각 노드를 한 번씩만 방문합니다.
+    이미지도 같은 순회에서 수집하고, 계산된 스타일도 부모 스타일을 들고 내려가며 같은 순회에서 구합니다.
+    """
     content = {
         'texts': [],
         'images': [],
         'layout': 'unknown'
     }
-    
-    # 텍스트 추출 (h1, h2, h3, p, span 등)
-    for tag in slide_div.find_all(['h1', 'h2', 'h3', 'h4', 'p', 'span', 'div']):
-        text = tag.get_text(strip=True)
-        if not text or len(text) < 2:
+    seen_texts = set()
+    if resolver is None:
+        resolver = StyleResolver(())
+    if slide_style is None:
+        slide_style = resolver.enter(resolver.document(), slide_div, first_child=True)
+
+    stack = _child_entries(slide_div, slide_style)
+    while stack:
+        tag, parent_style, first_child = stack.pop()
+        if tag.name in SKIPPED_TAGS:
             continue
-        
-        # 중복 제거 (부모-자식 관계)
-        if any(existing['text'] == text for existing in content['texts']):
+
+        # 이미지 추출
+        if tag.name == 'img':
+            src = tag.get('src', '')
+            if src:
+                content['images'].append({
+                    'src': src,
+                    'alt': tag.get('alt', '')
+                })
             continue
-        
-        # 클래스로 타입 추정
-        classes = tag.get('class', [])
-        text_type = 'body'
-        
-        if tag.name == 'h1' or 'h1' in classes:
-            text_type = 'heading'
-        elif tag.name == 'h2' or 'h2' in classes:
-            text_type = 'subheading'
-        elif tag.name == 'h3' or 'h3' in classes:
-            text_type = 'title'
-        elif 'label' in classes:
-            text_type = 'label'
-        elif 'caption' in classes:
-            text_type = 'caption'
-        
-        # 스타일 정보 추출
-        style = tag.get('style', '')
-        font_size = re.search(r'font-size:\s*(\d+)px', style)
-        color = re.search(r'color:\s*([^;]+)', style)
-        
-        content['texts'].append({
-            'text': text,
-            'type': text_type,
-            'fontSize': font_size.group(1) + 'px' if font_size else None,
-            'color': color.group(1).strip() if color else None
-        })
-    
-    # 이미지 추출
-    for img in slide_div.find_all('img'):
-        src = img.get('src', '')
-        alt = img.get('alt', '')
-        
-        if src:
-            content['images'].append({
-                'src': src,
-                'alt': alt
-            })
-    
+
+        # 텍스트 블록: 하위 텍스트를 한 번에 추출하고 내려가지 않음 (하위 이미지는 계속 수집)
+        style = resolver.enter(parent_style, tag, first_child)
+        if tag.has_direct_text():
+            text = tag.text()
+            if len(text) >= 2 and text not in seen_texts:  # 중복 제거
+                seen_texts.add(text)
+                content['texts'].append(_text_entry(tag, text, style))
+            stack.extend((img, style, False) for img in reversed(tag.images()))
+            continue
+
+        stack.extend(_child_entries(tag, style))
+
     # 레이아웃 추정
-    classes = slide_div.get('class', [])
+    classes = slide_div.classes
     if 'slide-dark' in classes:
-        if any('hero' in str(c).lower() for c in slide_div.find_all()):
+        if 'hero' in slide_div.inner_html().lower():
             content['layout'] = 'hero-cover'
         else:
             content['layout'] = 'content-text'
@@ -142,34 +190,38 @@ def extract_slide_content(slide_div):
     return content
 
 
-def html_to_json(html_path):
-    """HTML 파일을 JSON 구조로 변환"""
+def html_to_json(html_path, backend='auto'):
+    """HTML 파일을 JSON 구조로 변환 (backend: html_backends.BACKENDS 또는 'auto')"""
     
     html_path = Path(html_path)
     if not html_path.exists():
         raise FileNotFoundError(f"HTML 파일을 찾을 수 없습니다: {html_path}")
     
-    # HTML 파싱
-    with open(html_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f.read(), 'lxml')
-    
-    # 메타데이터
-    title = soup.find('title')
-    project_name = title.string if title else html_path.stem
-    
-    # Design Tokens 추출
-    design_tokens = extract_css_variables(soup)
-    
-    # 슬라이드 추출
+    project_name = html_path.stem
+    style_texts = []
+    resolver = None
     slides = []
-    slide_divs = soup.find_all('div', class_='slide')
     
-    for idx, slide_div in enumerate(slide_divs, 1):
-        slide_content = extract_slide_content(slide_div)
+    # HTML 파싱 - 슬라이드는 나오는 대로 처리 (stream 백엔드는 슬라이드 1장만 메모리에 유지)
+    for kind, value in iter_document(html_path, backend):
+        if kind == 'title':
+            project_name = value
+            continue
+        if kind == 'style':
+            style_texts.append(value)
+            continue
+        
+        slide_div = value
+        if resolver is None:
+            resolver = StyleResolver(style_texts)  # <style> 은 모두 <head> 에 있음
+            body_style = resolver.document()
+        idx = len(slides) + 1
+        slide_style = resolver.enter(body_style, slide_div, first_child=(idx == 1))
+        slide_content = extract_slide_content(slide_div, resolver, slide_style)
         
         # 슬라이드 제목 추출 (첫 번째 heading 또는 h2)
-        title_elem = slide_div.find(['h1', 'h2'])
-        slide_title = title_elem.get_text(strip=True) if title_elem else f"Slide {idx}"
+        title_elem = slide_div.find_first(('h1', 'h2'))
+        slide_title = title_elem.text() if title_elem else f"Slide {idx}"
         
         slides.append({
             'id': idx,
@@ -181,11 +233,16 @@ def html_to_json(html_path):
             }
         })
     
+    # Design Tokens 추출
+    if resolver is None:
+        resolver = StyleResolver(style_texts)
+    design_tokens = extract_css_variables(resolver.root_variables())
+    
     # JSON 구조 생성
     json_data = {
         'projectName': project_name,
         'version': '1.0',
-        'lastModified': '2025-01-01',  # 현재 날짜로 업데이트 가능
+        'lastModified': build_timestamp(html_path).strftime('%Y-%m-%d'),  # SOURCE_DATE_EPOCH 또는 HTML 수정 시각
         'designTokens': design_tokens,
         'slides': slides
     }
@@ -193,28 +250,220 @@ def html_to_json(html_path):
     return json_data
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python scripts/html_to_json.py projects/[project-name]/presentation.html")
+# ========================================
+# Merge (--merge)
+# ========================================
+
+def parse_declarations(style):
+    """인라인 스타일 문자열 → {CSS 속성: 값} (같은 속성은 뒤의 값, !important 제거)"""
+    return {prop: value for prop, value, _ in css_cascade.parse_declarations(style)}
+
+
+def _node_declarations(node, interned_styles):
+    """노드에 적용되는 선언 - 인터닝된 스타일 클래스(!important)가 인라인 스타일보다 우선"""
+    declarations = parse_declarations(node.get('style', ''))
+    for class_name in node.classes:
+        if class_name in interned_styles:
+            declarations.update(parse_declarations(interned_styles[class_name]))
+    return declarations
+
+
+def _rendered_declarations(rendered):
+    """렌더링된 element HTML의 루트 태그 style 속성 → {CSS 속성: 값}"""
+    m = _ROOT_STYLE_RE.match(rendered)
+    return parse_declarations(html.unescape(m.group(1))) if m else {}
+
+
+def _style_key(prop):
+    """CSS 속성 이름 → element style 키 (font-size → fontSize)"""
+    return _CSS_PROPERTY_RE.sub(lambda m: m.group(1).upper(), prop)
+
+
+def _collapse_spaces(text):
+    return ' '.join(text.split())
+
+
+def merge_element(el, node, rendered, interned_styles):
+    """HTML 노드의 수정 사항을 element dict에 반영하고 (바뀐 필드 목록, 반영하지 못한 필드 목록) 반환
+
+    rendered 는 같은 element를 현재 JSON으로 다시 렌더링한 HTML입니다.
+    스타일은 rendered 의 루트 style 과 비교하여 달라진 속성만 element style 에 씁니다
+    (템플릿이 고정으로 넣는 선언은 양쪽에 같이 있으므로 JSON에 옮겨지지 않음).
+    text 는 노드에 하위 태그가 없을 때만 옮깁니다. 태그를 추가했거나 하위 태그가 있는 노드의 텍스트가
+    달라졌으면 'text' 를 반영하지 못한 필드로 돌려줍니다.
+    """
+    from generate_html import SKIPPED_STYLE_PROPERTIES, css_property_name
+
+    changed = []
+    skipped = []
+    if node.name == 'img':
+        for field in ('src', 'alt'):
+            value = node.get(field, '')
+            if field == 'src' and value.startswith(LOCALIZED_SRC_PREFIXES):
+                continue
+            if value != el.get(field, ''):
+                el[field] = value
+                changed.append(field)
+    elif isinstance(el.get('text'), str):
+        text = node.raw_text()
+        if not node.child_elements():
+            if text != el['text']:
+                el['text'] = text
+                changed.append('text')
+        elif (not _ROOT_HAS_CHILD_RE.match(rendered)
+              or _collapse_spaces(text) != _collapse_spaces(el['text'])):
+            skipped.append('text')
+
+    before = _rendered_declarations(rendered)
+    after = _node_declarations(node, interned_styles)
+    if after != before:
+        original = el.get('style') or {}
+        style = dict(original)
+        keys = {css_property_name(key): key for key in style}
+        for prop in sorted(after.keys() | before.keys()):
+            value = after.get(prop)
+            if prop in SKIPPED_STYLE_PROPERTIES or value == before.get(prop):
+                continue
+            key = keys.get(prop, _style_key(prop))
+            if value is not None:
+                style[key] = value
+            else:
+                style.pop(key, None)  # 템플릿 고정 선언을 지운 경우는 JSON으로 표현할 수 없음
+        if style != original:
+            el['style'] = style
+            changed.append('style')
+    return changed, skipped
+
+
+def _find_element(slides, el_id):
+    """data-el-id → (element, 슬라이드 템플릿 이름) - 없으면 (None, None)"""
+    from generate_html import slide_template_name
+
+    slide_number, _, index = el_id.partition('.')
+    try:
+        slide = slides.get(int(slide_number))
+        index = int(index)
+    except ValueError:
+        return None, None
+    elements = slide.get('elements', []) if slide else []
+    if not 0 <= index < len(elements) or not isinstance(elements[index], dict):
+        return None, None
+    return elements[index], slide_template_name(slide)
+
+
+def merge_html_into_json(html_path, json_path=None, backend='auto'):
+    """HTML 수정 사항을 기존 presentation.json 에 병합 (파일은 쓰지 않음)
+
+    Returns:
+        (병합된 JSON dict, {'matched': 찾은 element 수, 'changes': [(data-el-id, 필드)], 'unmatched': [data-el-id],
+                            'skipped': [(data-el-id, 필드)] - HTML에서 바뀌었지만 JSON으로 표현할 수 없어 버린 수정})
+    """
+    import generate_html  # 비교용 렌더링 - 템플릿은 병합할 때만 로드
+
+    html_path = Path(html_path)
+    json_path = Path(json_path) if json_path else html_path.parent / 'presentation.json'
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    renderers = generate_html.load_project_renderers(str(html_path.parent))
+
+    slides = {get_slide_number(slide, i): slide for i, slide in enumerate(data.get('slides', []), 1)}
+    colors = data.get('designTokens', {}).get('colors', {})
+    primary_color = generate_html.extract_color_value(colors.get('primary', '#FF6B35'))
+    secondary_color = generate_html.extract_color_value(colors.get('secondary', '#FFB800'))
+
+    report = {'matched': 0, 'changes': [], 'unmatched': [], 'skipped': []}
+    style_texts = []
+    interned_styles = None
+    for kind, value in iter_document(html_path, backend):
+        if kind == 'style':
+            style_texts.append(value)
+            continue
+        if kind != 'slide':
+            continue
+        if interned_styles is None:
+            interned_styles = extract_interned_styles(style_texts)
+        for node in value.with_attribute(ELEMENT_ID_ATTR):
+            el_id = node.get(ELEMENT_ID_ATTR)
+            el, template = _find_element(slides, el_id)
+            if el is None:
+                report['unmatched'].append(el_id)
+                continue
+            report['matched'] += 1
+            rendered = generate_html.render_element(generate_html.prepare_element(el, template),
+                                                    primary_color, secondary_color, renderers=renderers)
+            changed, skipped = merge_element(el, node, rendered, interned_styles)
+            report['changes'].extend((el_id, field) for field in changed)
+            report['skipped'].extend((el_id, field) for field in skipped)
+    return data, report
+
+
+def save_json(json_path, json_data):
+    """presentation.json 저장 (임시 파일 → 교체, 중간에 실패해도 기존 파일 유지)
+
+    기존 파일이 있으면 바뀐 값의 텍스트만 교체하여 원래 서식(들여쓰기, 한 줄 배열)을 유지합니다 (json_patch.py).
+    """
+    json_path = Path(json_path)
+    try:
+        text = json_path.read_text(encoding='utf-8')
+    except OSError:
+        text = None
+    write_atomic(json_path, dumps_like(text, json_data).encode('utf-8'))
+
+
+def merge_main(html_path, backend):
+    json_path = html_path.parent / 'presentation.json'
+    if not json_path.exists():
+        print(f"❌ 오류: 병합할 JSON 파일이 없습니다: {json_path}")
         sys.exit(1)
+
+    print(f"🔍 HTML 수정 사항 병합 중: {html_path} → {json_path}")
+    json_data, report = merge_html_into_json(html_path, json_path, backend)
+    if not report['matched']:
+        print(f"⚠️  {ELEMENT_ID_ATTR} 가 있는 element가 없습니다 - generate_html.py 로 HTML을 다시 생성하세요")
+    if report['unmatched']:
+        print(f"⚠️  JSON에서 찾지 못한 element {len(report['unmatched'])}개: {', '.join(report['unmatched'][:10])}")
+    if report['skipped']:
+        print(f"⚠️  하위 태그가 있어 병합하지 못한 수정 {len(report['skipped'])}개 (태그 없이 텍스트만 수정하세요):")
+        for el_id, field in report['skipped']:
+            print(f"   - {el_id}: {field}")
+    if not report['changes']:
+        print("✅ 변경 사항 없음 - presentation.json 유지")
+        return
+
+    save_json(json_path, json_data)
+    print(f"✅ 병합 완료: {json_path} ({len(report['changes'])}개 필드 수정)")
+    for el_id, field in report['changes']:
+        print(f"   - {el_id}: {field}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="presentation.html → presentation.json")
+    parser.add_argument("html_file", help="presentation.html 경로")
+    parser.add_argument("--backend", default="auto", choices=("auto",) + BACKENDS,
+                        help="HTML 파서 (기본: auto - stream → lxml → bs4 순으로 사용 가능한 것)")
+    parser.add_argument("--merge", action="store_true",
+                        help="기존 presentation.json 에 바뀐 필드만 병합 (data-el-id 기준)")
+    args = parser.parse_args()
     
-    html_path = Path(sys.argv[1])
+    html_path = Path(args.html_file)
     
     if not html_path.exists():
         print(f"❌ 오류: HTML 파일을 찾을 수 없습니다: {html_path}")
         sys.exit(1)
     
+    if args.merge:
+        merge_main(html_path, args.backend)
+        return
+    
     print(f"🔍 HTML 파일 파싱 중: {html_path}")
     
     try:
         # HTML → JSON 변환
-        json_data = html_to_json(html_path)
+        json_data = html_to_json(html_path, args.backend)
         
         # JSON 파일 저장 (같은 디렉토리에 presentation.json)
         json_path = html_path.parent / 'presentation.json'
-        
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, ensure_ascii=False, indent=2)
+        save_json(json_path, json_data)
         
         print(f"✅ 변환 완료: {json_path}")
         print(f"📊 총 {len(json_data['slides'])}개 슬라이드 추출됨")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+공유 이미지 캐시
+
+json_to_pptx.py / generate_html.py 가 공통으로 사용하는 디스크 캐시입니다.
+원격 이미지는 URL 해시 기준으로 한 번만 다운로드하고, 합성(compositor.py) 등
+파생 이미지도 같은 캐시 폴더에 콘텐츠 키로 저장하여 재빌드 시 재사용합니다.
+
+캐시 위치: <repo>/.cache (환경변수 HARU_CACHE_DIR 로 변경 가능)
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+
+CACHE_DIR = Path(os.environ.get("HARU_CACHE_DIR", Path(__file__).parent.parent / ".cache"))
+
+
+def cache_key(*parts) -> str:
+    """여러 값을 묶어 캐시 키(SHA-256 hex) 생성"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def cache_path(namespace: str, key: str, ext: str = "") -> Path:
+    """캐시 파일 경로 (<CACHE_DIR>/<namespace>/<key[:2]>/<key><ext>)"""
+    return CACHE_DIR / namespace / key[:2] / f"{key}{ext}"
+
+
+def file_sha256(path) -> str:
+    """파일 내용 SHA-256 (1MB 단위로 읽음) - 입력 파일 내용 기준 캐시 키용"""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_atomic(path: Path, data):
+    """임시 파일에 쓴 뒤 교체 (동시 빌드 중에도 깨진 파일이 보이지 않도록)
+
+    data 는 bytes 또는 bytes 조각의 iterable (큰 출력을 메모리에 모으지 않고 쓸 때)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                f.writelines(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def resolve_source(url: str, base_dir=None) -> str:
+    """이미지 src → http(s) URL은 그대로, 상대 경로는 base_dir(프로젝트 폴더) 기준 절대 경로"""
+    if not url or url.startswith(("http://", "https://")) or base_dir is None:
+        return url
+    return os.path.abspath(os.path.join(base_dir, url))
+
+
+def fetch_image(url: str, base_dir=None, timeout: float = 5) -> bytes | None:
+    """이미지 바이트 가져오기 (캐시 → 다운로드, 재시도 포함)
+
+    http(s) URL이 아니면 로컬 파일 경로로 취급하며, 상대 경로는 base_dir(presentation.json 이 있는
+    프로젝트 폴더) 기준입니다 (base_dir 가 없으면 현재 작업 폴더).
+    """
+    if not url:
+        return None
+    if not url.startswith(("http://", "https://")):
+        local = Path(resolve_source(url, base_dir))
+        return local.read_bytes() if local.is_file() else None
+
+    path = cache_path("images", cache_key(url), ".bin")
+    if path.exists():
+        return path.read_bytes()
+
+    import requests  # 원격 이미지를 받을 때만 필요 (옵션 의존성)
+
+    for attempt in range(2):  # 최대 2회 시도
+        try:
+            response = requests.get(url, timeout=timeout)
+            if response.status_code == 200:
+                write_atomic(path, response.content)
+                return response.content
+        except Exception as e:
+            if attempt == 0:
+                continue  # 첫 실패 시 재시도
+            print(f"  [WARN] 이미지 다운로드 실패 ({attempt+1}회): {url} - {e}")
+    return None
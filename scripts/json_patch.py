@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+원본 서식을 유지하는 JSON 저장
+
+presentation.json 은 사람이 직접 편집하는 파일이라 한 줄 배열, 들여쓰기 등 서식이 제각각입니다.
+json.dumps(indent=2)로 다시 쓰면 필드 두 개만 바꿔도 파일 전체가 diff에 나오므로,
+기존 파일 텍스트와 새 데이터를 비교해 값이 달라진 위치의 텍스트만 교체합니다.
+
+- 값이 바뀐 필드: 원본 값 범위만 교체 (한 줄이던 배열/객체는 한 줄로, 여러 줄이던 것은 같은 들여쓰기로)
+- 새 키: 객체의 마지막 멤버 뒤에 같은 들여쓰기로 추가
+- 지운 키: 해당 멤버와 구분자만 삭제
+- 길이가 달라진 배열: 배열 전체 교체
+
+교체 결과를 다시 파싱해 새 데이터와 다르면(중복 키 등 예상하지 못한 원본) 파일의 들여쓰기 단위로 전체를 다시 씁니다.
+"""
+
+import json
+import re
+from json.decoder import WHITESPACE, scanstring
+
+
+_DECODER = json.JSONDecoder()
+_INDENT_RE = re.compile(r'^([ \t]+)\S', re.MULTILINE)
+
+DEFAULT_INDENT = 2
+
+
+def detect_indent(text):
+    """파일에서 가장 얕은 들여쓰기 (탭이면 '\\t', 없으면 DEFAULT_INDENT)"""
+    indents = [m.group(1) for m in _INDENT_RE.finditer(text)]
+    if not indents:
+        return DEFAULT_INDENT
+    indent = min(indents, key=len)
+    return '\t' if indent.startswith('\t') else len(indent)
+
+
+def _skip(text, idx):
+    return WHITESPACE.match(text, idx).end()
+
+
+def _value_end(text, idx):
+    return _DECODER.raw_decode(text, idx)[1]
+
+
+def _members(text, start):
+    """text[start] 의 객체 → [(키, 키 시작, 값 시작, 값 끝)]"""
+    members = []
+    idx = _skip(text, start + 1)
+    if text[idx] == '}':
+        return members
+    while True:
+        key_start = idx
+        key, idx = scanstring(text, idx + 1)
+        idx = _skip(text, _skip(text, idx) + 1)  # ':'
+        value_end = _value_end(text, idx)
+        members.append((key, key_start, idx, value_end))
+        idx = _skip(text, value_end)
+        if text[idx] == '}':
+            return members
+        idx = _skip(text, idx + 1)  # ','
+
+
+def _items(text, start):
+    """text[start] 의 배열 → [(값 시작, 값 끝)]"""
+    items = []
+    idx = _skip(text, start + 1)
+    if text[idx] == ']':
+        return items
+    while True:
+        value_end = _value_end(text, idx)
+        items.append((idx, value_end))
+        idx = _skip(text, value_end)
+        if text[idx] == ']':
+            return items
+        idx = _skip(text, idx + 1)
+
+
+def _line_indent(text, idx):
+    line_start = text.rfind('\n', 0, idx) + 1
+    return text[line_start:_skip(text, line_start)] if line_start < idx else ''
+
+
+def _format(value, indent, line_indent, inline):
+    """새 값의 텍스트 - inline 이면 한 줄, 아니면 line_indent 기준 여러 줄"""
+    if inline or not isinstance(value, (dict, list)) or not value:
+        return json.dumps(value, ensure_ascii=False, separators=(', ', ': '))
+    return json.dumps(value, ensure_ascii=False, indent=indent).replace('\n', '\n' + line_indent)
+
+
+def _same(a, b):
+    return type(a) is type(b) and a == b
+
+
+def _diff(text, start, end, old, new, indent, edits):
+    """text[start:end] (= old) 를 new 로 바꾸는 최소 교체 목록을 edits 에 추가"""
+    if isinstance(old, dict) and isinstance(new, dict) and old and any(key in new for key in old):
+        _diff_object(text, start, old, new, indent, edits)
+    elif isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        for (item_start, item_end), old_item, new_item in zip(_items(text, start), old, new):
+            _diff(text, item_start, item_end, old_item, new_item, indent, edits)
+    elif not _same(old, new):
+        inline = isinstance(old, (dict, list)) and '\n' not in text[start:end]
+        edits.append((start, end, _format(new, indent, _line_indent(text, start), inline)))
+
+
+def _diff_object(text, start, old, new, indent, edits):
+    members = _members(text, start)
+    kept = [i for i, (key, *_) in enumerate(members) if key in new]
+    first_kept = kept[0]
+    if first_kept:  # 앞쪽 멤버 삭제 - 첫 남는 키 앞까지
+        edits.append((members[0][1], members[first_kept][1], ''))
+    for i, (key, key_start, value_start, value_end) in enumerate(members):
+        if key not in new:
+            if i > first_kept:  # 앞 멤버의 값 끝부터 (', "key": value')
+                edits.append((members[i - 1][3], value_end, ''))
+            continue
+        _diff(text, value_start, value_end, old[key], new[key], indent, edits)
+
+    added = [key for key in new if key not in old]
+    if not added:
+        return
+    multiline = '\n' in text[start:members[0][1]]
+    member_indent = _line_indent(text, members[0][1]) if multiline else ''
+    separator = ',\n' + member_indent if multiline else ', '
+    inserted = ''.join(f"{separator}{json.dumps(key, ensure_ascii=False)}: "
+                       f"{_format(new[key], indent, member_indent, not multiline)}" for key in added)
+    edits.append((members[-1][3], members[-1][3], inserted))
+
+
+def patch_json_text(text, data):
+    """기존 JSON 텍스트에서 data 와 다른 값만 교체한 텍스트 (원본이 JSON이 아니면 ValueError)"""
+    start = _skip(text, 0)
+    old, end = _DECODER.raw_decode(text, start)
+    edits = []
+    _diff(text, start, end, old, data, detect_indent(text), edits)
+    for edit_start, edit_end, replacement in sorted(edits, reverse=True):
+        text = text[:edit_start] + replacement + text[edit_end:]
+    return text
+
+
+def dumps_like(text, data):
+    """text(기존 파일 내용, 없으면 None)의 서식을 최대한 유지한 data 의 JSON 텍스트"""
+    if text is not None:
+        try:
+            patched = patch_json_text(text, data)
+            if json.loads(patched) == data:
+                return patched
+        except ValueError:
+            pass
+    indent = detect_indent(text) if text else DEFAULT_INDENT
+    return json.dumps(data, ensure_ascii=False, indent=indent) + '\n'
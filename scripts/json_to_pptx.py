@@ -14,22 +14,29 @@ presentation.json 데이터를 기반으로 실제 텍스트/도형을 포함한
 | LINE_SPACING_SCALE | 0.83 (-17%) | 줄간격 조정 비율 (기준 1.2 대비) |
 | PARAGRAPH_SPACING_SCALE | 0.0 | 문단 간격 조정 비율 (기준 폰트 대비) |
 | IMAGE_CORNER_RATIO | 0.05 (5%) | 이미지 라운딩 비율 |
+| COMPOSITE_OVERLAYS | False | 이미지+오버레이 카드를 한 장의 합성 이미지로 생성 (--composite) |
 
 ## 사용법
 
-    python json_to_pptx.py <presentation.json> [output.pptx]
+    python json_to_pptx.py <presentation.json> [output.pptx] [--slides 3-5,9] [--template section-divider]
+                           [--composite] [--optimize] [--reproducible]
 
 ## 예시
 
     python json_to_pptx.py projects/eumlogistic/presentation.json
     python json_to_pptx.py projects/eumlogistic/presentation.json output.pptx
+
+    # 부분 빌드 (미리보기): 선택한 슬라이드만 생성 → presentation_preview.pptx
+    python json_to_pptx.py projects/eumlogistic/presentation.json --slides 3-5,9
+    python json_to_pptx.py projects/eumlogistic/presentation.json --template section-divider
 """
 
+import argparse
+import contextvars
 import json
 import sys
 import os
 import re
-import requests
 import shutil
 from io import BytesIO
 from pathlib import Path
@@ -42,6 +49,14 @@ from pptx.enum.shapes import MSO_SHAPE
 
 from PIL import Image, ImageDraw, ImageFont
 
+from slide_selection import select_slides, is_partial
+from image_cache import fetch_image
+from optimize_pptx import ZIP_COMPRESS_LEVEL, optimize_pptx
+from reproducible import DEFAULT_COMPRESS_LEVEL, normalize_pptx, record_artifact
+from build_events import (BuildCancelled, CancelToken, ProgressReporter,
+                          current_reporter, iter_events, reporting)
+import compositor
+
 
 # ========================================
 # 📐 조정 가능한 설정 (% 기반)
@@ -62,8 +77,16 @@ LINE_SPACING_SCALE = 0.83  # 1.2 * 0.83 ≈ 1.0
 PARAGRAPH_SPACING_SCALE = 0.0
 
 # [이미지 라운딩] 이미지 최소변 대비 비율. 0.05 = 5%
+#                라운드 이미지 마스크, 합성 오버레이 카드, 오버레이 사각형 모두 이 값을 사용
 IMAGE_CORNER_RATIO = 0.05
 
+# [오버레이 합성] True = 이미지 + 반투명 오버레이를 합성 이미지 1장으로 생성 (NumPy 필요)
+#                False = 이미지 + 알파 사각형 2개 도형으로 생성
+COMPOSITE_OVERLAYS = False
+
+# 빌드 중인 프로젝트 폴더 (presentation.json 위치) - 로컬 이미지 상대 경로의 기준, convert_json_to_pptx 에서 설정
+_project_dir = contextvars.ContextVar("haru_pptx_project_dir", default=None)
+
 # ========================================
 # 디자인 토큰 (presentation.json에서 추출)
 # ========================================
@@ -158,17 +181,22 @@ def hex_to_rgb(hex_color: str) -> RGBColor:
 
 
 def download_image(url: str) -> BytesIO | None:
-    """URL에서 이미지 다운로드 (재시도 포함)"""
-    for attempt in range(2):  # 최대 2회 시도
-        try:
-            response = requests.get(url, timeout=5)  # 타임아웃 5초로 단축
-            if response.status_code == 200:
-                return BytesIO(response.content)
-        except Exception as e:
-            if attempt == 0:
-                continue  # 첫 실패 시 재시도
-            print(f"  [WARN] 이미지 다운로드 실패 ({attempt+1}회): {url} - {e}")
-    return None
+    """URL에서 이미지 다운로드 (공유 캐시 사용, 재시도 포함)
+
+    빌드가 취소된 경우 다운로드하지 않고 None을 반환합니다.
+    """
+    reporter = current_reporter()
+    if reporter.cancelled:
+        return None
+    reporter.emit("image_queued", url=url)
+    data = fetch_image(url, _project_dir.get())
+    reporter.emit("image_done", url=url, ok=data is not None, bytes=len(data) if data else 0)
+    return BytesIO(data) if data else None
+
+
+def corner_radius_px(width_px, height_px):
+    """IMAGE_CORNER_RATIO 기준 라운드 반경 (px) - 비트맵 마스크/합성 이미지 공통"""
+    return int(min(width_px, height_px) * IMAGE_CORNER_RATIO)
 
 
 def add_rounded_image(slide, image_url, left, top, width, height, radius=None):
@@ -192,7 +220,7 @@ def add_rounded_image(slide, image_url, left, top, width, height, radius=None):
         # 라운드 마스크 생성 - IMAGE_CORNER_RATIO 비율 적용
         mask = Image.new("L", (target_width, target_height), 0)
         draw = ImageDraw.Draw(mask)
-        radius_px = int(min(target_width, target_height) * IMAGE_CORNER_RATIO)
+        radius_px = corner_radius_px(target_width, target_height)
         draw.rounded_rectangle([(0, 0), (target_width, target_height)], radius=radius_px, fill=255)
         
         # 투명 배경 생성
@@ -290,6 +318,48 @@ def add_rectangle(slide, left, top, width, height, fill_color=None, line_color=N
     return shape
 
 
+def set_fill_alpha(shape, alpha):
+    """도형 단색 채우기에 투명도 적용 (alpha: 0.0~1.0 불투명도)"""
+    from pptx.oxml.ns import qn
+    from lxml import etree
+    solidFill = shape._sp.spPr.find(qn('a:solidFill'))
+    if solidFill is not None:
+        srgbClr = solidFill.find(qn('a:srgbClr'))
+        if srgbClr is not None:
+            alpha_el = etree.SubElement(srgbClr, qn('a:alpha'))
+            alpha_el.set('val', str(int(alpha * 100000)))
+
+
+def add_overlay_card(slide, image_url, left, top, width, height, overlay_color,
+                     overlay_alpha=0.75):
+    """이미지 + 반투명 오버레이 카드 추가
+
+    COMPOSITE_OVERLAYS가 켜져 있으면 합성된 이미지 1장으로, 아니면(또는 합성 실패 시)
+    라운드 이미지 + 알파 사각형 2개 도형으로 추가합니다.
+    코너는 어느 경우든 IMAGE_CORNER_RATIO 로 같은 모양입니다.
+    """
+    if COMPOSITE_OVERLAYS:
+        target_width = int(width / Inches(1) * 96)  # 96 DPI
+        target_height = int(height / Inches(1) * 96)
+        path = compositor.composite_overlay(image_url, (target_width, target_height), overlay_color,
+                                            overlay_alpha,
+                                            corner_radius=corner_radius_px(target_width, target_height),
+                                            base_dir=_project_dir.get())
+        if path:
+            return slide.shapes.add_picture(str(path), left, top, width, height)
+    
+    try:
+        add_rounded_image(slide, image_url, left, top, width, height)
+    except Exception as e:
+        print(f"  [WARN] 카드 이미지 실패: {e}")
+    
+    # 둥근 사각형 조정값(adjustments[0])도 최소변 대비 비율 → 이미지 마스크와 같은 반경
+    overlay = add_rectangle(slide, left, top, width, height,
+                            fill_color=overlay_color, radius=IMAGE_CORNER_RATIO * 100)
+    set_fill_alpha(overlay, overlay_alpha)
+    return overlay
+
+
 def set_slide_background(slide, color):
     """슬라이드 배경색 설정"""
     background = slide.background
@@ -671,27 +741,9 @@ def create_slide_5_services(prs, slide_data, design_tokens):
     
     # ===== Bento Grid 레이아웃 =====
     
-    # 대형 카드: 해상 포워딩 (좌측, 세로로 길게)
-    try:
-        add_rounded_image(slide, "https://images.unsplash.com/photo-1494412574643-ff11b0a5c1c3?w=400&h=500&fit=crop",
-                         Inches(0.8), Inches(1.7), Inches(4.2), Inches(5.4), radius=16)
-    except Exception as e:
-        print(f"  [WARN] 해상 이미지 실패: {e}")
-    
-    # 오버레이 (반투명 primary)
-    overlay = add_rectangle(slide, Inches(0.8), Inches(1.7), Inches(4.2), Inches(5.4),
-                            fill_color=COLORS["primary"], radius=16)
-    overlay.fill.solid()
-    overlay.fill.fore_color.rgb = hex_to_rgb(COLORS["primary"])
-    from pptx.oxml.ns import qn
-    spPr = overlay._sp.spPr
-    solidFill = spPr.find(qn('a:solidFill'))
-    if solidFill is not None:
-        srgbClr = solidFill.find(qn('a:srgbClr'))
-        if srgbClr is not None:
-            from lxml import etree
-            alpha = etree.SubElement(srgbClr, qn('a:alpha'))
-            alpha.set('val', '75000')  # 75% 불투명
+    # 대형 카드: 해상 포워딩 (좌측, 세로로 길게) - 반투명 primary 오버레이
+    add_overlay_card(slide, "https://images.unsplash.com/photo-1494412574643-ff11b0a5c1c3?w=400&h=500&fit=crop",
+                     Inches(0.8), Inches(1.7), Inches(4.2), Inches(5.4), COLORS["primary"])
     
     add_text_box(slide, Inches(1.0), Inches(5.4), Inches(3.8), Inches(0.5),
                  "🚢", font_size=32)
@@ -703,23 +755,8 @@ def create_slide_5_services(prs, slide_data, design_tokens):
                  "FCL/LCL 수출입, 정기선 서비스", font_size=11, font_color="FFFFFF")
     
     # 중형 카드 1: 항공 포워딩 (우측 상단 좌)
-    try:
-        add_rounded_image(slide, "https://images.unsplash.com/photo-1436491865332-7a61a109cc05?w=400&h=300&fit=crop",
-                         Inches(5.2), Inches(1.7), Inches(3.8), Inches(2.5), radius=16)
-    except Exception as e:
-        print(f"  [WARN] 항공 이미지 실패: {e}")
-    
-    overlay2 = add_rectangle(slide, Inches(5.2), Inches(1.7), Inches(3.8), Inches(2.5),
-                             fill_color=COLORS["accent"], radius=16)
-    overlay2.fill.solid()
-    overlay2.fill.fore_color.rgb = hex_to_rgb(COLORS["accent"])
-    spPr2 = overlay2._sp.spPr
-    solidFill2 = spPr2.find(qn('a:solidFill'))
-    if solidFill2 is not None:
-        srgbClr2 = solidFill2.find(qn('a:srgbClr'))
-        if srgbClr2 is not None:
-            alpha2 = etree.SubElement(srgbClr2, qn('a:alpha'))
-            alpha2.set('val', '75000')
+    add_overlay_card(slide, "https://images.unsplash.com/photo-1436491865332-7a61a109cc05?w=400&h=300&fit=crop",
+                     Inches(5.2), Inches(1.7), Inches(3.8), Inches(2.5), COLORS["accent"])
     
     add_text_box(slide, Inches(5.4), Inches(2.9), Inches(3.4), Inches(0.4),
                  "✈️", font_size=28)
@@ -729,23 +766,8 @@ def create_slide_5_services(prs, slide_data, design_tokens):
                  "Air Freight Forwarding", font_size=11, font_color="FFFFFF")
     
     # 중형 카드 2: 내륙 운송 (우측 상단 우)
-    try:
-        add_rounded_image(slide, "https://images.unsplash.com/photo-1519003722824-194d4455a60c?w=400&h=300&fit=crop",
-                         Inches(9.2), Inches(1.7), Inches(3.8), Inches(2.5), radius=16)
-    except Exception as e:
-        print(f"  [WARN] 내륙 이미지 실패: {e}")
-    
-    overlay3 = add_rectangle(slide, Inches(9.2), Inches(1.7), Inches(3.8), Inches(2.5),
-                             fill_color=COLORS["success"], radius=16)
-    overlay3.fill.solid()
-    overlay3.fill.fore_color.rgb = hex_to_rgb(COLORS["success"])
-    spPr3 = overlay3._sp.spPr
-    solidFill3 = spPr3.find(qn('a:solidFill'))
-    if solidFill3 is not None:
-        srgbClr3 = solidFill3.find(qn('a:srgbClr'))
-        if srgbClr3 is not None:
-            alpha3 = etree.SubElement(srgbClr3, qn('a:alpha'))
-            alpha3.set('val', '75000')
+    add_overlay_card(slide, "https://images.unsplash.com/photo-1519003722824-194d4455a60c?w=400&h=300&fit=crop",
+                     Inches(9.2), Inches(1.7), Inches(3.8), Inches(2.5), COLORS["success"])
     
     add_text_box(slide, Inches(9.4), Inches(2.9), Inches(3.4), Inches(0.4),
                  "🚛", font_size=28)
@@ -755,23 +777,8 @@ def create_slide_5_services(prs, slide_data, design_tokens):
                  "Inland Transportation", font_size=11, font_color="FFFFFF")
     
     # 중형 카드 3: 프로젝트 카고 (우측 하단, 가로로 길게)
-    try:
-        add_rounded_image(slide, "https://images.unsplash.com/photo-1504307651254-35680f356dfd?w=400&h=300&fit=crop",
-                         Inches(5.2), Inches(4.4), Inches(7.8), Inches(2.7), radius=16)
-    except Exception as e:
-        print(f"  [WARN] 프로젝트 이미지 실패: {e}")
-    
-    overlay4 = add_rectangle(slide, Inches(5.2), Inches(4.4), Inches(7.8), Inches(2.7),
-                             fill_color=COLORS["highlight"], radius=16)
-    overlay4.fill.solid()
-    overlay4.fill.fore_color.rgb = hex_to_rgb(COLORS["highlight"])
-    spPr4 = overlay4._sp.spPr
-    solidFill4 = spPr4.find(qn('a:solidFill'))
-    if solidFill4 is not None:
-        srgbClr4 = solidFill4.find(qn('a:srgbClr'))
-        if srgbClr4 is not None:
-            alpha4 = etree.SubElement(srgbClr4, qn('a:alpha'))
-            alpha4.set('val', '75000')
+    add_overlay_card(slide, "https://images.unsplash.com/photo-1504307651254-35680f356dfd?w=400&h=300&fit=crop",
+                     Inches(5.2), Inches(4.4), Inches(7.8), Inches(2.7), COLORS["highlight"])
     
     add_text_box(slide, Inches(5.4), Inches(5.7), Inches(7.4), Inches(0.4),
                  "📦", font_size=28)
@@ -1062,8 +1069,38 @@ def create_slide_11_closing(prs, slide_data, design_tokens):
 
 # ===== 메인 함수 =====
 
-def convert_json_to_pptx(json_path: str, output_path: str = None):
-    """JSON 파일을 편집 가능한 PPTX로 변환"""
+def convert_json_to_pptx(json_path: str, output_path: str = None,
+                         slides: str = None, template: str = None, optimize: bool = False,
+                         reproducible: bool = False, on_event=None, cancel_token: CancelToken = None):
+    """JSON 파일을 편집 가능한 PPTX로 변환
+
+    Args:
+        slides: 부분 빌드할 슬라이드 번호/범위 (예: "3-5,9")
+        template: 부분 빌드할 템플릿 이름 (예: "section-divider")
+        optimize: 저장 후 optimize_pptx 최적화 실행 (JPEG 재인코딩, 미사용 파트 제거 등)
+        reproducible: ZIP 타임스탬프/순서를 고정하고 build_manifest.json에 다이제스트 기록
+        on_event: 진행 이벤트 콜백 (build_events.py 참조)
+        cancel_token: 협조적 취소 토큰 - 슬라이드/이미지 단위로 확인하며, 취소되면 저장하지 않고 False 반환
+    """
+    with reporting(ProgressReporter(on_event, cancel_token)):
+        token = _project_dir.set(Path(json_path).parent)
+        try:
+            return _convert_json_to_pptx(json_path, output_path, slides, template, optimize, reproducible)
+        finally:
+            _project_dir.reset(token)
+
+
+def iter_convert_json_to_pptx(json_path: str, output_path: str = None, cancel_token: CancelToken = None,
+                              **kwargs):
+    """convert_json_to_pptx를 백그라운드 스레드에서 실행하며 진행 이벤트를 yield
+
+    이터레이터를 닫으면(break) 빌드가 취소됩니다.
+    """
+    return iter_events(convert_json_to_pptx, json_path, output_path, cancel_token=cancel_token, **kwargs)
+
+
+def _convert_json_to_pptx(json_path, output_path, slides, template, optimize, reproducible):
+    reporter = current_reporter()
     
     # 경로 처리
     json_path = Path(json_path)
@@ -1071,8 +1108,10 @@ def convert_json_to_pptx(json_path: str, output_path: str = None):
         print(f"[ERROR] JSON 파일을 찾을 수 없습니다: {json_path}")
         return False
     
+    partial = is_partial(slides, template)
     if output_path is None:
-        output_path = json_path.parent / (json_path.stem + "_editable.pptx")
+        suffix = "_preview.pptx" if partial else "_editable.pptx"
+        output_path = json_path.parent / (json_path.stem + suffix)
     else:
         output_path = Path(output_path)
     
@@ -1088,6 +1127,20 @@ def convert_json_to_pptx(json_path: str, output_path: str = None):
     
     print(f"[Found] {len(slides_data)} slides")
     
+    # 부분 빌드: 선택된 슬라이드만 생성 (이미지도 선택된 슬라이드 것만 다운로드)
+    if partial:
+        try:
+            selected = select_slides(slides_data, slides, template)
+        except ValueError as e:
+            print(f"[ERROR] {e}")
+            return False
+        slides_data = [slide_data for _, slide_data in selected]
+        print(f"[Preview] {len(slides_data)} slides selected "
+              f"(slides={slides or '*'}, template={template or '*'})")
+        if not slides_data:
+            print("[ERROR] 조건에 맞는 슬라이드가 없습니다.")
+            return False
+    
     # 프레젠테이션 생성
     prs = Presentation()
     prs.slide_width = SLIDE_WIDTH
@@ -1110,11 +1163,23 @@ def convert_json_to_pptx(json_path: str, output_path: str = None):
     
     # 각 슬라이드 생성
     print("\n[Creating slides...]")
+    reporter.emit("build_started", total_slides=len(slides_data), output=str(output_path))
     slides_created = 0
-    for slide_data in slides_data:
+    for index, slide_data in enumerate(slides_data):
         slide_num = slide_data.get("slideNumber", 0)
         creator = slide_creators.get(slide_num)
         
+        try:
+            reporter.check()
+        except BuildCancelled:
+            print(f"\n[CANCELLED] Slide {slide_num} 이전에 빌드가 취소되었습니다.")
+            reporter.emit("build_cancelled", slide=slide_num)
+            return False
+        
+        reporter.emit("slide_started", slide=slide_num, index=index, total=len(slides_data),
+                      title=slide_data.get('title', ''))
+        created_before = slides_created
+        
         if creator:
             try:
                 print(f"  [Slide {slide_num}] {slide_data.get('title', '')}")
@@ -1132,27 +1197,61 @@ def convert_json_to_pptx(json_path: str, output_path: str = None):
                 slides_created += 1
             except Exception as e:
                 print(f"  [ERROR] Slide {slide_num} 범용 생성 실패: {e}")
+        
+        reporter.emit("slide_finished", slide=slide_num, index=index, total=len(slides_data),
+                      title=slide_data.get('title', ''), ok=slides_created > created_before)
+    
+    if reporter.cancelled:
+        print("\n[CANCELLED] 저장 전에 빌드가 취소되었습니다.")
+        reporter.emit("build_cancelled", slide=None)
+        return False
     
     # 저장
     prs.save(str(output_path))
     print(f"\n[OK] 편집 가능한 PPTX 생성 완료: {output_path}")
     print(f"     Total {len(prs.slides)} slides")
     
-    # 사용된 폰트를 프로젝트 폴더에 복사
-    project_dir = json_path.parent
-    copy_fonts_to_project(project_dir)
+    if optimize:
+        optimize_pptx(output_path)
+    
+    if reproducible:
+        # 최적화한 파일은 같은 압축 레벨로 다시 저장 (기본 레벨로 풀면 최적화 효과가 줄어듦)
+        normalize_pptx(output_path, ZIP_COMPRESS_LEVEL if optimize else DEFAULT_COMPRESS_LEVEL)
+        digest, changed = record_artifact(output_path)
+        print(f"[Reproducible] sha256={digest[:16]}… ({'changed' if changed else 'unchanged'})")
+    
+    reporter.emit("bytes_written", path=str(output_path), bytes=output_path.stat().st_size)
+    reporter.emit("build_finished", output=str(output_path), slides=len(prs.slides))
+    
+    # 사용된 폰트를 프로젝트 폴더에 복사 (미리보기 빌드는 생략)
+    if not partial:
+        project_dir = json_path.parent
+        copy_fonts_to_project(project_dir)
     
     return True
 
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python json_to_pptx.py <presentation.json> [output.pptx]")
-        print("Example: python json_to_pptx.py projects/eumlogistic/presentation.json")
-        sys.exit(1)
-    
-    json_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
-    
-    success = convert_json_to_pptx(json_file, output_file)
+    parser = argparse.ArgumentParser(
+        description="presentation.json → 편집 가능한 PPTX 변환",
+        epilog="Example: python json_to_pptx.py projects/eumlogistic/presentation.json",
+    )
+    parser.add_argument("json_file", help="presentation.json 경로")
+    parser.add_argument("output_file", nargs="?", default=None, help="출력 PPTX 경로 (선택)")
+    parser.add_argument("--slides", help="부분 빌드할 슬라이드 번호/범위 (예: 3-5,9)")
+    parser.add_argument("--template", help="부분 빌드할 템플릿 이름 (예: section-divider)")
+    parser.add_argument("--composite", action="store_true",
+                        help="이미지+오버레이 카드를 합성 이미지 1장으로 생성 (NumPy 필요)")
+    parser.add_argument("--optimize", action="store_true",
+                        help="저장 후 PPTX 최적화 (JPEG 재인코딩, 미사용 레이아웃/파트 제거, 미디어 중복 제거)")
+    parser.add_argument("--reproducible", action="store_true",
+                        help="재현 가능한 빌드 (ZIP 타임스탬프/순서 고정, build_manifest.json 기록)")
+    args = parser.parse_args()
+    
+    if args.composite:
+        COMPOSITE_OVERLAYS = True
+    
+    success = convert_json_to_pptx(args.json_file, args.output_file,
+                                   slides=args.slides, template=args.template,
+                                   optimize=args.optimize, reproducible=args.reproducible)
     sys.exit(0 if success else 1)
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+PPTX 후처리 최적화 (Post-build optimizer)
+
+json_to_pptx.py 로 생성한 PPTX의 용량을 줄입니다.
+
+1. 슬라이드에서 사용하지 않는 레이아웃 제거 (마스터당 최소 1개 유지)
+2. 어디에서도 참조되지 않는 파트 제거
+3. 동일한 미디어 파일 중복 제거 (SHA-256 기준)
+4. 불투명 PNG/BMP/TIFF 이미지를 JPEG로 재인코딩 (더 작아지는 경우에만)
+5. 지정한 압축 레벨로 ZIP 재압축
+
+파트 분류별(미디어, 슬라이드, 레이아웃 등) 최적화 전/후 바이트를 출력합니다.
+
+Usage:
+    python scripts/optimize_pptx.py <input.pptx> [-o output.pptx] [--quality 85] [--level 9]
+
+Example:
+    python scripts/optimize_pptx.py projects/eumlogistic/presentation_editable.pptx
+"""
+
+import argparse
+import hashlib
+import posixpath
+import sys
+import zipfile
+from io import BytesIO
+from pathlib import Path
+
+from lxml import etree
+from PIL import Image
+
+from reproducible import write_zip
+
+
+JPEG_QUALITY = 85
+ZIP_COMPRESS_LEVEL = 9
+
+CONTENT_TYPES = "[Content_Types].xml"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+RT_SLIDE_LAYOUT = R_NS + "/slideLayout"
+
+REENCODE_EXTS = {".png", ".bmp", ".tif", ".tiff"}
+
+# 리포트용 파트 분류 (앞에서부터 매칭)
+CATEGORIES = [
+    ("media", "ppt/media/"),
+    ("slides", "ppt/slides/"),
+    ("layouts", "ppt/slideLayouts/"),
+    ("masters", "ppt/slideMasters/"),
+    ("notes", "ppt/notes"),
+    ("theme", "ppt/theme/"),
+    ("docProps", "docProps/"),
+]
+
+
+def part_category(name):
+    """파트 이름 → 리포트 분류"""
+    for category, prefix in CATEGORIES:
+        if name.startswith(prefix):
+            return category
+    return "other"
+
+
+def rels_name(part_name):
+    """파트의 관계(.rels) 파일 이름 ('' = 패키지 루트)"""
+    directory, base = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", base + ".rels")
+
+
+def resolve_target(source_part, target):
+    """관계 Target을 패키지 내 절대 파트 이름으로 변환"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def relative_target(source_part, target_part):
+    """패키지 내 파트 이름 → source 기준 상대 Target"""
+    return posixpath.relpath(target_part, posixpath.dirname(source_part) or ".")
+
+
+class Package:
+    """ZIP 파트와 관계(.rels) XML을 메모리에 올려 편집하는 최소 OPC 패키지"""
+
+    def __init__(self, path):
+        self.parts = {}
+        self.stored_sizes = {}
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                self.parts[info.filename] = zf.read(info)
+                self.stored_sizes[info.filename] = info.compress_size
+        self.content_types = etree.fromstring(self.parts[CONTENT_TYPES])
+        self.rels = {}
+        for name, data in self.parts.items():
+            if name.endswith(".rels"):
+                self.rels[name] = etree.fromstring(data)
+
+    def source_of(self, rels_part):
+        """.rels 파일 이름 → 관계의 소스 파트 이름 ('' = 루트)"""
+        directory, base = posixpath.split(rels_part)
+        return posixpath.join(posixpath.dirname(directory), base[:-len(".rels")])
+
+    def relationships(self, source_part):
+        """source 파트의 (관계 요소, 대상 파트 이름) 목록 (외부 링크 제외)"""
+        root = self.rels.get(rels_name(source_part))
+        if root is None:
+            return []
+        result = []
+        for rel in root.findall(f"{{{REL_NS}}}Relationship"):
+            if rel.get("TargetMode") == "External":
+                continue
+            result.append((rel, resolve_target(source_part, rel.get("Target"))))
+        return result
+
+    def rename_targets(self, mapping):
+        """모든 관계에서 대상 파트 이름 변경 (mapping: 기존 이름 → 새 이름)"""
+        for rels_part, root in self.rels.items():
+            source = self.source_of(rels_part)
+            for rel in root.findall(f"{{{REL_NS}}}Relationship"):
+                if rel.get("TargetMode") == "External":
+                    continue
+                target = resolve_target(source, rel.get("Target"))
+                if target in mapping:
+                    rel.set("Target", relative_target(source, mapping[target]))
+
+    def remove_part(self, name):
+        self.parts.pop(name, None)
+        rels_part = rels_name(name)
+        self.parts.pop(rels_part, None)
+        self.rels.pop(rels_part, None)
+        for override in self.content_types.findall(f"{{{CT_NS}}}Override"):
+            if override.get("PartName") == "/" + name:
+                self.content_types.remove(override)
+
+    def ensure_default(self, ext, content_type):
+        for default in self.content_types.findall(f"{{{CT_NS}}}Default"):
+            if default.get("Extension").lower() == ext:
+                return
+        etree.SubElement(self.content_types, f"{{{CT_NS}}}Default",
+                         Extension=ext, ContentType=content_type)
+
+    def save(self, path, compress_level=ZIP_COMPRESS_LEVEL):
+        self.parts[CONTENT_TYPES] = etree.tostring(self.content_types, xml_declaration=True,
+                                                   encoding="UTF-8", standalone=True)
+        for name, root in self.rels.items():
+            self.parts[name] = etree.tostring(root, xml_declaration=True,
+                                              encoding="UTF-8", standalone=True)
+        # [Content_Types].xml 을 첫 번째 엔트리로, 타임스탬프 고정
+        write_zip(self.parts, path, compress_level)
+
+
+def drop_unused_layouts(pkg):
+    """슬라이드에서 참조하지 않는 레이아웃을 마스터에서 분리 (마스터당 최소 1개 유지)"""
+    used = set()
+    for name in pkg.parts:
+        if name.startswith("ppt/slides/") and name.endswith(".xml"):
+            for rel, target in pkg.relationships(name):
+                if rel.get("Type") == RT_SLIDE_LAYOUT:
+                    used.add(target)
+
+    removed = 0
+    for name in list(pkg.parts):
+        if not (name.startswith("ppt/slideMasters/") and name.endswith(".xml")):
+            continue
+        master = etree.fromstring(pkg.parts[name])
+        id_list = master.find(f"{{{P_NS}}}sldLayoutIdLst")
+        layout_rels = [(rel, target) for rel, target in pkg.relationships(name)
+                       if rel.get("Type") == RT_SLIDE_LAYOUT]
+        keep = {target for _, target in layout_rels if target in used}
+        if not keep and layout_rels:
+            keep = {layout_rels[0][1]}
+
+        for rel, target in layout_rels:
+            if target in keep:
+                continue
+            rel_id = rel.get("Id")
+            rel.getparent().remove(rel)
+            if id_list is not None:
+                for entry in id_list.findall(f"{{{P_NS}}}sldLayoutId"):
+                    if entry.get(f"{{{R_NS}}}id") == rel_id:
+                        id_list.remove(entry)
+            removed += 1
+        pkg.parts[name] = etree.tostring(master, xml_declaration=True,
+                                         encoding="UTF-8", standalone=True)
+    return removed
+
+
+def drop_unreachable_parts(pkg):
+    """패키지 루트에서 관계를 따라 도달할 수 없는 파트 제거"""
+    reachable = set()
+    stack = [""]
+    while stack:
+        source = stack.pop()
+        for _, target in pkg.relationships(source):
+            if target not in reachable and target in pkg.parts:
+                reachable.add(target)
+                stack.append(target)
+
+    removed = []
+    for name in list(pkg.parts):
+        if name == CONTENT_TYPES or name.endswith(".rels"):
+            continue
+        if name not in reachable:
+            pkg.remove_part(name)
+            removed.append(name)
+    return removed
+
+
+def dedupe_media(pkg):
+    """내용이 같은 미디어 파트를 하나로 합침 (SHA-256 기준)"""
+    canonical = {}
+    mapping = {}
+    for name in sorted(pkg.parts):
+        if not name.startswith("ppt/media/"):
+            continue
+        digest = hashlib.sha256(pkg.parts[name]).hexdigest()
+        if digest in canonical:
+            mapping[name] = canonical[digest]
+        else:
+            canonical[digest] = name
+    if mapping:
+        pkg.rename_targets(mapping)
+        for name in mapping:
+            pkg.remove_part(name)
+    return len(mapping)
+
+
+def is_opaque(img):
+    """알파 채널이 없거나 모든 픽셀이 완전 불투명인지"""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        alpha = img.convert("RGBA").getchannel("A")
+        return alpha.getextrema()[0] == 255
+    return True
+
+
+def reencode_opaque_images(pkg, quality=JPEG_QUALITY):
+    """불투명 무손실 이미지를 JPEG로 재인코딩 (결과가 더 작을 때만)"""
+    mapping = {}
+    for name in sorted(pkg.parts):
+        stem, ext = posixpath.splitext(name)
+        if not name.startswith("ppt/media/") or ext.lower() not in REENCODE_EXTS:
+            continue
+        try:
+            img = Image.open(BytesIO(pkg.parts[name]))
+            if not is_opaque(img):
+                continue
+            out = BytesIO()
+            img.convert("RGB").save(out, format="JPEG", quality=quality, optimize=True)
+        except Exception as e:
+            print(f"  [WARN] 이미지 재인코딩 실패: {name} - {e}")
+            continue
+        if out.tell() >= len(pkg.parts[name]):
+            continue
+
+        new_name = stem + ".jpeg"
+        counter = 1
+        while new_name in pkg.parts or new_name in mapping.values():
+            new_name = f"{stem}-{counter}.jpeg"
+            counter += 1
+        mapping[name] = new_name
+        pkg.parts[new_name] = out.getvalue()
+
+    if mapping:
+        pkg.ensure_default("jpeg", "image/jpeg")
+        pkg.rename_targets(mapping)
+        for name in mapping:
+            pkg.remove_part(name)
+    return len(mapping)
+
+
+def category_sizes(sizes):
+    totals = {}
+    for name, size in sizes.items():
+        category = part_category(name)
+        totals[category] = totals.get(category, 0) + size
+    return totals
+
+
+def print_report(report):
+    before, after = report["before"], report["after"]
+    print("\n[Optimize] 분류별 크기 (압축 후 bytes)")
+    print(f"  {'category':<10} {'before':>12} {'after':>12} {'saved':>8}")
+    for category in sorted(set(before) | set(after), key=lambda c: -before.get(c, 0)):
+        b, a = before.get(category, 0), after.get(category, 0)
+        saved = f"{(1 - a / b) * 100:.0f}%" if b else "-"
+        print(f"  {category:<10} {b:>12,} {a:>12,} {saved:>8}")
+    b, a = report["total_before"], report["total_after"]
+    print(f"  {'TOTAL':<10} {b:>12,} {a:>12,} {(1 - a / b) * 100 if b else 0:>7.0f}%")
+    print(f"  레이아웃 제거 {report['layouts_removed']}개, 파트 제거 {len(report['parts_removed'])}개, "
+          f"중복 미디어 {report['media_deduped']}개, JPEG 변환 {report['images_reencoded']}개")
+
+
+def optimize_pptx(input_path, output_path=None, jpeg_quality=JPEG_QUALITY,
+                  compress_level=ZIP_COMPRESS_LEVEL, drop_layouts=True, verbose=True):
+    """PPTX 최적화
+
+    Args:
+        input_path: 입력 PPTX
+        output_path: 출력 PPTX (None = 입력 파일 덮어쓰기)
+        jpeg_quality: JPEG 재인코딩 품질 (1~95)
+        compress_level: ZIP deflate 압축 레벨 (0~9)
+        drop_layouts: 사용하지 않는 레이아웃 제거 여부
+
+    Returns:
+        dict: 분류별 전/후 크기와 처리 통계
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path else input_path
+
+    total_before = input_path.stat().st_size
+    pkg = Package(input_path)
+    before = category_sizes(pkg.stored_sizes)
+
+    layouts_removed = drop_unused_layouts(pkg) if drop_layouts else 0
+    parts_removed = drop_unreachable_parts(pkg)
+    media_deduped = dedupe_media(pkg)
+    images_reencoded = reencode_opaque_images(pkg, jpeg_quality)
+    pkg.save(output_path, compress_level)
+
+    with zipfile.ZipFile(output_path) as zf:
+        after = category_sizes({info.filename: info.compress_size for info in zf.infolist()})
+
+    report = {
+        "before": before,
+        "after": after,
+        "total_before": total_before,
+        "total_after": output_path.stat().st_size,
+        "layouts_removed": layouts_removed,
+        "parts_removed": parts_removed,
+        "media_deduped": media_deduped,
+        "images_reencoded": images_reencoded,
+    }
+    if verbose:
+        print_report(report)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PPTX 후처리 최적화")
+    parser.add_argument("input", help="입력 PPTX")
+    parser.add_argument("-o", "--output", help="출력 PPTX (기본: 입력 파일 덮어쓰기)")
+    parser.add_argument("--quality", type=int, default=JPEG_QUALITY, help=f"JPEG 품질 (기본 {JPEG_QUALITY})")
+    parser.add_argument("--level", type=int, default=ZIP_COMPRESS_LEVEL, help=f"ZIP 압축 레벨 0~9 (기본 {ZIP_COMPRESS_LEVEL})")
+    parser.add_argument("--keep-layouts", action="store_true", help="사용하지 않는 레이아웃 유지")
+    args = parser.parse_args()
+
+    if not Path(args.input).exists():
+        print(f"❌ 오류: PPTX 파일을 찾을 수 없습니다: {args.input}")
+        sys.exit(1)
+
+    print(f"🔧 PPTX 최적화 중: {args.input}")
+    optimize_pptx(args.input, args.output, args.quality, args.level, drop_layouts=not args.keep_layouts)
+    print(f"✅ 저장 완료: {args.output or args.input}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+PDF 내장 이미지 추출 (analyze_pdf.py 의 images 단계)
+
+pdfplumber 페이지 이미지의 pdfminer 스트림에서 원본 이미지를 꺼냅니다.
+
+| 스트림 | 저장 |
+|--------|------|
+| DCTDecode (JPEG) | 디코딩 없이 원본 .jpg |
+| JPXDecode (JPEG 2000) | PNG 변환 (브라우저 호환) |
+| Flate / LZW / RunLength ... 비트맵 | 색 공간(RGB, Gray, CMYK, ICCBased, Indexed)과 SMask(투명도)를 적용해 PNG |
+| JBIG2 / CCITT, 이미지 마스크, 16비트 | 건너뜀 |
+
+파일 이름은 내용 SHA-256 이므로 페이지마다 반복되는 로고도 한 번만 저장됩니다.
+추출한 파일은 공유 캐시(.cache/pdf_images/)에 저장하고, export_images()가 프로젝트의 image_resources/ 로 복사합니다.
+"""
+
+import hashlib
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+from pdfminer.pdftypes import resolve1
+from pdfminer.psparser import literal_name
+
+from image_cache import cache_path, write_atomic
+
+
+IMAGE_NAMESPACE = 'pdf_images'
+RESOURCE_DIR = 'image_resources'
+# 이보다 작은 이미지(1px 간격 이미지, 패턴 조각)는 무시
+MIN_IMAGE_SIDE = 8
+
+# 색 공간 이름 → (PIL 모드, 채널 수)
+COLOR_SPACES = {
+    'DeviceRGB': ('RGB', 3), 'CalRGB': ('RGB', 3),
+    'DeviceGray': ('L', 1), 'CalGray': ('L', 1),
+    'DeviceCMYK': ('CMYK', 4),
+}
+ICC_MODES = {1: ('L', 1), 3: ('RGB', 3), 4: ('CMYK', 4)}
+
+
+def resource_name(sha256, ext):
+    """image_resources/ 안의 파일 이름"""
+    return f"{sha256[:16]}{ext}"
+
+
+def _filters(stream):
+    return [literal_name(name) for name, _ in stream.get_filters()]
+
+
+def _color_mode(color_space):
+    """ColorSpace → (PIL 모드, 채널 수, Indexed 팔레트 bytes 또는 None) - 지원하지 않으면 None"""
+    color_space = resolve1(color_space)
+    if isinstance(color_space, list):
+        if not color_space:
+            return None
+        family = literal_name(resolve1(color_space[0]))
+        if family == 'ICCBased':
+            channels = resolve1(resolve1(color_space[1]).attrs.get('N')) if len(color_space) > 1 else None
+            mode = ICC_MODES.get(channels)
+            return mode + (None,) if mode else None
+        if family == 'Indexed':
+            if len(color_space) < 4:
+                return None
+            base = _color_mode(color_space[1])
+            lookup = resolve1(color_space[3])
+            lookup = lookup.get_data() if hasattr(lookup, 'get_data') else lookup
+            if isinstance(lookup, str):
+                lookup = lookup.encode('latin-1')
+            if base is None or base[0] != 'RGB' or not isinstance(lookup, bytes):
+                return None
+            return 'P', 1, lookup
+        color_space = color_space[0]  # [/DeviceRGB], [/CalRGB <<...>>]
+    if color_space is None:
+        return None
+    mode = COLOR_SPACES.get(literal_name(color_space))
+    return mode + (None,) if mode else None
+
+
+def _bitmap(stream, width, height):
+    """비트맵 스트림 → PIL 이미지 (지원하지 않는 형식은 None)"""
+    attrs = stream.attrs
+    bits = resolve1(attrs.get('BitsPerComponent', 8))
+    color = _color_mode(attrs.get('ColorSpace'))
+    if color is None or color[0] is None or bits not in (1, 2, 4, 8):
+        return None
+    mode, channels, palette = color
+    data = stream.get_data()
+    if len(data) < (width * channels * bits + 7) // 8 * height:
+        return None
+    if mode == 'P':
+        image = Image.frombytes('P', (width, height), data, 'raw', 'P' if bits == 8 else f'P;{bits}')
+        image.putpalette(palette[:768].ljust(768, b'\0'))
+        return image.convert('RGB')
+    if bits != 8:
+        if mode != 'L' or bits != 1:
+            return None
+        return Image.frombytes('1', (width, height), data).convert('L')
+    image = Image.frombytes(mode, (width, height), data)
+    if mode == 'CMYK':
+        image = image.convert('RGB')
+    return image
+
+
+def _soft_mask(stream, image):
+    """SMask(8비트 투명도)가 있으면 알파 채널로 적용"""
+    mask = resolve1(stream.attrs.get('SMask'))
+    if mask is None or not hasattr(mask, 'get_data'):
+        return image
+    size = (resolve1(mask.attrs.get('Width')), resolve1(mask.attrs.get('Height')))
+    data = mask.get_data()
+    if resolve1(mask.attrs.get('BitsPerComponent', 8)) != 8 or len(data) < size[0] * size[1]:
+        return image
+    alpha = Image.frombytes('L', size, data)
+    if alpha.size != image.size:
+        alpha = alpha.resize(image.size)
+    image = image.convert('RGBA')
+    image.putalpha(alpha)
+    return image
+
+
+def _png_bytes(image):
+    buffer = BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def stream_image(stream):
+    """이미지 XObject 스트림 → (파일 bytes, 확장자) - 추출할 수 없으면 None"""
+    attrs = stream.attrs
+    width, height = resolve1(attrs.get('Width')), resolve1(attrs.get('Height'))
+    if not isinstance(width, int) or not isinstance(height, int) or min(width, height) < MIN_IMAGE_SIDE:
+        return None
+    if resolve1(attrs.get('ImageMask')):
+        return None
+    filters = _filters(stream)
+    last = filters[-1] if filters else None
+    if last in ('DCTDecode', 'DCT'):
+        data = stream.get_data()  # 앞선 필터(Flate 등)와 암호화만 풀린 JPEG 원본
+        if 'SMask' not in attrs:
+            return data, '.jpg'
+        image = Image.open(BytesIO(data))
+        image.load()
+    elif last in ('JPXDecode',):
+        image = Image.open(BytesIO(stream.get_data()))
+        image.load()
+    elif last in ('JBIG2Decode', 'CCITTFaxDecode', 'CCF'):
+        return None
+    else:
+        image = _bitmap(stream, width, height)
+        if image is None:
+            return None
+    return _png_bytes(_soft_mask(stream, image)), '.png'
+
+
+def store_stream_image(stream):
+    """스트림 이미지를 공유 캐시에 내용 해시 이름으로 저장 → (sha256, 확장자, 가로, 세로) 또는 None"""
+    try:
+        extracted = stream_image(stream)
+    except Exception:  # 깨진 스트림, PIL이 읽지 못하는 형식 등 - 이미지 하나 때문에 분석을 멈추지 않음
+        return None
+    if extracted is None:
+        return None
+    data, ext = extracted
+    sha256 = hashlib.sha256(data).hexdigest()
+    path = cache_path(IMAGE_NAMESPACE, sha256, ext)
+    if not path.exists():
+        write_atomic(path, data)
+    return sha256, ext, resolve1(stream.attrs.get('Width')), resolve1(stream.attrs.get('Height'))
+
+
+def export_images(resources, project_dir):
+    """imageResources 항목의 파일을 project_dir/image_resources/ 로 복사 (이미 있으면 건너뜀)
+
+    → (새로 복사한 수, 캐시에 없는 파일 이름 목록 - 캐시를 지운 경우 --no-cache 로 다시 분석)
+    """
+    target_dir = Path(project_dir) / RESOURCE_DIR
+    copied = 0
+    missing = []
+    for resource in resources:
+        target = target_dir / Path(resource['file']).name
+        if target.exists():
+            continue
+        source = cache_path(IMAGE_NAMESPACE, resource['sha256'], target.suffix)
+        if not source.exists():
+            missing.append(target.name)
+            continue
+        write_atomic(target, source.read_bytes())
+        copied += 1
+    return copied, missing
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+재현 가능한 빌드 (Reproducible builds)
+
+같은 presentation.json 으로 빌드하면 바이트 단위로 같은 결과물이 나오도록 합니다.
+
+- ZIP 엔트리 타임스탬프 고정 (SOURCE_DATE_EPOCH 또는 1980-01-01)
+- ZIP 엔트리 순서 고정 ([Content_Types].xml, _rels/.rels, 나머지 이름순)
+- 관계(.rels) 항목을 Id 순으로 정렬
+- 결과물 SHA-256 다이제스트를 build_manifest.json 에 기록
+  → 다운스트림 저장소/CDN 동기화에서 변경되지 않은 결과물 업로드를 건너뛸 수 있음
+
+타임스탬프가 필요한 메타데이터(lastModified, analyzedAt)는 build_timestamp()를 사용하며,
+SOURCE_DATE_EPOCH 환경변수가 있으면 그 값, 없으면 입력 파일(PDF, HTML)의 수정 시각을 사용합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+from datetime import datetime, timezone
+from io import BytesIO
+from pathlib import Path
+
+from lxml import etree
+
+from image_cache import write_atomic
+
+
+MANIFEST_NAME = "build_manifest.json"
+
+# ZIP 포맷이 표현할 수 있는 가장 이른 시각 (1980-01-01T00:00:00Z)
+ZIP_EPOCH = 315532800
+# python-pptx 저장과 같은 deflate 레벨
+DEFAULT_COMPRESS_LEVEL = 6
+
+CONTENT_TYPES = "[Content_Types].xml"
+ROOT_RELS = "_rels/.rels"
+
+_REL_ID_RE = re.compile(r'(\d+)$')
+
+
+def build_timestamp(source_path=None) -> datetime:
+    """결과물에 기록할 시각 - UTC
+
+    SOURCE_DATE_EPOCH가 설정되어 있으면 그 값, 아니면 입력 파일(source_path)의 수정 시각,
+    입력 파일이 없으면 ZIP_EPOCH. 현재 시각은 사용하지 않으므로 같은 입력이면 결과도 같습니다.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc)
+    if source_path is not None:
+        try:
+            return datetime.fromtimestamp(int(os.stat(source_path).st_mtime), timezone.utc)
+        except OSError:
+            pass
+    return datetime.fromtimestamp(ZIP_EPOCH, timezone.utc)
+
+
+def zip_date_time():
+    """ZIP 엔트리에 기록할 고정 시각"""
+    epoch = max(int(os.environ.get("SOURCE_DATE_EPOCH", ZIP_EPOCH)), ZIP_EPOCH)
+    return datetime.fromtimestamp(epoch, timezone.utc).timetuple()[:6]
+
+
+def stable_order(names):
+    """[Content_Types].xml, _rels/.rels 를 앞에, 나머지는 이름순"""
+    head = [n for n in (CONTENT_TYPES, ROOT_RELS) if n in names]
+    return head + sorted(n for n in names if n not in head)
+
+
+def _rel_sort_key(rel):
+    rel_id = rel.get("Id", "")
+    m = _REL_ID_RE.search(rel_id)
+    return (rel_id[:m.start()] if m else rel_id, int(m.group(1)) if m else -1)
+
+
+def sort_relationships(data: bytes) -> bytes:
+    """.rels XML의 Relationship 항목을 Id 순(rId2 < rId10)으로 정렬"""
+    root = etree.fromstring(data)
+    rels = sorted(root, key=_rel_sort_key)
+    root[:] = rels
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def write_zip(parts, path, compress_level=DEFAULT_COMPRESS_LEVEL, sort_entries=False):
+    """타임스탬프/속성을 고정하여 ZIP 저장
+
+    Args:
+        parts: {엔트리 이름: bytes}
+        sort_entries: True면 stable_order()로 정렬, False면 [Content_Types].xml만 앞으로
+    """
+    if sort_entries:
+        names = stable_order(list(parts))
+    else:
+        names = [n for n in (CONTENT_TYPES,) if n in parts] + [n for n in parts if n != CONTENT_TYPES]
+
+    date_time = zip_date_time()
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=compress_level) as zf:
+        for name in names:
+            info = zipfile.ZipInfo(name, date_time=date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            info.create_system = 0
+            info.external_attr = 0o644 << 16
+            zf.writestr(info, parts[name], compresslevel=compress_level)
+    write_atomic(path, buffer.getvalue())
+
+
+def normalize_pptx(path, compress_level=DEFAULT_COMPRESS_LEVEL):
+    """PPTX(ZIP)를 재현 가능한 형태로 다시 저장 (타임스탬프/순서/관계 정렬)"""
+    with zipfile.ZipFile(path) as zf:
+        parts = {info.filename: zf.read(info) for info in zf.infolist()}
+    for name in parts:
+        if name.endswith(".rels"):
+            parts[name] = sort_relationships(parts[name])
+    write_zip(parts, path, compress_level, sort_entries=True)
+
+
+def file_digest(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def record_artifact(artifact_path, manifest_path=None):
+    """결과물 다이제스트를 매니페스트에 기록
+
+    매니페스트는 결과물과 같은 폴더의 build_manifest.json 이며,
+    매니페스트 자체도 재현 가능하도록 타임스탬프 없이 키 정렬로 저장합니다.
+
+    Returns:
+        (digest, changed): changed는 이전 기록과 다이제스트가 다르면 True
+    """
+    artifact_path = Path(artifact_path)
+    manifest_path = Path(manifest_path) if manifest_path else artifact_path.parent / MANIFEST_NAME
+
+    manifest = {"artifacts": {}}
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            pass
+    artifacts = manifest.setdefault("artifacts", {})
+
+    digest = file_digest(artifact_path)
+    name = os.path.relpath(artifact_path, manifest_path.parent).replace(os.sep, "/")
+    previous = artifacts.get(name, {}).get("sha256")
+    artifacts[name] = {"sha256": digest, "bytes": artifact_path.stat().st_size}
+
+    data = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n"
+    write_atomic(manifest_path, data.encode("utf-8"))
+    return digest, previous != digest
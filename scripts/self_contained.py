@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+오프라인 단독 실행 HTML (Self-contained HTML)
+
+generate_html.py --self-contained 에서 사용합니다. 인쇄(PDF 저장) 전에 네트워크에서
+폰트/이미지를 기다리지 않도록
+
+- 폰트: 로컬 fonts/ 폴더의 TTF를 덱에 쓰인 글자만 남긴 WOFF2로 subset 하여 @font-face data URI로 포함
+  (fontTools가 없으면 TTF 전체를 포함하고 경고 출력)
+- 이미지: image_cache 로 한 번만 다운로드하고, 렌더링 크기에 맞춰 WebP(없으면 JPEG/PNG)로 재인코딩한 뒤
+  data URI로 인라인하거나 assets/images/ 에 저장
+
+subset 폰트와 재인코딩 이미지는 image_cache 의 공유 캐시(.cache/fonts, .cache/localized)에 저장됩니다.
+"""
+
+import base64
+import copy
+import hashlib
+import os
+import re
+from functools import lru_cache
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageOps, features
+
+from image_cache import cache_key, cache_path, fetch_image, resolve_source, write_atomic
+
+try:
+    from fontTools import subset as font_subset
+    HAS_FONTTOOLS = True
+except ImportError:
+    font_subset = None
+    HAS_FONTTOOLS = False
+
+try:
+    import brotli  # noqa: F401 - fontTools WOFF2 압축에 필요
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+
+# subset/재인코딩 로직이 바뀌면 올려서 기존 캐시를 무효화
+SELF_CONTAINED_VERSION = 1
+
+FONT_DIR = Path(__file__).parent.parent / "fonts"
+# slides.css 의 --font-main / --font-heading 첫 번째 글꼴
+EMBED_FONT_FAMILY = "Pretendard"
+# 파일 이름 접미사 → font-weight
+FONT_WEIGHTS = {
+    "Thin": 100,
+    "ExtraLight": 200,
+    "Light": 300,
+    "Regular": 400,
+    "Medium": 500,
+    "SemiBold": 600,
+    "Bold": 700,
+    "ExtraBold": 800,
+    "Black": 900,
+}
+# 덱 텍스트 외에 항상 포함할 글자 (숫자/영문/기호)
+BASE_CHARACTERS = "".join(chr(c) for c in range(0x20, 0x7F)) + " ·•–—‘’“”…→←↑↓©®™"
+
+WEBP_QUALITY = 82
+JPEG_QUALITY = 85
+
+_IMPORT_RE = re.compile(r"^\s*@import\s+url\([^)]*\)\s*;\s*$\n?", re.M)
+_PX_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)px\s*$")
+
+_MIME_TYPES = {".woff2": "font/woff2", ".woff": "font/woff", ".ttf": "font/ttf",
+               ".webp": "image/webp", ".jpg": "image/jpeg", ".png": "image/png"}
+_FONT_FORMATS = {".woff2": "woff2", ".woff": "woff", ".ttf": "truetype"}
+
+
+def data_uri(data, ext):
+    return f"data:{_MIME_TYPES[ext]};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+@lru_cache(maxsize=None)
+def offline_css(static_css):
+    """정적 CSS에서 원격 @import(웹폰트 CDN) 제거"""
+    return _IMPORT_RE.sub("", static_css)
+
+
+# ========================================
+# Fonts
+# ========================================
+
+def find_font_files(family=EMBED_FONT_FAMILY, project_dir=None):
+    """(weight, 경로) 목록 - 프로젝트 fonts/ 폴더를 먼저 찾고, 없으면 저장소 fonts/<family>/"""
+    folders = []
+    if project_dir:
+        folders.append(Path(project_dir) / "fonts")
+    folders.append(FONT_DIR / family)
+    for folder in folders:
+        found = []
+        for path in sorted(folder.glob(f"{family}-*.ttf")) if folder.is_dir() else []:
+            weight = FONT_WEIGHTS.get(path.stem.split("-", 1)[1])
+            if weight:
+                found.append((weight, path))
+        if found:
+            return found
+    return []
+
+
+def collect_text(value, chars=None):
+    """슬라이드 JSON의 모든 문자열에 쓰인 글자 집합"""
+    if chars is None:
+        chars = set(BASE_CHARACTERS)
+    if isinstance(value, str):
+        if not value.startswith(("http://", "https://", "data:")):
+            chars.update(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            collect_text(v, chars)
+    elif isinstance(value, list):
+        for v in value:
+            collect_text(v, chars)
+    return chars
+
+
+def subset_font(path, text):
+    """TTF → 사용 글자만 남긴 웹폰트 (bytes, 확장자) - fontTools가 없으면 원본 TTF"""
+    data = Path(path).read_bytes()
+    if not HAS_FONTTOOLS:
+        return data, ".ttf"
+
+    ext = ".woff2" if HAS_BROTLI else ".woff"
+    key = cache_key("font-subset", SELF_CONTAINED_VERSION, hashlib.sha256(data).hexdigest(),
+                    "".join(sorted(text)), ext)
+    cached = cache_path("fonts", key, ext)
+    if cached.exists():
+        return cached.read_bytes(), ext
+
+    options = font_subset.Options()
+    options.flavor = ext[1:]
+    options.layout_features = ["*"]
+    options.name_IDs = ["*"]
+    font = font_subset.load_font(str(path), options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(text="".join(sorted(text)))
+    subsetter.subset(font)
+    out = BytesIO()
+    font_subset.save_font(font, out, options)
+    write_atomic(cached, out.getvalue())
+    return out.getvalue(), ext
+
+
+def font_face_css(slides, project_dir=None, family=EMBED_FONT_FAMILY):
+    """덱 텍스트로 subset 한 @font-face 규칙 (인라인 <style>에 넣을 CSS)"""
+    fonts = find_font_files(family, project_dir)
+    if not fonts:
+        print(f"  [WARN] {family} 폰트 파일을 찾을 수 없습니다 (fonts/{family}/) - 시스템 폰트로 표시됩니다")
+        return ""
+    if not HAS_FONTTOOLS:
+        print("  [WARN] fontTools가 없어 폰트 전체(TTF)를 포함합니다 - pip install fonttools brotli")
+    elif not HAS_BROTLI:
+        print("  [WARN] brotli가 없어 WOFF2 대신 WOFF로 subset 합니다 - pip install brotli")
+
+    text = collect_text(slides)
+    rules = ["        /* Embedded fonts (--self-contained) */"]
+    for weight, path in fonts:
+        data, ext = subset_font(path, text)
+        rules.append(f"        @font-face {{ font-family: '{family}'; font-style: normal; font-weight: {weight}; "
+                     f"font-display: block; src: url({data_uri(data, ext)}) format('{_FONT_FORMATS[ext]}'); }}")
+    return "\n".join(rules) + "\n"
+
+
+# ========================================
+# Images
+# ========================================
+
+def _style_px(style, key):
+    if not isinstance(style, dict):
+        return None
+    m = _PX_RE.match(str(style.get(key, "")))
+    return float(m.group(1)) if m else None
+
+
+def rendered_size(box, style=None, scale=2):
+    """이미지가 그려질 최대 픽셀 크기 - style의 px width/height가 있으면 우선 (인쇄용 배율 포함)"""
+    width = _style_px(style, "width") or box[0]
+    height = _style_px(style, "height") or box[1]
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def encode_image(data, size):
+    """size를 덮는(cover) 크기까지만 축소한 뒤 재인코딩 → (bytes, 확장자)
+
+    원본이 더 작으면 확대하지 않습니다. 투명도가 있으면 알파 채널을 유지합니다 (WebP 또는 PNG).
+    """
+    image = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    scale = max(size[0] / image.width, size[1] / image.height)
+    if scale < 1:
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+                             Image.Resampling.LANCZOS)
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    out = BytesIO()
+    if features.check("webp"):
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        image.save(out, format="WEBP", quality=WEBP_QUALITY, method=6)
+        return out.getvalue(), ".webp"
+    if has_alpha:
+        image.convert("RGBA").save(out, format="PNG", optimize=True)
+        return out.getvalue(), ".png"
+    image.convert("RGB").save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue(), ".jpg"
+
+
+class ImageLocalizer:
+    """이미지 URL → 로컬 src (data URI 또는 assets/images/ 상대 경로)
+
+    같은 (URL, 크기)는 빌드 중 한 번만 처리하며, 재인코딩 결과는 공유 캐시에 저장됩니다.
+    처리할 수 없는 이미지(다운로드 실패 등)는 원래 URL을 유지하고 failed 에 기록합니다.
+    """
+
+    def __init__(self, project_dir, inline=True, asset_dir="assets/images"):
+        self.project_dir = project_dir
+        self.inline = inline
+        self.asset_dir = asset_dir
+        self.sources = {}
+        self.failed = []
+        self.bytes_out = 0
+
+    def localize(self, url, size):
+        if not url or not isinstance(url, str) or url.startswith("data:"):
+            return url
+        known = self.sources.get((url, size))
+        if known is not None:
+            return known
+        src = self._localize(url, size) or url
+        self.sources[(url, size)] = src
+        return src
+
+    def _localize(self, url, size):
+        local = resolve_source(url, self.project_dir)
+        key = cache_key("localized", SELF_CONTAINED_VERSION, local, size, features.check("webp"))
+        encoded = None
+        for ext in (".webp", ".jpg", ".png"):
+            path = cache_path("localized", key, ext)
+            if path.exists():
+                encoded = path.read_bytes(), ext
+                break
+        if encoded is None:
+            data = fetch_image(local)
+            if not data:
+                self.failed.append(url)
+                return None
+            try:
+                encoded = encode_image(data, size)
+            except Exception as e:
+                print(f"  [WARN] 이미지 재인코딩 실패: {url} - {e}")
+                self.failed.append(url)
+                return None
+            write_atomic(cache_path("localized", key, encoded[1]), encoded[0])
+        data, ext = encoded
+        self.bytes_out += len(data)
+        if self.inline:
+            return data_uri(data, ext)
+        name = f"{hashlib.sha256(data).hexdigest()[:16]}{ext}"
+        target = os.path.join(self.project_dir, self.asset_dir, name)
+        if not os.path.exists(target):
+            write_atomic(target, data)
+        return f"{self.asset_dir}/{name}"
+
+    def file_src(self, path):
+        """이미 로컬에 있는 파일(합성 배경 등)을 인라인 모드에서 data URI로"""
+        if not self.inline or not path:
+            return path
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".jpeg":
+            ext = ".jpg"
+        if ext not in _MIME_TYPES:
+            return path
+        with open(os.path.join(self.project_dir, path), "rb") as f:
+            return data_uri(f.read(), ext)
+
+
+def localize_slides(selected, localizer, slide_size, template_of, skip_backgrounds=False):
+    """선택된 슬라이드의 이미지 src를 로컬 src로 바꾼 복사본 목록 (원본 JSON은 수정하지 않음)
+
+    template_of(slide)는 레이아웃 템플릿 이름을 반환합니다 - 분할 레이아웃의 이미지는 슬라이드 절반 크기로 계산합니다.
+    skip_backgrounds=True 이면 image-overlay 배경은 그대로 둡니다 (--composite 합성이 원본 URL을 사용).
+    """
+    split_templates = ("hero-cover", "content-split", "service-detail", "content-profile",
+                       "content-features", "image-features")
+    localized = []
+    for slide_number, slide in selected:
+        slide = copy.deepcopy(slide)
+        background = slide.get("background")
+        if isinstance(background, dict) and background.get("type") == "image-overlay" and not skip_backgrounds:
+            background["image"] = localizer.localize(background.get("image", ""), rendered_size(slide_size))
+        split = template_of(slide) in split_templates
+        column = (slide_size[0] // 2, slide_size[1]) if split else slide_size
+        for el in slide.get("elements", []):
+            if not isinstance(el, dict):
+                continue
+            if el.get("type") == "image" and el.get("src"):
+                el["src"] = localizer.localize(el["src"], rendered_size(column, el.get("style")))
+            images = el.get("images")
+            if isinstance(images, list) and images:
+                cell = (column[0] // min(len(images), 3), column[1] // 2)
+                for img in images:
+                    if isinstance(img, dict) and img.get("src"):
+                        img["src"] = localizer.localize(img["src"], rendered_size(cell))
+        localized.append((slide_number, slide))
+    return localized
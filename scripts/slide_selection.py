@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+슬라이드 선택 필터 - 부분 빌드(미리보기)용
+
+json_to_pptx.py / generate_html.py 가 공통으로 사용하는 슬라이드 필터입니다.
+전체 덱을 변환하지 않고 선택한 슬라이드만 빌드할 때 사용합니다.
+
+    --slides 3-5,9              슬라이드 번호/범위 (1부터 시작)
+    --template section-divider  템플릿 이름 (쉼표로 여러 개 지정 가능)
+
+두 필터를 함께 지정하면 두 조건을 모두 만족하는 슬라이드만 선택됩니다.
+"""
+
+
+def parse_slide_range(spec):
+    """'3-5,9' 형식의 문자열을 슬라이드 번호 집합으로 변환
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    numbers = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        if '-' in part:
+            start, end = (p.strip() for p in part.split('-', 1))
+            if not start.isdigit() or not end.isdigit():
+                raise ValueError(f"잘못된 슬라이드 범위: '{part}'")
+            start, end = int(start), int(end)
+            if start > end:
+                start, end = end, start
+            numbers.update(range(start, end + 1))
+        elif part.isdigit():
+            numbers.add(int(part))
+        else:
+            raise ValueError(f"잘못된 슬라이드 번호: '{part}'")
+    if not numbers:
+        raise ValueError(f"선택된 슬라이드가 없습니다: '{spec}'")
+    return numbers
+
+
+def get_slide_number(slide, index):
+    """슬라이드 번호 (slideNumber → id → 1부터 시작하는 순번)"""
+    number = slide.get('slideNumber', slide.get('id'))
+    return number if isinstance(number, int) else index
+
+
+def get_slide_template(slide):
+    """슬라이드 템플릿 이름 (layout.template → template → type)"""
+    layout = slide.get('layout', {})
+    if isinstance(layout, dict) and layout.get('template'):
+        return layout['template']
+    return slide.get('template') or slide.get('type', 'content-text')
+
+
+def select_slides(slides, slide_spec=None, template=None):
+    """필터 조건에 맞는 슬라이드를 (슬라이드 번호, 슬라이드) 목록으로 반환
+
+    Args:
+        slides: presentation.json 의 slides 배열
+        slide_spec: '3-5,9' 형식의 번호 필터 (None = 전체)
+        template: 템플릿 이름 필터, 쉼표로 여러 개 지정 가능 (None = 전체)
+    """
+    numbers = parse_slide_range(slide_spec) if slide_spec else None
+    templates = {t.strip() for t in template.split(',') if t.strip()} if template else None
+
+    selected = []
+    for index, slide in enumerate(slides, 1):
+        number = get_slide_number(slide, index)
+        if numbers is not None and number not in numbers:
+            continue
+        if templates is not None and get_slide_template(slide) not in templates:
+            continue
+        selected.append((number, slide))
+    return selected
+
+
+def is_partial(slide_spec=None, template=None):
+    """부분 빌드(미리보기) 여부"""
+    return bool(slide_spec or template)
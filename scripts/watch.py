@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+프로젝트 감시 모드 (Watch mode)
+
+presentation.json / presentation.html 변경을 감시하여 영향받는 결과물만 다시 빌드합니다.
+모듈과 캐시(컴파일된 템플릿, 슬라이드 조각, 이미지)가 메모리에 올라간 상태로 계속 실행되므로
+저장 후 1초 안에 미리보기에 반영됩니다.
+
+- presentation.json 변경 → generate_html (+ --pptx 이면 PPTX도 백그라운드에서 재빌드, 새 변경이 오면 취소 후 재시작)
+- presentation.html 직접 수정 → html_to_json --merge 로 바뀐 필드만 presentation.json 에 병합 (+ --pptx 이면 PPTX 재빌드)
+- renderers.py 변경 → generate_html
+
+짧은 시간에 연속 저장되면(debounce) 마지막 저장 후 한 번만 빌드합니다.
+도구가 직접 쓴 파일은 내용 해시로 구분하여 다시 빌드를 일으키지 않습니다 (JSON ↔ HTML 무한 반복 방지).
+
+watchdog(inotify 등 OS 파일 알림)이 설치되어 있으면 사용하고, 없으면 mtime 폴링으로 동작합니다.
+
+Usage:
+    python scripts/watch.py my-project [--debounce 0.3] [--pptx] [--poll]
+"""
+
+import argparse
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+
+from build_events import CancelToken
+import generate_html
+import html_to_json
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    HAS_WATCHDOG = False
+
+
+DEFAULT_DEBOUNCE = 0.3
+POLL_INTERVAL = 0.25
+# 변경 대기 중 Ctrl+C 를 확인하는 간격 (초)
+IDLE_WAIT = 0.5
+
+WATCHED_FILES = ('presentation.json', 'presentation.html', 'renderers.py')
+
+
+def file_digest(path):
+    """파일 내용 SHA-256 (없으면 None)"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """watchdog 이벤트 → ProjectWatcher.notify"""
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path:
+                self.watcher.notify(os.path.basename(path))
+
+
+class ProjectWatcher:
+    """프로젝트 폴더 감시 + debounce + 선택적 재빌드"""
+
+    def __init__(self, project_name, debounce=DEFAULT_DEBOUNCE, pptx=False, poll=False, build_options=None):
+        base_dir = Path(__file__).parent.parent
+        self.project_name = project_name
+        self.project_dir = base_dir / 'projects' / project_name
+        self.json_path = self.project_dir / 'presentation.json'
+        self.html_path = self.project_dir / 'presentation.html'
+        self.debounce = debounce
+        self.pptx = pptx
+        self.poll = poll or not HAS_WATCHDOG
+        self.build_options = build_options or {}
+
+        self.pending = set()
+        self.last_event = 0.0
+        self.changed = threading.Condition()
+        self.written = {}     # 도구가 쓴 파일 이름 → 내용 해시
+        self.seen = {}        # 파일 이름 → 마지막으로 처리한 내용 해시
+        self.pptx_thread = None
+        self.pptx_token = None
+
+    # ---------- 변경 감지 ----------
+
+    def notify(self, name):
+        if name not in WATCHED_FILES:
+            return
+        with self.changed:
+            self.pending.add(name)
+            self.last_event = time.monotonic()
+            self.changed.notify()
+
+    def _poll_loop(self, stop):
+        mtimes = {name: self._mtime(name) for name in WATCHED_FILES}
+        while not stop.wait(POLL_INTERVAL):
+            for name in WATCHED_FILES:
+                mtime = self._mtime(name)
+                if mtime != mtimes[name]:
+                    mtimes[name] = mtime
+                    self.notify(name)
+
+    def _mtime(self, name):
+        try:
+            stat = os.stat(self.project_dir / name)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _wait_for_changes(self):
+        """변경이 생기고 debounce 시간 동안 추가 변경이 없을 때까지 대기 → 변경된 파일 이름 집합"""
+        with self.changed:
+            while not self.pending:
+                # 시간 제한 없는 wait() 는 Windows에서 Ctrl+C(KeyboardInterrupt)로 깨울 수 없음
+                self.changed.wait(IDLE_WAIT)
+            while True:
+                remaining = self.last_event + self.debounce - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.changed.wait(remaining)
+            names, self.pending = self.pending, set()
+        return names
+
+    def _is_own_write(self, name):
+        """내용이 마지막 처리/쓰기와 같으면 True (도구가 쓴 파일, 내용 없는 저장)"""
+        digest = file_digest(self.project_dir / name)
+        if digest is None:
+            return True
+        if digest == self.written.get(name) or digest == self.seen.get(name):
+            return True
+        self.seen[name] = digest
+        return False
+
+    def _record_write(self, path):
+        digest = file_digest(path)
+        self.written[path.name] = digest
+        self.seen[path.name] = digest
+
+    # ---------- 빌드 ----------
+
+    def build_html(self):
+        started = time.perf_counter()
+        if not generate_html.generate_html(self.project_name, **self.build_options):
+            return
+        self._record_write(self.html_path)
+        print(f"  ⏱  HTML {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    def sync_json(self):
+        """HTML 직접 수정 → presentation.json (data-el-id 로 찾은 element의 바뀐 필드만 병합)
+
+        html_to_json()의 전체 변환은 metadata, companyInfo, element style 등을 잃으므로 사용하지 않습니다.
+        element를 하나도 찾지 못하면(data-el-id 가 없는 HTML) presentation.json 을 건드리지 않습니다.
+        presentation.json 을 저장했으면 True 반환
+        """
+        started = time.perf_counter()
+        json_data, report = html_to_json.merge_html_into_json(self.html_path, self.json_path)
+        if not report['matched']:
+            print(f"  [WARN] HTML에 {html_to_json.ELEMENT_ID_ATTR} 가 있는 element가 없습니다 - "
+                  f"presentation.json 유지 (generate_html.py 로 HTML을 다시 생성하세요)")
+            return False
+        if report['unmatched']:
+            print(f"  [WARN] JSON에서 찾지 못한 element {len(report['unmatched'])}개는 무시합니다")
+        if report['skipped']:
+            print(f"  [WARN] 하위 태그가 있어 병합하지 못한 수정: "
+                  f"{', '.join(f'{el_id} {field}' for el_id, field in report['skipped'])}")
+        if not report['changes']:
+            print("  HTML → JSON: 변경 사항 없음")
+            return False
+        html_to_json.save_json(self.json_path, json_data)
+        self._record_write(self.json_path)
+        print(f"✅ HTML → JSON 병합: {len(report['changes'])}개 필드 ({(time.perf_counter() - started) * 1000:.0f}ms)")
+        return True
+
+    def build_pptx(self):
+        """PPTX를 백그라운드에서 재빌드 - 진행 중인 빌드는 취소 (다음 슬라이드 경계에서 중단)"""
+        from json_to_pptx import convert_json_to_pptx
+
+        if self.pptx_thread is not None and self.pptx_thread.is_alive():
+            self.pptx_token.cancel()
+            self.pptx_thread.join()
+        self.pptx_token = CancelToken()
+
+        def run(token):
+            try:
+                convert_json_to_pptx(str(self.json_path), cancel_token=token)
+            except Exception as e:
+                print(f"  [WARN] PPTX 빌드 실패: {e}")
+
+        self.pptx_thread = threading.Thread(target=run, args=(self.pptx_token,), name='haru-watch-pptx',
+                                            daemon=True)
+        self.pptx_thread.start()
+
+    def handle(self, names):
+        changed = {name for name in names if not self._is_own_write(name)}
+        if not changed:
+            return
+        print(f"\n🔄 변경 감지: {', '.join(sorted(changed))}")
+        try:
+            if 'presentation.html' in changed and 'presentation.json' not in changed:
+                # 병합으로 쓴 JSON은 자기 쓰기로 기록되어 변경 감지에 걸리지 않으므로 PPTX는 여기서 재빌드
+                if self.sync_json() and self.pptx:
+                    self.build_pptx()
+            elif 'presentation.json' in changed or 'renderers.py' in changed:
+                self.build_html()
+                if self.pptx:
+                    self.build_pptx()
+        except Exception as e:
+            # 저장 도중의 깨진 JSON 등 - 다음 저장에서 다시 시도
+            print(f"❌ 빌드 실패: {e}")
+
+    def run(self):
+        if not self.json_path.exists():
+            print(f"Error: {self.json_path} not found.")
+            return
+        for name in WATCHED_FILES:
+            self.seen[name] = file_digest(self.project_dir / name)
+
+        stop = threading.Event()
+        if self.poll:
+            threading.Thread(target=self._poll_loop, args=(stop,), name='haru-watch-poll', daemon=True).start()
+            mode = f"polling {POLL_INTERVAL}s"
+        else:
+            observer = Observer()
+            observer.schedule(_ChangeHandler(self), str(self.project_dir), recursive=False)
+            observer.start()
+            mode = "watchdog"
+
+        print(f"👀 Watching {self.project_dir} ({mode}, debounce {self.debounce}s) - Ctrl+C로 종료")
+        self.build_html()
+        if self.pptx:
+            self.build_pptx()
+        try:
+            while True:
+                self.handle(self._wait_for_changes())
+        except KeyboardInterrupt:
+            print("\n👋 Watch 종료")
+        finally:
+            stop.set()
+            if not self.poll:
+                observer.stop()
+                observer.join()
+            if self.pptx_token is not None:
+                self.pptx_token.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="presentation.json/html 변경 감시 및 자동 재빌드")
+    parser.add_argument("project_name", help="projects/ 아래 프로젝트 폴더 이름")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"연속 저장을 하나로 묶는 대기 시간(초, 기본 {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--pptx", action="store_true", help="JSON 변경(HTML 수정 병합 포함) 시 PPTX도 백그라운드에서 재빌드")
+    parser.add_argument("--poll", action="store_true", help="watchdog 대신 mtime 폴링 사용")
+    parser.add_argument("--composite", action="store_true", help="generate_html --composite")
+    parser.add_argument("--intern-styles", action="store_true", help="generate_html --intern-styles")
+    args = parser.parse_args()
+    build_options = {'composite': args.composite, 'intern_styles': args.intern_styles}
+    ProjectWatcher(args.project_name, args.debounce, args.pptx, args.poll, build_options).run()
+
+
+if __name__ == '__main__':
+    main()
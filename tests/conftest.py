@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# scripts/ 는 패키지가 아니라 독립 실행 스크립트 폴더 - 스크립트끼리처럼 모듈 이름으로 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
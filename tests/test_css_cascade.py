@@ -0,0 +1,215 @@
+"""css_cascade.py - 명시도, !important 와 인라인 style, 상속, generate_html 이 출력하는 선택자"""
+
+import lxml.html
+import pytest
+
+import generate_html
+from css_cascade import StyleResolver, parse_declarations, parse_selector
+from html_backends import LxmlNode
+from html_templates import read_static
+
+
+class Node:
+    """html_backends 어댑터와 같은 인터페이스의 테스트용 노드"""
+
+    def __init__(self, name, classes='', style='', el_id=''):
+        self.name = name
+        self.classes = classes.split()
+        self.attrs = {'style': style, 'id': el_id}
+
+    def get(self, attr, default=''):
+        return self.attrs.get(attr) or default
+
+
+def computed(css, *path):
+    """body 아래 path 순서로 내려간 마지막 노드의 계산된 스타일"""
+    resolver = StyleResolver([css])
+    style = resolver.document()
+    for node in path:
+        style = resolver.enter(style, node, first_child=True)
+    return style.computed
+
+
+# ---------- 파싱 ----------
+
+def test_parse_declarations():
+    assert parse_declarations("Color: red; --Brand: Blue !important; background: url(data:a;b,c); bad") == [
+        ('color', 'red', False), ('--Brand', 'Blue', True), ('background', 'url(data:a;b,c)', False)]
+
+
+@pytest.mark.parametrize("selector, specificity", [
+    ("div", (0, 0, 1)),
+    (".a", (0, 1, 0)),
+    ("div.a.b", (0, 2, 1)),
+    ("#x .a > p", (1, 1, 1)),
+    (".a:first-child", (0, 2, 0)),
+    (":root", (0, 1, 0)),
+    ("div:not(#x)", (1, 0, 1)),
+    ("*", (0, 0, 0)),
+])
+def test_specificity(selector, specificity):
+    assert parse_selector(selector).specificity == specificity
+
+
+@pytest.mark.parametrize("selector", ["a:hover", "a + b", "a ~ b", "a[href]", "p::before"])
+def test_unsupported_selectors(selector):
+    assert parse_selector(selector) is None
+
+
+# ---------- 명시도 ----------
+
+def test_specificity_beats_order():
+    css = "#x { color: blue } .a.b { color: green } .a { color: red } div { color: gray }"
+    assert computed(css, Node('div', 'a b', el_id='x'))['color'] == 'blue'
+    assert computed(css, Node('div', 'a b'))['color'] == 'green'
+    assert computed(css, Node('div', 'a'))['color'] == 'red'
+    assert computed(css, Node('div'))['color'] == 'gray'
+
+
+def test_later_rule_wins_on_equal_specificity():
+    assert computed(".a { color: red } .b { color: blue }", Node('p', 'a b'))['color'] == 'blue'
+    assert computed(".b { color: blue } .a { color: red }", Node('p', 'a b'))['color'] == 'red'
+
+
+def test_combinators_and_not():
+    css = ".p .a { color: blue } .a { color: red } .q > .a { color: green } .a:not(.c) { font-size: 20px }"
+    assert computed(css, Node('div', 'p'), Node('div'), Node('span', 'a'))['color'] == 'blue'
+    assert computed(css, Node('div', 'q'), Node('span', 'a'))['color'] == 'green'
+    assert computed(css, Node('div', 'q'), Node('div'), Node('span', 'a'))['color'] == 'red'
+    assert computed(css, Node('span', 'a'))['font-size'] == '20px'
+    assert computed(css, Node('span', 'a c'))['font-size'] == '16px'
+
+
+def test_unmatched_rules_ignored():
+    css = ".a { color: red } .a:hover { color: blue } @media print { .a { color: green } }"
+    assert computed(css, Node('p', 'a'))['color'] == 'red'
+
+
+# ---------- !important / 인라인 style ----------
+
+def test_inline_beats_rules():
+    css = "#x.a { color: red }"
+    assert computed(css, Node('p', 'a', 'color: blue', 'x'))['color'] == 'blue'
+
+
+def test_important_rule_beats_inline():
+    css = ".a { color: red !important } #x { color: green }"
+    assert computed(css, Node('p', 'a', 'color: blue', 'x'))['color'] == 'red'
+
+
+def test_inline_important_beats_important_rule():
+    css = "#x { color: red !important }"
+    assert computed(css, Node('p', style='color: blue !important', el_id='x'))['color'] == 'blue'
+
+
+def test_important_specificity():
+    css = "#x { color: red !important } .a { color: green !important }"
+    assert computed(css, Node('p', 'a', el_id='x'))['color'] == 'red'
+
+
+# ---------- 상속 ----------
+
+def test_inherited_properties():
+    css = ".parent { color: #111; font-size: 20px; background: #222; margin: 4px; text-transform: uppercase }"
+    child = computed(css, Node('div', 'parent'), Node('span'))
+    assert child['color'] == '#111'
+    assert child['font-size'] == '20px'
+    assert child['text-transform'] == 'uppercase'
+    assert 'background' not in child and 'margin' not in child
+
+
+def test_inherit_keywords():
+    css = ".parent { color: red; margin: 4px } .child { color: blue; margin: inherit } .reset { color: initial }"
+    child = computed(css, Node('div', 'parent'), Node('p', 'child'))
+    assert child['color'] == 'blue' and child['margin'] == '4px'
+    assert computed(css, Node('div', 'parent'), Node('p', 'reset'))['color'] == '#000000'
+    assert computed(css, Node('div', 'parent'), Node('p', style='color: unset'))['color'] == 'red'
+    assert computed(css, Node('div', 'parent'), Node('p', style='margin: unset')).get('margin') is None
+
+
+def test_relative_font_size():
+    css = "html { font-size: 10px } .p { font-size: 20px } .em { font-size: 1.5em } .rem { font-size: 2rem }"
+    assert computed(css, Node('div', 'p'), Node('span', 'em'))['font-size'] == '30px'
+    assert computed(css, Node('div', 'p'), Node('span', 'rem'))['font-size'] == '20px'
+    assert computed(css, Node('div', 'p'), Node('span', style='font-size: 50%'))['font-size'] == '10px'
+
+
+def test_custom_properties_inherit():
+    css = (":root { --c: #abc; --size: 12px } .p { --c: #def } .a { color: var(--c); font-size: var(--size) }"
+           " .b { color: var(--missing, var(--c)) } .u { color: var(--missing) }")
+    assert computed(css, Node('span', 'a'))['color'] == '#abc'
+    assert computed(css, Node('div', 'p'), Node('span', 'a'))['color'] == '#def'
+    assert computed(css, Node('div', 'p'), Node('span', 'a'))['font-size'] == '12px'
+    assert computed(css, Node('div', 'p'), Node('span', 'b'))['color'] == '#def'
+    # 정의되지 않은 변수 - 선언 무시, 상속값 유지
+    assert computed(css, Node('div', 'p', 'color: red'), Node('span', 'u'))['color'] == 'red'
+
+
+# ---------- generate_html 출력 ----------
+
+THEME = {'primary': '#FF6B35', 'secondary': '#FFB800', 'bg_dark': '#1A1A1A', 'bg_card': '#2A2A2A'}
+
+
+def rendered_styles(slides, interner=None):
+    """generate_html 과 같은 <style>(디자인 토큰, slides.css, 인터닝 클래스)로 렌더링한 슬라이드의
+    data-el-id → 계산된 스타일"""
+    root_css = generate_html.DOCUMENT_TEMPLATES.root_tokens(
+        '#FF6B35', '#FF8A5B', '#E55A25', '#FFB800', '#1A1A1A', '#0D0D0D', '#2A2A2A', '#FFFFFF', '#CCCCCC', '#888888')
+    style_texts = [str(root_css), read_static('slides.css')]
+    theme = dict(THEME)
+    if interner is not None:
+        generate_html.collect_styles(list(enumerate(slides, 1)), interner)
+        style_texts.append(interner.css())
+        theme['styles'] = interner
+    resolver = StyleResolver(style_texts)
+
+    styles = {}
+
+    def walk(node, parent_style, first_child):
+        style = resolver.enter(parent_style, node, first_child)
+        if node.get('data-el-id'):
+            styles[node.get('data-el-id')] = style.computed
+        for i, child in enumerate(node.child_elements()):
+            walk(child, style, i == 0)
+
+    body = resolver.document()
+    for number, slide in enumerate(slides, 1):
+        html = generate_html.render_slide(number, slide, number == len(slides), theme)
+        walk(LxmlNode(lxml.html.fragment_fromstring(html.split('<!--')[0])), body, number == 1)
+    return styles
+
+
+def test_generated_element_classes():
+    styles = rendered_styles([{'type': 'content-text', 'elements': [
+        {'type': 'heading', 'text': 'A'},
+        {'type': 'subheading', 'text': 'B'},
+        {'type': 'body', 'text': 'C', 'style': {'fontSize': '18px', 'color': '#123456'}},
+        {'type': 'logo', 'text': 'D'},
+    ]}])
+    assert (styles['1.0']['font-size'], styles['1.0']['color']) == ('48px', '#FFFFFF')  # var(--size-h1)
+    assert (styles['1.1']['font-size'], styles['1.1']['color']) == ('20px', '#CCCCCC')
+    assert (styles['1.2']['font-size'], styles['1.2']['color']) == ('18px', '#123456')  # 인라인 style
+    assert styles['1.3']['color'] == '#FF6B35'  # var(--primary)
+    assert styles['1.0']['font-family'].startswith("'Pretendard'")  # body 에서 상속
+
+
+def test_generated_template_descendant_rules():
+    styles = rendered_styles([{'type': 'section-divider', 'elements': [
+        {'type': 'heading', 'text': 'A'},
+        {'type': 'subheading', 'text': 'B'},
+    ]}])
+    # .template-section-divider .element-heading (0,2,0) > .element-heading (0,1,0)
+    assert styles['1.0']['font-size'] == '96px'
+    assert (styles['1.1']['font-size'], styles['1.1']['color']) == ('72px', '#FF6B35')
+
+
+def test_generated_interned_styles():
+    style = {'fontSize': '30px', 'color': '#ABCDEF'}
+    slides = [{'type': 'section-divider', 'elements': [{'type': 'heading', 'text': 'A', 'style': style}]},
+              {'type': 'content-text', 'elements': [{'type': 'heading', 'text': 'B', 'style': style}]}]
+    inline = rendered_styles(slides)
+    interned = rendered_styles(slides, generate_html.StyleInterner())
+    # 인터닝 클래스(!important)는 인라인 style 처럼 템플릿 하위 선택자보다 우선
+    for el_id in ('1.0', '2.0'):
+        assert (interned[el_id]['font-size'], interned[el_id]['color']) == ('30px', '#ABCDEF')
+        assert interned[el_id] == inline[el_id]
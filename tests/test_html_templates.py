@@ -0,0 +1,143 @@
+"""html_templates.py (Jinja2) - 이스케이프, 공백 처리, 바이트코드 캐시, 저장소 템플릿"""
+
+import os
+
+import pytest
+
+import html_templates
+import image_cache
+from html_templates import load_templates
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """바이트코드 캐시(.cache/templates)와 Environment 를 테스트마다 새로"""
+    monkeypatch.setattr(image_cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(html_templates, "_environments", {})
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    path = tmp_path / "templates"
+    path.mkdir()
+    return path
+
+
+def write(template_dir, name, source):
+    (template_dir / name).write_text(source, encoding="utf-8")
+
+
+# ---------- 이스케이프 ----------
+
+def test_autoescape(template_dir):
+    write(template_dir, "t.html", '{% macro f(x) %}<p title="{{ x }}">{{ x }}</p>{% endmacro %}')
+    assert load_templates("t", template_dir).f('<a href="?a=1&b=2">') == (
+        '<p title="&lt;a href=&#34;?a=1&amp;b=2&#34;&gt;">&lt;a href=&#34;?a=1&amp;b=2&#34;&gt;</p>')
+
+
+def test_safe_filter_and_macro_output(template_dir):
+    write(template_dir, "t.html", "{% macro f(inner, text) %}<div>{{ inner|safe }}{{ text }}</div>{% endmacro %}"
+                                  "{% macro g(x) %}<b>{{ x }}</b>{% endmacro %}")
+    templates = load_templates("t", template_dir)
+    assert templates.f("<span>a</span>", "<b>") == "<div><span>a</span>&lt;b&gt;</div>"
+    # 매크로 결과(Markup)는 다른 매크로에 넘겨도 다시 이스케이프되지 않음
+    assert templates.f(templates.g("&"), templates.g("&")) == "<div><b>&amp;</b><b>&amp;</b></div>"
+
+
+def test_helpers_are_escaped_unless_safe(template_dir):
+    write(template_dir, "t.html", "{% macro f(name) %}{{ icon(name) }}|{{ icon(name)|safe }}{% endmacro %}")
+    templates = load_templates("t", template_dir, icon=lambda name: f"<i>{name}</i>")
+    assert templates.f("x") == "&lt;i&gt;x&lt;/i&gt;|<i>x</i>"
+
+
+# ---------- 공백 ----------
+
+def test_compact_lines(template_dir):
+    write(template_dir, "t.html", """{# 주석 #}
+    {% macro f(items) %}
+        <ul>
+        {% for item in items %}
+            {% if item %}
+                <li>{{ item }}</li>
+            {% else %}
+                <li class="empty"></li>
+            {% endif %}
+        {% endfor %}
+        </ul>
+    {% endmacro %}""")
+    assert load_templates("t", template_dir).f(["a", "", "<"]) == (
+        '<ul><li>a</li><li class="empty"></li><li>&lt;</li></ul>')
+
+
+def test_verbatim_template(template_dir, monkeypatch):
+    monkeypatch.setattr(html_templates, "VERBATIM_TEMPLATES", frozenset(["v.html"]))
+    write(template_dir, "v.html", "{% macro f(x) %}\n  <pre>{{ x }}\n</pre>\n{% endmacro %}")
+    assert load_templates("v", template_dir).f("<a>") == "\n  <pre>&lt;a&gt;\n</pre>\n"
+
+
+# ---------- 캐시 ----------
+
+def test_bytecode_cache(template_dir, cache_dir):
+    write(template_dir, "t.html", "{% macro f(x) %}{{ x }}{% endmacro %}")
+    assert load_templates("t", template_dir).f(1) == "1"
+    assert len(list((cache_dir / "templates").glob("*.cache"))) == 1
+
+    html_templates._environments.clear()  # 새 프로세스처럼 - 디스크 캐시에서 로드
+    assert load_templates("t", template_dir).f(2) == "2"
+    assert len(list((cache_dir / "templates").glob("*.cache"))) == 1
+
+
+def test_reloads_changed_file(template_dir):
+    template = template_dir / "t.html"
+    write(template_dir, "t.html", "{% macro f(x) %}a{{ x }}{% endmacro %}")
+    assert load_templates("t", template_dir).f(1) == "a1"
+    write(template_dir, "t.html", "{% macro f(x) %}bb{{ x }}{% endmacro %}")
+    stat = template.stat()
+    os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))  # 같은 초 안의 저장도 감지되도록
+    assert load_templates("t", template_dir).f(1) == "bb1"
+
+
+# ---------- 저장소 템플릿 ----------
+
+@pytest.fixture
+def elements():
+    return load_templates("elements", get_icon=lambda name: f"[{name}]")
+
+
+def test_element_text_and_style_class(elements):
+    el = {"text": 'Tom & "Jerry" <3'}
+    assert elements.heading(el, "color: red; ", "#111", "#222") == (
+        '<div class="element-heading" style="color: red; ">Tom &amp; &#34;Jerry&#34; &lt;3</div>')
+    assert elements.heading(el, "", "#111", "#222", " s-12345678") == (
+        '<div class="element-heading s-12345678" style="">Tom &amp; &#34;Jerry&#34; &lt;3</div>')
+
+
+def test_element_nested_loops(elements):
+    el = {"headers": ["A", "B"], "rows": [
+        {"company": "X", "values": ["check", "highlight", "<1"], "isHighlight": True},
+        {"company": "Y", "values": []},
+    ]}
+    assert elements.comparison_table(el, "", "#111", "#222") == (
+        '<table class="comparison-table"><thead><tr><th>A</th><th>B</th></tr></thead><tbody>'
+        '<tr class="highlight"><td>X</td><td class="check">✓</td><td class="highlight-check">✓</td><td>&lt;1</td></tr>'
+        '<tr class=""><td>Y</td></tr></tbody></table>')
+
+
+def test_element_expressions(elements):
+    clients = {"clients": [{"name": "A", "highlight": True}, "B"]}
+    assert elements.client_section(clients, "", "#111", "#222") == (
+        '<div class="clients-grid"><div class="client-item highlight">A</div><div class="client-item">B</div></div>')
+    regions = {"items": [{"region": "Asia", "countries": ["KR", "J&P"], "icon": "globe"}]}
+    assert '<div class="region-countries">KR, J&amp;P</div>' in elements.network_regions(regions, "", "#1", "#2")
+    assert '<div class="region-icon">[globe]</div>' in elements.network_regions(regions, "", "#1", "#2")
+    timeline = {"periods": [{"year": 2024, "barColor": "#f00", "highlight": True}]}
+    assert 'style="color: #f00; background: #f00; color: white; padding: 4px 8px; border-radius: 4px;"' in (
+        elements.timeline(timeline, "", "#1", "#2"))
+
+
+def test_document_templates_keep_whitespace():
+    document = load_templates("document")
+    assert document.stylesheet_link("a.css?x=1&y=2") == '    <link rel="stylesheet" href="a.css?x=1&amp;y=2">\n'
+    assert document.document_end() == "</body></html>"
+    assert document.root_tokens(*["#000"] * 10).startswith(":root {\n  /* Colors */\n  --primary: #000;\n")
@@ -0,0 +1,184 @@
+"""json_patch.py - 서식 유지 저장 (중첩, 이스케이프/유니코드, 키 추가/삭제, 전체 다시 쓰기 폴백)"""
+
+import json
+
+import pytest
+
+from json_patch import detect_indent, dumps_like, patch_json_text
+
+
+def dumps(text, data):
+    """dumps_like 결과 - 다시 파싱하면 항상 data 와 같아야 함"""
+    result = dumps_like(text, data)
+    assert json.loads(result) == data
+    return result
+
+
+ORIGINAL = """{
+  "projectName": "demo",
+  "tags": ["a", "b"],
+  "slides": [
+    {"id": 1, "title": "Cover", "elements": [{"type": "heading", "text": "Hi"}]},
+    {
+      "id": 2,
+      "style": {"fontSize": "24px", "color": "#111"}
+    }
+  ]
+}
+"""
+
+
+def load():
+    return json.loads(ORIGINAL)
+
+
+# ---------- 중첩 객체/배열 ----------
+
+def test_unchanged_returns_original():
+    assert dumps(ORIGINAL, load()) == ORIGINAL
+
+
+def test_nested_value_keeps_layout():
+    data = load()
+    data["slides"][0]["elements"][0]["text"] = "Hello"
+    data["slides"][1]["style"]["color"] = "#222"
+    assert dumps(ORIGINAL, data) == ORIGINAL.replace('"Hi"', '"Hello"').replace('"#111"', '"#222"')
+
+
+def test_inline_array_replaced_inline():
+    data = load()
+    data["tags"] = ["a", "b", "c"]
+    assert dumps(ORIGINAL, data) == ORIGINAL.replace('["a", "b"]', '["a", "b", "c"]')
+
+
+def test_multiline_value_replaced_with_same_indent():
+    data = load()
+    data["slides"][1] = {"id": 2, "items": [1, 2]}
+    result = dumps(ORIGINAL, data)
+    assert '    {\n      "id": 2,\n      "items": [\n        1,\n        2\n      ]\n    }\n  ]' in result
+    assert result.startswith('{\n  "projectName": "demo",\n  "tags": ["a", "b"],\n')
+
+
+def test_array_length_change_replaces_array():
+    data = load()
+    data["slides"].append({"id": 3})
+    result = dumps(ORIGINAL, data)
+    assert result.startswith('{\n  "projectName": "demo",\n  "tags": ["a", "b"],\n  "slides": [\n    {\n')
+
+
+def test_type_change():
+    text = '{"a": 1, "b": [1, 2]}'
+    assert dumps(text, {"a": 1.0, "b": [True, 2]}) == '{"a": 1.0, "b": [true, 2]}'
+    assert dumps(text, {"a": None, "b": {"x": 1}}) == '{"a": null, "b": {"x": 1}}'
+
+
+# ---------- 이스케이프/유니코드 ----------
+
+def test_escaped_strings():
+    text = '{"text": "say \\"hi\\"\\n", "path": "C:\\\\dir", "keep": "\\u0041"}'
+    data = json.loads(text)
+    data["text"] = 'say "bye"\t'
+    result = dumps(text, data)
+    assert result == '{"text": "say \\"bye\\"\\t", "path": "C:\\\\dir", "keep": "\\u0041"}'
+
+
+def test_unicode_written_as_is():
+    text = '{\n  "title": "\\ud68c\\uc0ac \\uc18c\\uac1c",\n  "emoji": "🚢"\n}\n'
+    data = {"title": "회사 소개", "emoji": "✈️"}
+    # 값이 같은 이스케이프 표기는 유지, 바뀐 값만 원문 유니코드로
+    assert dumps(text, data) == '{\n  "title": "\\ud68c\\uc0ac \\uc18c\\uac1c",\n  "emoji": "✈️"\n}\n'
+    data["title"] = "이음 \"로지스틱스\""
+    assert '"title": "이음 \\"로지스틱스\\""' in dumps(text, data)
+
+
+def test_escaped_keys():
+    text = '{"a\\"b": 1, "한글": 2}'
+    assert dumps(text, {'a"b': 3, "한글": 2}) == '{"a\\"b": 3, "한글": 2}'
+    assert dumps(text, {"한글": 2}) == '{"한글": 2}'
+
+
+# ---------- 키 추가/삭제 ----------
+
+def test_added_keys_multiline():
+    data = load()
+    data["slides"][1]["note"] = "new"
+    data["version"] = "1.1"
+    result = dumps(ORIGINAL, data)
+    assert result.endswith('  ],\n  "version": "1.1"\n}\n')
+    assert '"style": {"fontSize": "24px", "color": "#111"},\n      "note": "new"\n' in result
+
+
+def test_added_keys_inline():
+    data = load()
+    data["slides"][0]["elements"][0]["color"] = "#fff"
+    assert '{"type": "heading", "text": "Hi", "color": "#fff"}' in dumps(ORIGINAL, data)
+
+
+@pytest.mark.parametrize("removed, expected", [
+    ("a", '{"b": 2, "c": 3}'),
+    ("b", '{"a": 1, "c": 3}'),
+    ("c", '{"a": 1, "b": 2}'),
+])
+def test_removed_key(removed, expected):
+    text = '{"a": 1, "b": 2, "c": 3}'
+    data = json.loads(text)
+    del data[removed]
+    assert dumps(text, data) == expected
+
+
+def test_removed_keys_multiline():
+    data = load()
+    del data["projectName"]
+    del data["slides"][1]["style"]
+    result = dumps(ORIGINAL, data)
+    assert result.startswith('{\n  "tags": ["a", "b"],\n')
+    assert '    {\n      "id": 2\n    }\n' in result
+
+
+def test_add_and_remove_together():
+    text = '{\n    "a": 1,\n    "b": 2\n}'
+    assert dumps(text, {"b": 3, "c": [1]}) == '{\n    "b": 3,\n    "c": [\n        1\n    ]\n}'
+
+
+def test_all_keys_replaced():
+    text = '{\n  "a": {"x": 1}\n}\n'
+    assert dumps(text, {"a": {"y": 2}}) == '{\n  "a": {"y": 2}\n}\n'
+    assert dumps(text, {"b": 1}) == '{\n  "b": 1\n}\n'
+
+
+# ---------- 전체 다시 쓰기 폴백 ----------
+
+@pytest.mark.parametrize("text", [
+    '{"a": 1,',               # 잘린 파일
+    '{"a": 1} trailing',      # JSON 뒤에 다른 내용
+    'not json',
+])
+def test_fallback_for_invalid_original(text):
+    data = {"a": 2, "b": ["x"]}
+    assert dumps(text, data) == json.dumps(data, ensure_ascii=False, indent=2) + "\n"
+
+
+def test_fallback_keeps_indent_unit():
+    text = '{\n\t"a": 1,\n\t"b": [\n'
+    data = {"a": 2, "b": []}
+    assert dumps(text, data) == '{\n\t"a": 2,\n\t"b": []\n}\n'
+
+
+def test_no_original_file():
+    data = {"title": "회사"}
+    assert dumps(None, data) == '{\n  "title": "회사"\n}\n'
+    assert dumps("", data) == '{\n  "title": "회사"\n}\n'
+
+
+def test_patch_invalid_raises():
+    with pytest.raises(ValueError):
+        patch_json_text("[1, ", [1])
+
+
+@pytest.mark.parametrize("text, indent", [
+    ('{"a": 1}', 2),
+    ('{\n    "a": {\n        "b": 1\n    }\n}', 4),
+    ('{\n\t"a": 1\n}', '\t'),
+])
+def test_detect_indent(text, indent):
+    assert detect_indent(text) == indent